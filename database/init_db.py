@@ -192,6 +192,12 @@ CREATE INDEX IF NOT EXISTS idx_reconciliation_sessions_date ON reconciliation_se
 CREATE INDEX IF NOT EXISTS idx_reconciliation_sessions_period ON reconciliation_sessions(start_date, end_date);
 CREATE INDEX IF NOT EXISTS idx_reconciliation_entries_session ON reconciliation_entries(session_id);
 CREATE INDEX IF NOT EXISTS idx_reconciliation_explanations_session ON reconciliation_explanations(session_id);
+
+-- Case-insensitive username index for paged, sorted user lists
+CREATE INDEX IF NOT EXISTS idx_users_username_nocase ON users(username COLLATE NOCASE);
+
+-- Exact barcode lookups from the POS scanner
+CREATE INDEX IF NOT EXISTS idx_items_barcode ON items(barcode);
 """
 
 
@@ -272,6 +278,9 @@ def _ensure_refunds_table(conn: sqlite3.Connection) -> None:
             );
             """
         )
+    # Per-sale and per-line refund lookups (order history status, refund coverage)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_refunds_items_sale_id ON refunds_items(sale_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_refunds_items_sale_item_id ON refunds_items(sale_item_id)")
     # Ensure foreign key columns exist; leave existing legacy columns intact
     conn.commit()
 
@@ -624,6 +633,7 @@ def _ensure_sales_items_columns(conn: sqlite3.Connection) -> None:
     if "portion_id" not in existing:
         conn.execute("ALTER TABLE sales_items ADD COLUMN portion_id INTEGER")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_sales_items_portion_id ON sales_items(portion_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sales_items_sale_id ON sales_items(sale_id)")
     conn.commit()
 
 
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from database.init_db import get_connection
+from modules.units_of_measure import BASE_UNIT_LABELS
 
 
 def get_today_summary() -> dict:
@@ -194,14 +195,7 @@ def get_top_products(limit: int = 5) -> list[dict]:
                 qty_base = qty_raw / multiplier  # e.g., 500ml / 1000 = 0.5 L
                 unit = row_dict.get("unit_of_measure", "L")
                 unit_lower = (unit or "").lower()
-                if unit_lower in ("litre", "liter", "liters", "litres", "l"):
-                    unit_label = "L"
-                elif unit_lower in ("kilogram", "kilograms", "kg", "kgs"):
-                    unit_label = "kg"
-                elif unit_lower in ("meter", "meters", "metre", "metres", "m"):
-                    unit_label = "m"
-                else:
-                    unit_label = unit
+                unit_label = BASE_UNIT_LABELS.get(unit_lower, unit)
                 row_dict["quantity_sold"] = qty_base
                 row_dict["qty_display"] = f"{qty_base:.2f} {unit_label}"
             else:
@@ -278,7 +272,7 @@ def get_low_stock_items(threshold: int = 10) -> list[dict]:
                                 "actual_volume": actual,
                                 "threshold": v_threshold,
                                 "is_special_volume": bool(item.get("is_special_volume")),
-                                "display_unit": ("L" if (item.get("unit_of_measure") or "").lower() in ("litre","liter","liters","litres","l") else ("kg" if (item.get("unit_of_measure") or "").lower() in ("kilogram","kilograms","kg","kgs") else ("m" if (item.get("unit_of_measure") or "").lower() in ("meter","meters","metre","metres","m") else "units")))
+                                "display_unit": BASE_UNIT_LABELS.get((item.get("unit_of_measure") or "").lower(), "units")
                             })
                         else:
                             all_variants_low = False
@@ -296,7 +290,7 @@ def get_low_stock_items(threshold: int = 10) -> list[dict]:
                             "actual_volume": parent_actual,
                             "threshold": item_threshold,
                             "is_special_volume": bool(item.get("is_special_volume")),
-                            "display_unit": ("L" if (item.get("unit_of_measure") or "").lower() in ("litre","liter","liters","litres","l") else ("kg" if (item.get("unit_of_measure") or "").lower() in ("kilogram","kilograms","kg","kgs") else ("m" if (item.get("unit_of_measure") or "").lower() in ("meter","meters","metre","metres","m") else "units")))
+                            "display_unit": BASE_UNIT_LABELS.get((item.get("unit_of_measure") or "").lower(), "units")
                         })
                 else:
                     # No variants: same as previous behavior
@@ -305,14 +299,7 @@ def get_low_stock_items(threshold: int = 10) -> list[dict]:
                         actual_volume = item["quantity"] * unit_size
                         item["actual_volume"] = actual_volume
                         unit = (item.get("unit_of_measure") or "").lower()
-                        if unit in ("litre", "liter", "liters", "litres", "l"):
-                            item["display_unit"] = "L"
-                        elif unit in ("kilogram", "kilograms", "kg", "kgs"):
-                            item["display_unit"] = "kg"
-                        elif unit in ("meter", "meters", "metre", "metres", "m"):
-                            item["display_unit"] = "m"
-                        else:
-                            item["display_unit"] = unit
+                        item["display_unit"] = BASE_UNIT_LABELS.get(unit, unit)
 
                         if actual_volume <= item_threshold:
                             low_items.append(item)
@@ -328,7 +315,7 @@ def get_low_stock_items(threshold: int = 10) -> list[dict]:
                         unit_size = float(item.get("unit_size_ml") or 1)
                         actual_volume = item["quantity"] * unit_size
                         item["actual_volume"] = actual_volume
-                        item["display_unit"] = ("L" if (item.get("unit_of_measure") or "").lower() in ("litre","liter","liters","litres","l") else ("kg" if (item.get("unit_of_measure") or "").lower() in ("kilogram","kilograms","kg","kgs") else ("m" if (item.get("unit_of_measure") or "").lower() in ("meter","meters","metre","metres","m") else "units")))
+                        item["display_unit"] = BASE_UNIT_LABELS.get((item.get("unit_of_measure") or "").lower(), "units")
                         if actual_volume <= item_threshold:
                             low_items.append(item)
                     else:
@@ -35,6 +35,25 @@ def _row_to_dict(row: sqlite3.Row) -> dict:
     return {k: row[k] for k in row.keys()}
 
 
+def _as_float(value) -> float:
+    """Coerce a stored price to float; NULL and non-numeric text become 0.0."""
+    if isinstance(value, float):
+        return value
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _catalog_row(row: sqlite3.Row) -> dict:
+    """Item dict with prices as floats and unit_size_ml defaulted, so list consumers need no checks."""
+    item = _row_to_dict(row)
+    item["cost_price"] = _as_float(item.get("cost_price"))
+    item["selling_price"] = _as_float(item.get("selling_price"))
+    item["unit_size_ml"] = item.get("unit_size_ml") or 1
+    return item
+
+
 from modules import units_of_measure as uom
 
 
@@ -447,6 +466,16 @@ def get_item(item_id: int) -> Optional[dict]:
     return _row_to_dict(row) if row else None
 
 
+def get_item_by_barcode(barcode: str) -> Optional[dict]:
+    """Retrieve a single item by exact barcode, or None if no item has it."""
+    if not barcode:
+        return None
+    with get_connection() as conn:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM items WHERE barcode = ? LIMIT 1", (barcode,)).fetchone()
+    return _row_to_dict(row) if row else None
+
+
 def list_items(search: str | None = None) -> List[dict]:
     like = f"%{search.lower()}%" if search else None
     with get_connection() as conn:
@@ -462,7 +491,7 @@ def list_items(search: str | None = None) -> List[dict]:
             )
         else:
             cursor = conn.execute("SELECT * FROM items ORDER BY name COLLATE NOCASE")
-        return [_row_to_dict(row) for row in cursor.fetchall()]
+        return [_catalog_row(row) for row in cursor.fetchall()]
 
 
 def low_stock(threshold: int = 5) -> List[dict]:
@@ -512,7 +541,7 @@ def low_stock(threshold: int = 5) -> List[dict]:
                                 "actual_volume": actual,
                                 "threshold": v_threshold,
                                 "is_special_volume": bool(item.get("is_special_volume")),
-                                "display_unit": ("L" if (item.get("unit_of_measure") or "").lower() in ("litre","liter","liters","litres","l") else ("kg" if (item.get("unit_of_measure") or "").lower() in ("kilogram","kilograms","kg","kgs") else ("m" if (item.get("unit_of_measure") or "").lower() in ("meter","meters","metre","metres","m") else "units")))
+                                "display_unit": uom.BASE_UNIT_LABELS.get((item.get("unit_of_measure") or "").lower(), "units")
                             }
                             variant_alerts.append(alert)
                         else:
@@ -531,7 +560,7 @@ def low_stock(threshold: int = 5) -> List[dict]:
                         actual_volume = item["quantity"] * unit_size
                         if actual_volume <= item_threshold:
                             item["actual_volume"] = actual_volume
-                            item["display_unit"] = ("L" if (item.get("unit_of_measure") or "").lower() in ("litre","liter","liters","litres","l") else ("kg" if (item.get("unit_of_measure") or "").lower() in ("kilogram","kilograms","kg","kgs") else ("m" if (item.get("unit_of_measure") or "").lower() in ("meter","meters","metre","metres","m") else "units")))
+                            item["display_unit"] = uom.BASE_UNIT_LABELS.get((item.get("unit_of_measure") or "").lower(), "units")
                             low_items.append(item)
                     else:
                         if item["quantity"] <= item_threshold:
@@ -546,7 +575,7 @@ def low_stock(threshold: int = 5) -> List[dict]:
                         actual_volume = item["quantity"] * unit_size
                         if actual_volume <= item_threshold:
                             item["actual_volume"] = actual_volume
-                            item["display_unit"] = ("L" if (item.get("unit_of_measure") or "").lower() in ("litre","liter","liters","litres","l") else ("kg" if (item.get("unit_of_measure") or "").lower() in ("kilogram","kilograms","kg","kgs") else ("m" if (item.get("unit_of_measure") or "").lower() in ("meter","meters","metre","metres","m") else "units")))
+                            item["display_unit"] = uom.BASE_UNIT_LABELS.get((item.get("unit_of_measure") or "").lower(), "units")
                             low_items.append(item)
                     else:
                         if item["quantity"] <= item_threshold:
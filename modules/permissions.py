@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import sqlite3
-from typing import Dict, List, Optional, Set
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 from database.init_db import get_connection
 from utils.audit import audit_logger
 
@@ -95,6 +96,19 @@ DEFAULT_ROLE_PERMISSIONS = {
 }
 
 
+# Per-user cache of (granted, revoked) permission sets, keyed by user_id.
+# Every write below goes through grant/revoke/reset, which invalidate the entry.
+_user_perm_cache: Dict[int, Tuple[FrozenSet[str], FrozenSet[str]]] = {}
+
+
+def invalidate_user_permissions(user_id: Optional[int] = None) -> None:
+    """Drop cached permissions for one user, or for everyone when user_id is None."""
+    if user_id is None:
+        _user_perm_cache.clear()
+    else:
+        _user_perm_cache.pop(user_id, None)
+
+
 def _ensure_permissions_table() -> None:
     """Ensure the permissions table exists."""
     with get_connection() as conn:
@@ -116,35 +130,39 @@ def _row_to_dict(row: sqlite3.Row) -> dict:
     return {k: row[k] for k in row.keys()}
 
 
+def _user_permission_sets(user_id: int) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Return (granted, revoked) explicit permissions for a user from one query."""
+    cached = _user_perm_cache.get(user_id)
+    if cached is None:
+        _ensure_permissions_table()
+
+        with get_connection() as conn:
+            rows = conn.execute(
+                "SELECT permission, granted FROM user_permissions WHERE user_id = ?",
+                (user_id,)
+            ).fetchall()
+        cached = (
+            frozenset(perm for perm, granted in rows if granted),
+            frozenset(perm for perm, granted in rows if not granted),
+        )
+        _user_perm_cache[user_id] = cached
+    return cached
+
+
 def get_user_permissions(user_id: int) -> Set[str]:
     """Get all permissions granted to a user."""
-    _ensure_permissions_table()
-
-    with get_connection() as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.execute(
-            "SELECT permission FROM user_permissions WHERE user_id = ? AND granted = 1",
-            (user_id,)
-        )
-        return {row['permission'] for row in cursor.fetchall()}
+    return set(_user_permission_sets(user_id)[0])
 
 
 def get_revoked_permissions(user_id: int) -> Set[str]:
     """Get all permissions explicitly revoked from a user."""
-    _ensure_permissions_table()
+    return set(_user_permission_sets(user_id)[1])
 
-    with get_connection() as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.execute(
-            "SELECT permission FROM user_permissions WHERE user_id = ? AND granted = 0",
-            (user_id,)
-        )
-        return {row['permission'] for row in cursor.fetchall()}
 
-
-def get_role_permissions(role: str) -> Set[str]:
+@lru_cache(maxsize=32)
+def get_role_permissions(role: str) -> FrozenSet[str]:
     """Get default permissions for a role."""
-    return DEFAULT_ROLE_PERMISSIONS.get(role, set())
+    return frozenset(DEFAULT_ROLE_PERMISSIONS.get(role, ()))
 
 
 def get_effective_permissions(user: dict) -> Set[str]:
@@ -171,6 +189,25 @@ def get_effective_permissions(user: dict) -> Set[str]:
     return set()
 
 
+def get_user_permission_bundle(user_id: int, role: str) -> Dict[str, Set[str]]:
+    """Get a user's granted, revoked, role-suggested and effective permissions together.
+
+    Granted and revoked permissions come from a single query; role defaults are
+    in memory, so the whole bundle costs at most one DB round-trip.
+    """
+    granted, revoked = _user_permission_sets(user_id)
+    if role == 'admin':
+        effective = set(PERMISSIONS) - revoked
+    else:
+        effective = set(granted)
+    return {
+        'user': set(granted),
+        'revoked': set(revoked),
+        'role': get_role_permissions(role),
+        'effective': effective,
+    }
+
+
 def has_permission(user: dict, permission: str) -> bool:
     """Check if a user has a specific permission."""
     effective_perms = get_effective_permissions(user)
@@ -190,6 +227,7 @@ def grant_permission(user_id: int, permission: str, granted_by: int = None) -> N
             VALUES (?, ?, 1, CURRENT_TIMESTAMP)
         """, (user_id, permission))
         conn.commit()
+    invalidate_user_permissions(user_id)
 
     # Audit the permission change
     audit_logger.log_action(
@@ -210,6 +248,7 @@ def revoke_permission(user_id: int, permission: str, revoked_by: int = None) ->
             VALUES (?, ?, 0, CURRENT_TIMESTAMP)
         """, (user_id, permission))
         conn.commit()
+    invalidate_user_permissions(user_id)
 
     # Audit the permission change
     audit_logger.log_action(
@@ -220,6 +259,47 @@ def revoke_permission(user_id: int, permission: str, revoked_by: int = None) ->
     )
 
 
+def _set_permissions_bulk(user_id: int, perms, granted: int, action: str, changed_by: int = None) -> int:
+    """Write one grant state for many permissions in a single transaction."""
+    perms = list(dict.fromkeys(perms))
+    if not perms:
+        return 0
+
+    _ensure_permissions_table()
+
+    with get_connection() as conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO user_permissions (user_id, permission, granted, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        """, [(user_id, perm, granted) for perm in perms])
+        conn.commit()
+    invalidate_user_permissions(user_id)
+
+    # One audit entry per batch, listing every permission touched
+    audit_logger.log_action(
+        table_name="user_permissions",
+        action=action,
+        record_id=str(user_id),
+        new_values={"permissions": perms},
+        user_id=changed_by
+    )
+    return len(perms)
+
+
+def grant_permissions_bulk(user_id: int, perms, granted_by: int = None) -> int:
+    """Grant several permissions to a user at once. Returns the number granted."""
+    perms = list(perms)
+    unknown = [perm for perm in perms if perm not in PERMISSIONS]
+    if unknown:
+        raise ValueError(f"Unknown permission: {unknown[0]}")
+    return _set_permissions_bulk(user_id, perms, 1, "GRANT", granted_by)
+
+
+def revoke_permissions_bulk(user_id: int, perms, revoked_by: int = None) -> int:
+    """Revoke several permissions from a user at once. Returns the number revoked."""
+    return _set_permissions_bulk(user_id, perms, 0, "REVOKE", revoked_by)
+
+
 def reset_user_permissions(user_id: int, role: str, reset_by: int = None) -> None:
     """Reset user permissions by revoking all permissions (no automatic granting)."""
     _ensure_permissions_table()
@@ -228,6 +308,7 @@ def reset_user_permissions(user_id: int, role: str, reset_by: int = None) -> Non
     with get_connection() as conn:
         conn.execute("DELETE FROM user_permissions WHERE user_id = ?", (user_id,))
         conn.commit()
+    invalidate_user_permissions(user_id)
 
     # Audit the reset
     audit_logger.log_action(
@@ -249,11 +330,21 @@ def seed_default_permissions() -> None:
     print("Use the Permission Management UI to grant permissions to users.")
 
 
+@lru_cache(maxsize=1)
 def get_all_permissions() -> Dict[str, str]:
-    """Get all available permissions with descriptions."""
+    """Get all available permissions with descriptions.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
     return PERMISSIONS.copy()
 
 
+@lru_cache(maxsize=1)
+def get_all_permission_keys() -> tuple:
+    """Get all permission keys as a cached tuple."""
+    return tuple(get_all_permissions().keys())
+
+
 def get_permission_matrix() -> List[Dict]:
     """Get permission matrix showing users and their permissions."""
     from modules import users
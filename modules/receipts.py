@@ -172,6 +172,65 @@ def format_receipt(sale_data: dict, currency_code: str = "KES", store_name: str
     return "\n".join(receipt)
 
 
+def _sales_search_query(
+    conn: sqlite3.Connection,
+    start_date: str = None,
+    end_date: str = None,
+    search_term: str = None,
+    extra_columns: str = "",
+) -> tuple[str, list]:
+    """Build the filtered sales query shared by the sales listing helpers.
+
+    Returns the query (without ORDER BY/LIMIT) and its parameters. `extra_columns`
+    is appended to the SELECT list.
+    """
+    # Check if customers table exists
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()]
+    has_customers = 'customers' in tables
+    
+    # Select sales with user and customer info for easier display
+    if has_customers:
+        query = (
+            f"SELECT s.*, u.username AS username, c.name AS customer_name{extra_columns} "
+            "FROM sales s "
+            "LEFT JOIN users u ON s.user_id = u.user_id "
+            "LEFT JOIN customers c ON s.customer_id = c.customer_id "
+            "WHERE 1=1"
+        )
+    else:
+        query = (
+            f"SELECT s.*, u.username AS username, NULL AS customer_name{extra_columns} "
+            "FROM sales s "
+            "LEFT JOIN users u ON s.user_id = u.user_id "
+            "WHERE 1=1"
+        )
+    params = []
+    
+    if start_date:
+        query += " AND s.date >= ?"
+        params.append(start_date)
+    if end_date:
+        query += " AND s.date <= ?"
+        params.append(end_date)
+    
+    # Search by sale_id, receipt_number, username, or customer name
+    if search_term:
+        try:
+            search_id = int(search_term)
+            query += " AND (s.sale_id = ? OR s.user_id = ?)"
+            params.extend([search_id, search_id])
+        except ValueError:
+            # Try searching by receipt_number or username or customer name (case-insensitive)
+            if has_customers:
+                query += " AND (UPPER(s.receipt_number) LIKE UPPER(?) OR UPPER(u.username) LIKE UPPER(?) OR UPPER(c.name) LIKE UPPER(?))"
+                params.extend([f"%{search_term}%"] * 3)
+            else:
+                query += " AND (UPPER(s.receipt_number) LIKE UPPER(?) OR UPPER(u.username) LIKE UPPER(?))"
+                params.extend([f"%{search_term}%"] * 2)
+    
+    return query, params
+
+
 def list_sales_with_search(
     start_date: str = None,
     end_date: str = None,
@@ -182,96 +241,63 @@ def list_sales_with_search(
     with get_connection() as conn:
         conn.row_factory = sqlite3.Row
         
-        # Check if customers table exists
-        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()]
-        has_customers = 'customers' in tables
-        
-        # Select sales with user and customer info for easier display
-        if has_customers:
-            query = (
-                "SELECT s.*, u.username AS username, c.name AS customer_name "
-                "FROM sales s "
-                "LEFT JOIN users u ON s.user_id = u.user_id "
-                "LEFT JOIN customers c ON s.customer_id = c.customer_id "
-                "WHERE 1=1"
-            )
-        else:
-            query = (
-                "SELECT s.*, u.username AS username, NULL AS customer_name "
-                "FROM sales s "
-                "LEFT JOIN users u ON s.user_id = u.user_id "
-                "WHERE 1=1"
-            )
-        params = []
-        
-        if start_date:
-            query += " AND s.date >= ?"
-            params.append(start_date)
-        if end_date:
-            query += " AND s.date <= ?"
-            params.append(end_date)
-        
-        # Search by sale_id, receipt_number, username, or customer name
-        if search_term:
-            try:
-                search_id = int(search_term)
-                query += " AND (s.sale_id = ? OR s.user_id = ?)"
-                params.extend([search_id, search_id])
-            except ValueError:
-                # Try searching by receipt_number or username or customer name (case-insensitive)
-                if has_customers:
-                    query += " AND (UPPER(s.receipt_number) LIKE UPPER(?) OR UPPER(u.username) LIKE UPPER(?) OR UPPER(c.name) LIKE UPPER(?))"
-                    params.extend([f"%{search_term}%"] * 3)
-                else:
-                    query += " AND (UPPER(s.receipt_number) LIKE UPPER(?) OR UPPER(u.username) LIKE UPPER(?))"
-                    params.extend([f"%{search_term}%"] * 2)
+        query, params = _sales_search_query(conn, start_date, end_date, search_term)
+        query += " ORDER BY s.date DESC, s.time DESC LIMIT ?"
+        # SQLite treats a negative LIMIT as "no limit"
+        params.append(limit if limit is not None else -1)
         
-        # Select sales with user and customer info for easier display
-        if has_customers:
-            query = (
-                "SELECT s.*, u.username AS username, c.name AS customer_name "
-                "FROM sales s "
-                "LEFT JOIN users u ON s.user_id = u.user_id "
-                "LEFT JOIN customers c ON s.customer_id = c.customer_id "
-                "WHERE 1=1"
-            )
-        else:
-            query = (
-                "SELECT s.*, u.username AS username, NULL AS customer_name "
-                "FROM sales s "
-                "LEFT JOIN users u ON s.user_id = u.user_id "
-                "WHERE 1=1"
-            )
-        params = []
+        rows = conn.execute(query, params).fetchall()
         
-        if start_date:
-            query += " AND s.date >= ?"
-            params.append(start_date)
-        if end_date:
-            query += " AND s.date <= ?"
-            params.append(end_date)
+        # Add void status to each sale
+        sales = []
+        for row in rows:
+            sale_dict = dict(row)
+            sale_dict["voided"] = bool(sale_dict.get("voided", 0))
+            sales.append(sale_dict)
         
-        # Search by sale_id, receipt_number, username, or customer name
-        if search_term:
-            try:
-                search_id = int(search_term)
-                query += " AND (s.sale_id = ? OR s.user_id = ?)"
-                params.extend([search_id, search_id])
-            except ValueError:
-                # Try searching by receipt_number or username or customer name (case-insensitive)
-                if has_customers:
-                    query += " AND (UPPER(s.receipt_number) LIKE UPPER(?) OR UPPER(u.username) LIKE UPPER(?) OR UPPER(c.name) LIKE UPPER(?))"
-                    params.extend([f"%{search_term}%"] * 3)
-                else:
-                    query += " AND (UPPER(s.receipt_number) LIKE UPPER(?) OR UPPER(u.username) LIKE UPPER(?))"
-                    params.extend([f"%{search_term}%"] * 2)
+        return sales
+
+
+# Refund status per listed sale. The subqueries are correlated on s.sale_id so
+# they only touch the rows of the sales being listed, via the sale_id and
+# sale_item_id indexes, instead of aggregating the whole sales history.
+_SALE_STATUS_COLUMN = (
+    ", CASE "
+    "WHEN s.voided THEN 'Voided' "
+    "WHEN EXISTS (SELECT 1 FROM sales_items si WHERE si.sale_id = s.sale_id) "
+    "AND NOT EXISTS ("
+    "SELECT 1 FROM sales_items si WHERE si.sale_id = s.sale_id AND si.quantity > COALESCE("
+    "(SELECT SUM(ri.quantity) FROM refunds_items ri WHERE ri.sale_item_id = si.sale_item_id), 0)"
+    ") THEN 'Fully Refunded' "
+    "WHEN EXISTS (SELECT 1 FROM refunds_items ri WHERE ri.sale_id = s.sale_id) THEN 'Partially Refunded' "
+    "ELSE 'Active' END AS status"
+)
+
+
+def list_sales_with_status(
+    start_date: str = None,
+    end_date: str = None,
+    search_term: str = None,
+    limit: int | None = 100
+) -> list[dict]:
+    """List sales like `list_sales_with_search`, with a computed `status` column.
+
+    Status is one of 'Voided', 'Fully Refunded', 'Partially Refunded' or 'Active',
+    resolved in the same query rather than with per-sale refund lookups.
+    Pass `limit=None` for no limit.
+    """
+    with get_connection() as conn:
+        conn.row_factory = sqlite3.Row
         
+        query, params = _sales_search_query(
+            conn, start_date, end_date, search_term,
+            extra_columns=_SALE_STATUS_COLUMN,
+        )
         query += " ORDER BY s.date DESC, s.time DESC LIMIT ?"
-        params.append(limit)
+        params.append(limit if limit is not None else -1)
         
         rows = conn.execute(query, params).fetchall()
         
-        # Add void status to each sale
         sales = []
         for row in rows:
             sale_dict = dict(row)
@@ -195,6 +195,7 @@ def update_reconciliation_entry(
 def get_system_amount_for_payment_method(session_id: int, payment_method: str) -> float:
     """Get the system amount for a payment method in a session."""
     with get_connection() as conn:
+        conn.row_factory = sqlite3.Row
         row = conn.execute(
             "SELECT system_amount FROM reconciliation_entries WHERE session_id = ? AND payment_method = ?",
             (session_id, payment_method)
@@ -205,6 +206,7 @@ def get_system_amount_for_payment_method(session_id: int, payment_method: str) -
 def _update_session_totals(session_id: int) -> None:
     """Update the total actual cash and variance for a session."""
     with get_connection() as conn:
+        conn.row_factory = sqlite3.Row
         # Calculate totals from entries
         totals = conn.execute(
             """
@@ -243,6 +245,26 @@ def complete_reconciliation_session(session_id: int, user_id: int, notes: str =
         conn.commit()
 
 
+def _session_filters(start_date: str = None, end_date: str = None, status: str = None) -> Tuple[str, List[Any]]:
+    """WHERE conditions and parameters shared by the session list and count queries."""
+    clause = ""
+    params = []
+
+    if start_date:
+        clause += " AND rs.reconciliation_date >= ?"
+        params.append(start_date)
+
+    if end_date:
+        clause += " AND rs.reconciliation_date <= ?"
+        params.append(end_date)
+
+    if status:
+        clause += " AND rs.status = ?"
+        params.append(status)
+
+    return clause, params
+
+
 def get_reconciliation_sessions(
     start_date: str = None,
     end_date: str = None,
@@ -250,27 +272,14 @@ def get_reconciliation_sessions(
     limit: int = 50,
     offset: int = 0
 ) -> List[Dict[str, Any]]:
-    """Get reconciliation sessions with optional filters."""
+    """Get one page of reconciliation sessions with optional filters, newest first."""
+    clause, params = _session_filters(start_date, end_date, status)
     query = """
         SELECT rs.*, u.username as reconciled_by_name
         FROM reconciliation_sessions rs
         LEFT JOIN users u ON rs.reconciled_by = u.user_id
         WHERE 1=1
-    """
-    params = []
-
-    if start_date:
-        query += " AND rs.reconciliation_date >= ?"
-        params.append(start_date)
-
-    if end_date:
-        query += " AND rs.reconciliation_date <= ?"
-        params.append(end_date)
-
-    if status:
-        query += " AND rs.status = ?"
-        params.append(status)
-
+    """ + clause
     query += " ORDER BY rs.reconciliation_date DESC, rs.created_at DESC LIMIT ? OFFSET ?"
     params.extend([limit, offset])
 
@@ -280,6 +289,17 @@ def get_reconciliation_sessions(
         return [dict(row) for row in rows]
 
 
+def count_reconciliation_sessions(start_date: str = None, end_date: str = None, status: str = None) -> int:
+    """Count the sessions get_reconciliation_sessions pages through for the same filters."""
+    clause, params = _session_filters(start_date, end_date, status)
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT COUNT(*) FROM reconciliation_sessions rs WHERE 1=1" + clause,
+            params
+        ).fetchone()
+        return row[0]
+
+
 def add_reconciliation_explanation(
     session_id: int,
     explanation_type: str,
@@ -237,6 +237,21 @@ def get_refunded_quantities_for_sale(original_sale_id: int) -> dict:
         return {row['sale_item_id']: float(row['refunded_qty']) for row in rows}
 
 
+def is_fully_refunded_from_map(sale_items, refunded: dict) -> bool:
+    """Return True if every sale line is covered by an already-fetched refunded quantities map.
+
+    `sale_items` are sales_items rows (dicts or sqlite3.Row) and `refunded` is the
+    mapping returned by `get_refunded_quantities_for_sale`. No database access.
+    """
+    if not sale_items:
+        return False
+    for si in sale_items:
+        already = refunded.get(si['sale_item_id'], 0.0)
+        if float(si['quantity']) > already:
+            return False
+    return True
+
+
 def is_sale_fully_refunded(original_sale_id: int) -> bool:
     """Return True if all sale line quantities have been refunded (considering refunds_items)."""
     with get_connection() as conn:
@@ -245,12 +260,48 @@ def is_sale_fully_refunded(original_sale_id: int) -> bool:
         if not sale_items:
             return False
         refunded = get_refunded_quantities_for_sale(original_sale_id)
-        for si in sale_items:
-            sid = si['sale_item_id']
-            already = refunded.get(sid, 0.0)
-            if float(si['quantity']) > already:
-                return False
-        return True
+        return is_fully_refunded_from_map(sale_items, refunded)
+
+
+def get_refund_status_sets(sale_ids) -> tuple[set, set]:
+    """Return (fully_refunded, with_refunds) sets of sale ids for many sales at once.
+
+    Equivalent to calling `is_sale_fully_refunded` and `get_refunded_quantities_for_sale`
+    per sale, but resolved with a couple of grouped queries per batch of ids.
+    """
+    ids = list(dict.fromkeys(sale_ids))
+    fully: set = set()
+    with_refunds: set = set()
+    if not ids:
+        return fully, with_refunds
+    with get_connection() as conn:
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            with_refunds.update(
+                row[0] for row in conn.execute(
+                    f"SELECT DISTINCT sale_id FROM refunds_items WHERE sale_id IN ({placeholders})",
+                    batch
+                )
+            )
+            rows = conn.execute(
+                f"""SELECT si.sale_id,
+                           COUNT(*) AS line_count,
+                           SUM(CASE WHEN COALESCE(r.refunded_qty, 0) >= si.quantity THEN 1 ELSE 0 END) AS covered
+                    FROM sales_items si
+                    LEFT JOIN (
+                        SELECT sale_item_id, SUM(quantity) AS refunded_qty
+                        FROM refunds_items
+                        WHERE sale_id IN ({placeholders})
+                        GROUP BY sale_item_id
+                    ) r ON r.sale_item_id = si.sale_item_id
+                    WHERE si.sale_id IN ({placeholders})
+                    GROUP BY si.sale_id""",
+                batch + batch
+            ).fetchall()
+            fully.update(row[0] for row in rows if row[1] and row[1] == row[2])
+    return fully, with_refunds
 
 
 def get_last_refund_for_sale(original_sale_id: int) -> dict | None:
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from database.init_db import get_connection
+from modules.units_of_measure import BASE_UNIT_LABELS
 
 # Simple in-memory cache with TTL
 _cache = {}
@@ -37,14 +38,7 @@ def _convert_quantity_to_display(qty_raw: float, is_special: bool, unit_multipli
         multiplier = float(unit_multiplier or 1000)
         qty_base = qty_raw / multiplier
         unit = unit_of_measure.lower() if unit_of_measure else ""
-        if unit in ("litre", "liter", "liters", "litres", "l"):
-            unit_label = "L"
-        elif unit in ("kilogram", "kilograms", "kg", "kgs"):
-            unit_label = "kg"
-        elif unit in ("meter", "meters", "metre", "metres", "m"):
-            unit_label = "m"
-        else:
-            unit_label = unit_of_measure or "unit"
+        unit_label = BASE_UNIT_LABELS.get(unit, unit_of_measure or "unit")
         return qty_base, unit_label
     else:
         return qty_raw, ""
@@ -3,6 +3,13 @@ from __future__ import annotations
 
 from database.init_db import get_connection
 
+# Lower-cased large-unit aliases -> the base unit label shown in reports
+BASE_UNIT_LABELS = {
+    "litre": "L", "liter": "L", "liters": "L", "litres": "L", "l": "L",
+    "kilogram": "kg", "kilograms": "kg", "kg": "kg", "kgs": "kg",
+    "meter": "m", "meters": "m", "metre": "m", "metres": "m", "m": "m",
+}
+
 
 def list_units(active_only: bool = True) -> list[dict]:
     """Return all units of measure."""
@@ -37,6 +44,20 @@ def get_unit_by_name(name: str) -> dict | None:
         ).fetchone()
 
 
+def get_units_by_names(names) -> dict[str, dict]:
+    """Get several units by name in one query, keyed by name."""
+    names = list(set(names))
+    if not names:
+        return {}
+    placeholders = ", ".join("?" for _ in names)
+    with get_connection() as conn:
+        conn.row_factory = lambda c, r: dict(zip([col[0] for col in c.description], r))
+        rows = conn.execute(
+            f"SELECT * FROM units_of_measure WHERE name IN ({placeholders})", names
+        ).fetchall()
+    return {row["name"]: row for row in rows}
+
+
 def create_unit(
     name: str,
     abbreviation: str = "",
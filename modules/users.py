@@ -41,14 +41,28 @@ def _row_to_dict(row: sqlite3.Row) -> dict:
     return {k: row[k] for k in row.keys()}
 
 
-def list_users(*, include_inactive: bool = True) -> list[dict]:
-    """Return all users as dicts."""
+def list_users(*, include_inactive: bool = True, search: str = "",
+               limit: int | None = None, offset: int = 0) -> list[dict]:
+    """Return users as dicts, optionally filtered by username and paged with limit/offset."""
+    clauses = []
+    params: list = []
+    if not include_inactive:
+        clauses.append("active = 1")
+    if search:
+        clauses.append("username LIKE ?")
+        params.append(f"%{search}%")
+
+    query = "SELECT * FROM users"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY username COLLATE NOCASE"
+    if limit is not None:
+        query += " LIMIT ? OFFSET ?"
+        params.extend((limit, offset))
+
     with get_connection() as conn:
         conn.row_factory = sqlite3.Row
-        if include_inactive:
-            cursor = conn.execute("SELECT * FROM users ORDER BY username COLLATE NOCASE")
-        else:
-            cursor = conn.execute("SELECT * FROM users WHERE active = 1 ORDER BY username COLLATE NOCASE")
+        cursor = conn.execute(query, params)
         return [_row_to_dict(row) for row in cursor.fetchall()]
 
 
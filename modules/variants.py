@@ -43,6 +43,34 @@ def list_variants(item_id: int) -> list[dict]:
         return rows
 
 
+def list_variants_for_items(item_ids) -> dict[int, list[dict]]:
+    """Get the variants of several items at once, keyed by item_id.
+
+    Items without variants are absent from the result.
+    """
+    item_ids = list(dict.fromkeys(item_ids))
+    variants_by_item: dict[int, list[dict]] = {}
+    with get_connection() as conn:
+        conn.row_factory = lambda c, r: dict(zip([col[0] for col in c.description], r))
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"""
+                SELECT variant_id, item_id, variant_name, selling_price, cost_price, quantity, barcode, sku, 
+                       vat_rate, low_stock_threshold, image_path, is_active, created_at
+                FROM item_variants
+                WHERE item_id IN ({placeholders})
+                ORDER BY item_id, variant_name
+                """,
+                chunk
+            ).fetchall()
+            for row in rows:
+                variants_by_item.setdefault(row["item_id"], []).append(row)
+    return variants_by_item
+
+
 def get_variant(variant_id: int) -> dict | None:
     """Get a single variant by ID."""
     with get_connection() as conn:
@@ -39,9 +39,8 @@ def seed_permissions():
         print(f"\n🔑 Granting all permissions to {len(admin_users)} admin user(s):")
         for admin in admin_users:
             print(f"  - {admin['username']}")
-            # Grant all permissions to admin users
-            for perm in permissions.get_all_permissions().keys():
-                permissions.grant_permission(admin['user_id'], perm, 0)  # System grant
+            # Grant all permissions to admin users in one transaction
+            permissions.grant_permissions_bulk(admin['user_id'], permissions.get_all_permission_keys(), 0)  # System grant
 
         print("\n✅ Admin users now have full access to all features!")
     else:
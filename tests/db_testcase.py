@@ -0,0 +1,37 @@
+"""Shared base class for tests that run against a scratch database."""
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import init_db
+
+
+class TempDatabaseTestCase(unittest.TestCase):
+    """Point the app at a fresh temporary database for the duration of the class.
+
+    Subclasses seed their data in `seed_database`, and call
+    `super().tearDownClass()` if they override `tearDownClass`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the temporary database and seed it."""
+        cls._old_db_path = init_db.DB_PATH
+        cls.tmpdir = tempfile.mkdtemp()
+        init_db.initialize_database(os.path.join(cls.tmpdir, "test.db"))
+        cls.seed_database()
+
+    @classmethod
+    def seed_database(cls):
+        """Insert the rows the tests need; the default leaves the database empty."""
+
+    @classmethod
+    def tearDownClass(cls):
+        """Restore the default database path and remove the temporary database."""
+        init_db.DB_PATH = cls._old_db_path
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
@@ -0,0 +1,83 @@
+"""Unit tests for the cached cart settings."""
+import unittest
+import sys
+import os
+import importlib.util
+import types
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import security
+from tests.db_testcase import TempDatabaseTestCase
+
+
+class CartSettingsTestCase(TempDatabaseTestCase):
+    """Scratch database that drops the cached cart settings afterwards."""
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop cart settings cached from the scratch database."""
+        security.get_cart_vat_enabled.cache_clear()
+        security.get_cart_discount_enabled.cache_clear()
+        security.get_cart_suspend_enabled.cache_clear()
+        super().tearDownClass()
+
+
+class TestCartSettingsCache(CartSettingsTestCase):
+    """Test that saved cart settings are visible through the cached getters."""
+
+    def setUp(self):
+        """Start every test with all toggles on and the getters cached."""
+        security.set_cart_settings(True, True, True)
+        self.assertTrue(security.get_cart_vat_enabled())
+        self.assertTrue(security.get_cart_discount_enabled())
+        self.assertTrue(security.get_cart_suspend_enabled())
+
+    def test_save_settings_refreshes_cached_getters(self):
+        """Saving through the settings helper is seen without a restart."""
+        security.set_cart_settings(False, True, False)
+        self.assertFalse(security.get_cart_vat_enabled())
+        self.assertTrue(security.get_cart_discount_enabled())
+        self.assertFalse(security.get_cart_suspend_enabled())
+
+    def test_individual_setters_refresh_cached_getters(self):
+        """Each single-setting setter clears its own cache."""
+        security.set_cart_discount_enabled(False)
+        self.assertFalse(security.get_cart_discount_enabled())
+        self.assertTrue(security.get_cart_vat_enabled())
+
+
+@unittest.skipUnless(importlib.util.find_spec("matplotlib"), "UI package needs matplotlib")
+class TestCartLayoutFollowsSettings(CartSettingsTestCase):
+    """Test that POS and Cart re-lay out their totals after a settings save."""
+
+    def _assert_relayout_on_save(self, frame_cls):
+        applied = []
+        frame = types.SimpleNamespace(
+            _layout_flags=None,
+            _apply_layout=lambda *flags: applied.append(flags),
+            _update_resume_btn=lambda: None,
+        )
+        security.set_cart_settings(True, True, True)
+        frame_cls._update_ui_layout(frame)
+        frame_cls._update_ui_layout(frame)
+        self.assertEqual(applied, [(True, True, True)])
+
+        security.set_cart_settings(False, True, False)
+        frame_cls._update_ui_layout(frame)
+        self.assertEqual(applied, [(True, True, True), (False, True, False)])
+
+    def test_pos_layout_follows_saved_settings(self):
+        """POS applies the new toggles on its next refresh."""
+        from ui.pos import PosFrame
+        self._assert_relayout_on_save(PosFrame)
+
+    def test_cart_layout_follows_saved_settings(self):
+        """The Cart view applies the new toggles on its next refresh."""
+        from ui.cart import CartFrame
+        self._assert_relayout_on_save(CartFrame)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.init_db import initialize_database
 from modules import items
+from tests.db_testcase import TempDatabaseTestCase
 
 
 class TestItems(unittest.TestCase):
@@ -85,5 +86,33 @@ class TestItems(unittest.TestCase):
         self.assertIsNone(items.get_item(item['item_id']))
 
 
+class TestItemLookups(TempDatabaseTestCase):
+    """Test item lookups against a scratch database."""
+
+    @classmethod
+    def seed_database(cls):
+        """Create one barcoded item."""
+        cls.item = items.create_item(name="Soda", barcode="5000112", selling_price=60.0)
+
+    def test_get_item_by_barcode(self):
+        """An exact barcode returns the item."""
+        found = items.get_item_by_barcode("5000112")
+        self.assertIsNotNone(found)
+        self.assertEqual(found['item_id'], self.item['item_id'])
+
+    def test_get_item_by_barcode_requires_exact_match(self):
+        """Partial or unknown barcodes do not match."""
+        self.assertIsNone(items.get_item_by_barcode("50001"))
+        self.assertIsNone(items.get_item_by_barcode("999"))
+        self.assertIsNone(items.get_item_by_barcode(""))
+
+    def test_list_items_returns_typed_prices(self):
+        """Catalog rows carry float prices and a usable unit size."""
+        row = next(r for r in items.list_items() if r['item_id'] == self.item['item_id'])
+        self.assertIsInstance(row['selling_price'], float)
+        self.assertIsInstance(row['cost_price'], float)
+        self.assertGreater(row['unit_size_ml'], 0)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
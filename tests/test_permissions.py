@@ -0,0 +1,92 @@
+"""Unit tests for the permissions module."""
+import unittest
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import init_db
+from modules import permissions
+from tests.db_testcase import TempDatabaseTestCase
+
+
+class TestPermissionCache(TempDatabaseTestCase):
+    """Test the cached permission lookups against a scratch database."""
+
+    @classmethod
+    def seed_database(cls):
+        """Insert a single cashier."""
+        with init_db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO users (user_id, username, password_hash, role) VALUES (1, 'cashier1', 'x', 'cashier')"
+            )
+            conn.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop cached permissions read from the scratch database."""
+        permissions.invalidate_user_permissions()
+        super().tearDownClass()
+
+    def setUp(self):
+        """Start every test from a user without explicit permissions."""
+        permissions.reset_user_permissions(1, "cashier")
+
+    def test_grant_invalidates_cached_permissions(self):
+        """A grant is visible immediately after a cached read."""
+        self.assertEqual(permissions.get_user_permissions(1), set())
+        permissions.grant_permission(1, "view_reports")
+        self.assertEqual(permissions.get_user_permissions(1), {"view_reports"})
+
+    def test_revoke_invalidates_cached_permissions(self):
+        """A revoke moves the permission between the cached sets."""
+        permissions.grant_permission(1, "view_reports")
+        self.assertIn("view_reports", permissions.get_user_permissions(1))
+        permissions.revoke_permission(1, "view_reports")
+        self.assertNotIn("view_reports", permissions.get_user_permissions(1))
+        self.assertEqual(permissions.get_revoked_permissions(1), {"view_reports"})
+
+    def test_returned_sets_do_not_alias_cache(self):
+        """Mutating a returned set leaves the cached copy alone."""
+        permissions.get_user_permissions(1).add("view_reports")
+        self.assertEqual(permissions.get_user_permissions(1), set())
+
+    def test_bulk_grant_and_revoke(self):
+        """Bulk helpers write every permission and report the count."""
+        perms = ["view_reports", "export_reports", "view_reports"]
+        self.assertEqual(permissions.grant_permissions_bulk(1, perms), 2)
+        self.assertEqual(permissions.get_user_permissions(1), {"view_reports", "export_reports"})
+        self.assertEqual(permissions.revoke_permissions_bulk(1, ["export_reports"]), 1)
+        self.assertEqual(permissions.get_user_permissions(1), {"view_reports"})
+        self.assertEqual(permissions.get_revoked_permissions(1), {"export_reports"})
+
+    def test_bulk_grant_rejects_unknown_permission(self):
+        """Unknown keys are rejected before anything is written."""
+        with self.assertRaises(ValueError):
+            permissions.grant_permissions_bulk(1, ["view_reports", "no_such_permission"])
+        self.assertEqual(permissions.get_user_permissions(1), set())
+
+    def test_permission_bundle_matches_individual_helpers(self):
+        """The bundle agrees with the per-set helpers."""
+        permissions.grant_permission(1, "view_reports")
+        permissions.revoke_permission(1, "export_reports")
+        user = {"user_id": 1, "role": "cashier"}
+        bundle = permissions.get_user_permission_bundle(1, "cashier")
+        self.assertEqual(bundle["user"], permissions.get_user_permissions(1))
+        self.assertEqual(bundle["revoked"], permissions.get_revoked_permissions(1))
+        self.assertEqual(bundle["role"], permissions.get_role_permissions("cashier"))
+        self.assertEqual(bundle["effective"], permissions.get_effective_permissions(user))
+
+    def test_all_permission_keys(self):
+        """Cached key tuple matches the permission catalogue."""
+        self.assertEqual(permissions.get_all_permission_keys(), tuple(permissions.PERMISSIONS))
+
+    def test_role_permissions(self):
+        """Role defaults are returned for known roles only."""
+        self.assertIn("access_pos", permissions.get_role_permissions("cashier"))
+        self.assertEqual(permissions.get_role_permissions("unknown"), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
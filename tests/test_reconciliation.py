@@ -0,0 +1,86 @@
+"""Unit tests for the reconciliation module."""
+import unittest
+import sys
+import os
+import threading
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import init_db
+from modules import reconciliation
+from tests.db_testcase import TempDatabaseTestCase
+
+
+class TestSessionPaging(TempDatabaseTestCase):
+    """Test paging through reconciliation sessions against a scratch database."""
+
+    @classmethod
+    def seed_database(cls):
+        """Insert a handful of sessions."""
+        with init_db.get_connection() as conn:
+            for day in range(1, 8):
+                conn.execute(
+                    "INSERT INTO reconciliation_sessions (reconciliation_date, period_type, start_date, end_date, status) "
+                    "VALUES (?, 'daily', ?, ?, ?)",
+                    (f"2024-01-0{day}", f"2024-01-0{day}", f"2024-01-0{day}", "completed" if day % 2 else "draft")
+                )
+            conn.commit()
+
+    def test_count_matches_filters(self):
+        """The count applies the same filters as the session list."""
+        self.assertEqual(reconciliation.count_reconciliation_sessions(), 7)
+        self.assertEqual(reconciliation.count_reconciliation_sessions(status="completed"), 4)
+        self.assertEqual(reconciliation.count_reconciliation_sessions(start_date="2024-01-03", end_date="2024-01-05"), 3)
+
+    def test_pages_cover_all_sessions_once(self):
+        """Consecutive pages return every session exactly once, newest first."""
+        pages = [
+            reconciliation.get_reconciliation_sessions(limit=3, offset=offset)
+            for offset in (0, 3, 6)
+        ]
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        dates = [s["reconciliation_date"] for page in pages for s in page]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+        self.assertEqual(len(set(dates)), 7)
+
+
+class TestEntryUpdates(TempDatabaseTestCase):
+    """Test entry updates against a scratch database."""
+
+    @classmethod
+    def seed_database(cls):
+        """Insert one session with a cash entry."""
+        with init_db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO reconciliation_sessions (session_id, reconciliation_date, period_type, start_date, end_date, status) "
+                "VALUES (1, '2024-01-01', 'daily', '2024-01-01', '2024-01-01', 'draft')"
+            )
+            conn.execute(
+                "INSERT INTO reconciliation_entries (session_id, payment_method, system_amount) VALUES (1, 'Cash', 100)"
+            )
+            conn.commit()
+
+    def test_update_entry_from_worker_thread(self):
+        """Updates work on a fresh thread-local connection, as the UI's writer thread uses."""
+        errors = []
+
+        def work():
+            try:
+                reconciliation.update_reconciliation_entry(1, "Cash", 90.0, "short")
+            except Exception as e:
+                errors.append(e)
+
+        worker = threading.Thread(target=work)
+        worker.start()
+        worker.join()
+        self.assertEqual(errors, [])
+
+        session = reconciliation.get_reconciliation_session(1)
+        self.assertEqual(session.entries[0].variance, -10.0)
+        self.assertEqual(session.total_actual_cash, 90.0)
+        self.assertEqual(session.total_variance, -10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Unit tests for refunds module helpers."""
+import unittest
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import init_db
+from modules import receipts, refunds
+from tests.db_testcase import TempDatabaseTestCase
+
+
+class TestRefundStatusHelpers(unittest.TestCase):
+    """Test cases for refund status helpers that work on prefetched data."""
+
+    def setUp(self):
+        """Set up sample sale lines."""
+        self.sale_items = [
+            {"sale_item_id": 1, "quantity": 2},
+            {"sale_item_id": 2, "quantity": 1.5},
+        ]
+
+    def test_fully_refunded_when_all_lines_covered(self):
+        """All lines refunded in full."""
+        self.assertTrue(refunds.is_fully_refunded_from_map(self.sale_items, {1: 2.0, 2: 1.5}))
+
+    def test_not_fully_refunded_when_line_partial(self):
+        """One line only partially refunded."""
+        self.assertFalse(refunds.is_fully_refunded_from_map(self.sale_items, {1: 2.0, 2: 0.5}))
+
+    def test_not_fully_refunded_without_refunds(self):
+        """No refunds recorded."""
+        self.assertFalse(refunds.is_fully_refunded_from_map(self.sale_items, {}))
+
+    def test_empty_sale_is_not_fully_refunded(self):
+        """A sale without lines is never reported as fully refunded."""
+        self.assertFalse(refunds.is_fully_refunded_from_map([], {}))
+
+
+
+class TestRefundStatusSets(TempDatabaseTestCase):
+    """Test bulk refund status lookup against a scratch database."""
+
+    @classmethod
+    def seed_database(cls):
+        """Insert a few sales, one fully and one partially refunded."""
+        with init_db.get_connection() as conn:
+            conn.execute("INSERT INTO items (item_id, name) VALUES (1, 'Test Item')")
+            for sale_id, voided in ((1, 0), (2, 0), (3, 0), (4, 1)):
+                conn.execute(
+                    "INSERT INTO sales (sale_id, date, time, total, payment, voided) VALUES (?, '2026-01-01', '10:00:00', 10, 10, ?)",
+                    (sale_id, voided)
+                )
+            # (sale_item_id, sale_id, quantity)
+            for sale_item_id, sale_id, qty in ((1, 1, 2), (2, 1, 1), (3, 2, 3), (4, 3, 1), (5, 4, 1)):
+                conn.execute(
+                    "INSERT INTO sales_items (sale_item_id, sale_id, item_id, quantity, price) VALUES (?, ?, 1, ?, 5)",
+                    (sale_item_id, sale_id, qty)
+                )
+            conn.execute("INSERT INTO refunds (refund_id, refund_code, original_sale_id, refund_amount, created_at) VALUES (1, 'R1', 1, 15, '2026-01-01')")
+            conn.execute("INSERT INTO refunds (refund_id, refund_code, original_sale_id, refund_amount, created_at) VALUES (2, 'R2', 2, 5, '2026-01-01')")
+            # Sale 1 fully refunded across two lines, sale 2 partially refunded
+            for refund_id, sale_item_id, sale_id, qty in ((1, 1, 1, 2), (1, 2, 1, 1), (2, 3, 2, 1)):
+                conn.execute(
+                    "INSERT INTO refunds_items (refund_id, sale_item_id, sale_id, item_id, quantity, line_total) VALUES (?, ?, ?, 1, ?, 0)",
+                    (refund_id, sale_item_id, sale_id, qty)
+                )
+            conn.commit()
+
+    def test_status_sets_match_per_sale_helpers(self):
+        """Bulk sets agree with the per-sale refund helpers."""
+        fully, with_refunds = refunds.get_refund_status_sets([1, 2, 3])
+        self.assertEqual(fully, {1})
+        self.assertEqual(with_refunds, {1, 2})
+        for sale_id in (1, 2, 3):
+            self.assertEqual(sale_id in fully, refunds.is_sale_fully_refunded(sale_id))
+            self.assertEqual(sale_id in with_refunds, bool(refunds.get_refunded_quantities_for_sale(sale_id)))
+
+    def test_list_sales_with_status(self):
+        """Sales listing carries the same status the order history used to compute per sale."""
+        statuses = {s["sale_id"]: s["status"] for s in receipts.list_sales_with_status(limit=None)}
+        self.assertEqual(statuses, {
+            1: "Fully Refunded",
+            2: "Partially Refunded",
+            3: "Active",
+            4: "Voided",
+        })
+
+    def test_status_sets_empty_input(self):
+        """No sale ids yields empty sets."""
+        self.assertEqual(refunds.get_refund_status_sets([]), (set(), set()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@ from utils.security import get_cart_vat_enabled, get_cart_discount_enabled, get_
 from utils.i18n import get_currency_symbol
 from utils.cart_pubsub import subscribe_cart_changed, unsubscribe_cart_changed, notify_cart_changed
 from utils.images import load_thumbnail
+from utils import sync_tree
 
 
 class CartFrame(ttk.Frame):
@@ -25,9 +26,21 @@ class CartFrame(ttk.Frame):
         self.total_var = tk.StringVar(value="0.00")
         self.discount_var = tk.StringVar(value="0")
         self.payment_var = tk.StringVar(value="0")
+        # Parsed discount fraction, kept in step with the entry by a trace
+        self._discount_pct = 0.0
+        self.discount_var.trace_add("write", self._on_discount_changed)
         self.payment_method_var = tk.StringVar(value="Cash")
         self.change_var = tk.StringVar(value="0.00")
         self._preview_cache: dict[int, tk.PhotoImage] = {}
+        # Rows currently shown in the cart tree (iid -> values), diffed on refresh
+        self._tree_state: dict[str, tuple] = {}
+        # Cart lines by cart_id (the tree iid), rebuilt on every refresh
+        self._cart_by_id: dict[int, dict] = {}
+        # Subtotal and rate-weighted VAT sum of the last cart refresh
+        self._subtotal = 0.0
+        self._vat_weighted = 0.0
+        # Pending after() id for the debounced discount refresh
+        self._discount_after_id = None
 
         # Store references to conditionally shown widgets
         self.vat_label = None
@@ -40,6 +53,8 @@ class CartFrame(ttk.Frame):
         # Store references to totals frame and actions frame for dynamic updates
         self.totals_frame = None
         self.actions_frame = None
+        # (VAT, discount, suspend) settings the totals/actions were last laid out for
+        self._layout_flags: tuple | None = None
 
         self._build_ui()
         self._refresh_cart()
@@ -116,8 +131,8 @@ class CartFrame(ttk.Frame):
         self.totals_frame = ttk.Frame(side, padding=(0, 8))
         self.totals_frame.pack(fill=tk.X)
         self.totals_frame.columnconfigure(1, weight=1)
-        ttk.Label(self.totals_frame, text="Subtotal:").grid(row=0, column=0, sticky=tk.W)
-        ttk.Label(self.totals_frame, textvariable=self.subtotal_var, font=("Segoe UI", 11, "bold")).grid(row=0, column=1, sticky=tk.W, padx=(8, 0))
+        self.subtotal_label = ttk.Label(self.totals_frame, text="Subtotal:")
+        self.subtotal_display = ttk.Label(self.totals_frame, textvariable=self.subtotal_var, font=("Segoe UI", 11, "bold"))
 
         # VAT display - will be shown/hidden dynamically
         self.vat_label = ttk.Label(self.totals_frame, text="VAT:")
@@ -126,7 +141,7 @@ class CartFrame(ttk.Frame):
         # Discount input - will be shown/hidden dynamically
         self.discount_label = ttk.Label(self.totals_frame, text="Discount (%):")
         self.discount_entry = ttk.Entry(self.totals_frame, textvariable=self.discount_var, width=8)
-        self.discount_entry.bind("<KeyRelease>", lambda _e: self._refresh_cart())
+        self.discount_entry.bind("<KeyRelease>", lambda _e: self._schedule_refresh_cart())
 
         # Payment method and total (always shown)
         self.payment_label = ttk.Label(self.totals_frame, text="Payment Method:")
@@ -138,14 +153,24 @@ class CartFrame(ttk.Frame):
         # Actions section
         self.actions_frame = ttk.Frame(side)
         self.actions_frame.pack(pady=(6, 0))
-        ttk.Button(self.actions_frame, text="Checkout / Save Sale", command=self._checkout).pack(side=tk.LEFT, padx=4)
+        self.checkout_button = ttk.Button(self.actions_frame, text="Checkout / Save Sale", command=self._checkout)
 
         # Suspend/Resume buttons - will be shown/hidden dynamically
         self.suspend_button = ttk.Button(self.actions_frame, text="Suspend", command=self._suspend)
         self.resume_button = ttk.Button(self.actions_frame, text="Resume", command=self._resume)
 
     def _update_ui_layout(self) -> None:
-        """Update the UI layout based on current cart settings."""
+        """Update the UI layout based on current cart settings.
+
+        Runs on every cart refresh, so the widgets are only re-laid out when
+        one of the settings actually changed.
+        """
+        flags = (get_cart_vat_enabled(), get_cart_discount_enabled(), get_cart_suspend_enabled())
+        if flags != self._layout_flags:
+            self._layout_flags = flags
+            self._apply_layout(*flags)
+
+    def _apply_layout(self, vat_enabled: bool, discount_enabled: bool, suspend_enabled: bool) -> None:
         # Clear existing grid layout
         for widget in self.totals_frame.winfo_children():
             widget.grid_forget()
@@ -155,28 +180,22 @@ class CartFrame(ttk.Frame):
             widget.pack_forget()
 
         # Always show subtotal
-        ttk.Label(self.totals_frame, text="Subtotal:").grid(row=0, column=0, sticky=tk.W)
-        ttk.Label(self.totals_frame, textvariable=self.subtotal_var, font=("Segoe UI", 11, "bold")).grid(row=0, column=1, sticky=tk.W, padx=(8, 0))
+        self.subtotal_label.grid(row=0, column=0, sticky=tk.W)
+        self.subtotal_display.grid(row=0, column=1, sticky=tk.W, padx=(8, 0))
 
         row_idx = 1
 
         # VAT display - conditionally shown
-        if get_cart_vat_enabled():
+        if vat_enabled:
             self.vat_label.grid(row=row_idx, column=0, sticky=tk.W, pady=(2, 0))
             self.vat_display.grid(row=row_idx, column=1, sticky=tk.W, padx=(8, 0))
             row_idx += 1
-        else:
-            self.vat_label.grid_forget()
-            self.vat_display.grid_forget()
 
         # Discount input - conditionally shown
-        if get_cart_discount_enabled():
+        if discount_enabled:
             self.discount_label.grid(row=row_idx, column=0, sticky=tk.W, pady=(2, 0))
             self.discount_entry.grid(row=row_idx, column=1, sticky=tk.W, padx=(8, 0))
             row_idx += 1
-        else:
-            self.discount_label.grid_forget()
-            self.discount_entry.grid_forget()
 
         # Payment method (always shown)
         self.payment_label.grid(row=row_idx, column=0, sticky=tk.W, pady=(2, 0))
@@ -188,15 +207,12 @@ class CartFrame(ttk.Frame):
         self.total_display.grid(row=row_idx, column=1, sticky=tk.W, padx=(8, 0))
 
         # Actions - always show checkout button
-        ttk.Button(self.actions_frame, text="Checkout / Save Sale", command=self._checkout).pack(side=tk.LEFT, padx=4)
+        self.checkout_button.pack(side=tk.LEFT, padx=4)
 
         # Suspend/Resume buttons - conditionally shown
-        if get_cart_suspend_enabled():
+        if suspend_enabled:
             self.suspend_button.pack(side=tk.LEFT, padx=4)
             self.resume_button.pack(side=tk.LEFT, padx=4)
-        else:
-            self.suspend_button.pack_forget()
-            self.resume_button.pack_forget()
 
     def _thumb(self, item: dict) -> tk.PhotoImage | None:
         item_id = item.get("item_id")
@@ -213,52 +229,73 @@ class CartFrame(ttk.Frame):
         # Update UI layout based on current settings
         self._update_ui_layout()
 
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        cur = self.currency_symbol
         subtotal = 0.0
+        # Sum of line_total * VAT rate, folded into the same pass as the subtotal
+        vat_weighted = 0.0
+        new_state: dict[str, tuple] = {}
+        self._cart_by_id = {}
         for entry in self.cart:
+            self._cart_by_id[entry["cart_id"]] = entry
             line_total = entry.get("price", 0) * entry.get("quantity", 0)
             subtotal += line_total
-            self.tree.insert("", tk.END, iid=str(entry["item_id"]), values=(entry["name"], f"{self.currency_symbol} {entry['price']:.2f}", entry["quantity"], f"{self.currency_symbol} {line_total:.2f}"))
+            vat_weighted += line_total * entry.get("vat_rate", 16.0) / 100.0
+            new_state[str(entry["cart_id"])] = (entry["name"], f"{cur} {entry['price']:.2f}", entry["quantity"], f"{cur} {line_total:.2f}")
+        sync_tree(self.tree, self._tree_state, new_state)
+        self._tree_state = new_state
+        self._subtotal = subtotal
+        self._vat_weighted = vat_weighted
+        self._recompute_totals()
+        self._update_preview()
+
+    def _recompute_totals(self) -> None:
+        """Recompute discount, VAT and total from the sums of the last cart refresh."""
+        subtotal = self._subtotal
+        vat_weighted = self._vat_weighted
+        cur = self.currency_symbol
 
         # Check settings for VAT and discount functionality
         vat_enabled = get_cart_vat_enabled()
         discount_enabled = get_cart_discount_enabled()
 
-        discount_amt = 0.0
-        if discount_enabled:
-            try:
-                discount_pct = float(self.discount_var.get() or 0) / 100.0
-            except ValueError:
-                discount_pct = 0.0
-            discount_amt = subtotal * discount_pct
+        discount_pct = self._discount_pct if discount_enabled else 0.0
+        discount_amt = subtotal * discount_pct
 
         vat_base = subtotal - discount_amt
-        vat_amt = 0.0
-        if vat_enabled:
-            for entry in self.cart:
-                line_subtotal = entry.get("price", 0) * entry.get("quantity", 0)
-                item_discount = line_subtotal * (discount_amt / subtotal if subtotal > 0 else 0) if discount_enabled else 0
-                item_vat_base = line_subtotal - item_discount
-                item_vat_rate = entry.get("vat_rate", 16.0) / 100.0
-                vat_amt += item_vat_base * item_vat_rate
+        # The discount is spread over lines pro rata, so it scales VAT the same way
+        vat_amt = vat_weighted * (1.0 - discount_pct) if vat_enabled else 0.0
 
         total = vat_base + vat_amt
 
-        self.subtotal_var.set(f"{self.currency_symbol} {subtotal:.2f}")
-        self.vat_var.set(f"{self.currency_symbol} {vat_amt:.2f}")
-        self.total_var.set(f"{self.currency_symbol} {total:.2f}")
-        self._update_preview()
+        self.subtotal_var.set(f"{cur} {subtotal:.2f}")
+        self.vat_var.set(f"{cur} {vat_amt:.2f}")
+        self.total_var.set(f"{cur} {total:.2f}")
+
+    def _on_discount_changed(self, *_args) -> None:
+        try:
+            self._discount_pct = float(self.discount_var.get() or 0) / 100.0
+        except ValueError:
+            self._discount_pct = 0.0
+
+    def _schedule_refresh_cart(self) -> None:
+        """Debounce discount keystrokes so a burst of typing triggers one refresh."""
+        if self._discount_after_id is not None:
+            self.after_cancel(self._discount_after_id)
+        self._discount_after_id = self.after(250, self._do_refresh_cart)
+
+    def _do_refresh_cart(self) -> None:
+        if self._discount_after_id is not None:
+            # Checkout flushes a pending discount edit before reading totals
+            self.after_cancel(self._discount_after_id)
+            self._discount_after_id = None
+        # The cart lines are unchanged, only the totals depend on the discount
+        self._recompute_totals()
 
     def _selected(self):
         sel = self.tree.selection()
         if not sel:
             return None
-        item_id = int(sel[0])
-        for entry in self.cart:
-            if entry.get("item_id") == item_id:
-                return entry
-        return None
+        return self._cart_by_id.get(int(sel[0]))
 
     def _update_preview(self) -> None:
         entry = self._selected()
@@ -288,7 +325,7 @@ class CartFrame(ttk.Frame):
         entry = self._selected()
         if not entry:
             return
-        self.cart[:] = [e for e in self.cart if e.get("item_id") != entry.get("item_id")]
+        self.cart[:] = [e for e in self.cart if e is not entry]
         self._refresh_cart()
         notify_cart_changed()
 
@@ -299,7 +336,7 @@ class CartFrame(ttk.Frame):
         if entry.get("quantity", 1) > 1:
             entry["quantity"] -= 1
         else:
-            self.cart[:] = [e for e in self.cart if e.get("item_id") != entry.get("item_id")]
+            self.cart[:] = [e for e in self.cart if e is not entry]
         self._refresh_cart()
         notify_cart_changed()
 
@@ -333,6 +370,8 @@ class CartFrame(ttk.Frame):
         if not self.cart:
             messagebox.showinfo("Checkout", "Cart is empty")
             return
+        if self._discount_after_id is not None:
+            self._do_refresh_cart()
         try:
             subtotal = float(self.subtotal_var.get().replace(self.currency_symbol, '').strip())
             vat_amt = float(self.vat_var.get().replace(self.currency_symbol, '').strip())
@@ -5,7 +5,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from database.init_db import get_connection
-from utils.security import set_payment_methods
+from utils.security import set_cart_settings, set_payment_methods
 
 
 def set_dialog_icon(dialog: tk.Toplevel) -> None:
@@ -226,19 +226,16 @@ class CartSettingsFrame(ttk.Frame):
 
     def save_settings(self):
         """Save settings to database."""
-        with get_connection() as conn:
-            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-                        ("vat_enabled", "true" if self.vat_enabled_var.get() else "false"))
-            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-                        ("discount_enabled", "true" if self.discount_enabled_var.get() else "false"))
-            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-                        ("suspend_enabled", "true" if self.suspend_enabled_var.get() else "false"))
-
-            # Persist payment methods via helper (which will also notify listeners)
-            methods = list(self.pm_listbox.get(0, tk.END))
-            set_payment_methods(methods)
-            # Other settings already committed above
+        # Goes through the helper so the cached cart settings are refreshed
+        set_cart_settings(
+            self.vat_enabled_var.get(),
+            self.discount_enabled_var.get(),
+            self.suspend_enabled_var.get(),
+        )
 
+        # Persist payment methods via helper (which will also notify listeners)
+        methods = list(self.pm_listbox.get(0, tk.END))
+        set_payment_methods(methods)
 
         messagebox.showinfo("Saved", "Cart management settings saved successfully!")
 
@@ -5,10 +5,12 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime, timedelta
 import tkcalendar
+import csv
+import io
 import logging
 import os
 
-from modules import receipts, refunds
+from modules import permissions, receipts, refunds
 from utils import set_window_icon
 from utils.security import get_currency_code, subscribe_payment_methods, unsubscribe_payment_methods, get_payment_methods
 
@@ -67,6 +69,11 @@ class OrderHistoryFrame(ttk.Frame):
         super().__init__(master, padding=(12, 12, 12, 20), **kwargs)
         self.on_home = on_home
         self.tree = None
+        # Cached popup windows keyed by dialog kind; reused instead of recreated per open
+        self._dialogs: dict[str, tk.Toplevel] = {}
+        # Tcl command names registered by each cached dialog's current contents
+        self._dialog_commands: dict[str, list[str]] = {}
+        self._refresh_current_user()
         self._build_ui()
         # Populate dynamic filter lists
         self._load_filter_lists()
@@ -207,6 +214,52 @@ class OrderHistoryFrame(ttk.Frame):
         self.voids_label = ttk.Label(bottom, text="Voids: 0 (0.00)", font=("Segoe UI", 9))
         self.voids_label.pack(side=tk.LEFT, padx=8)
     
+    def _refresh_current_user(self) -> None:
+        """Resolve the logged-in user once for audit logging; call again if the login changes."""
+        self._current_user = (
+            getattr(self.winfo_toplevel(), 'current_user', None)
+            or getattr(self.master, 'current_user', None)
+            or {}
+        )
+        self._username = self._current_user.get('username', 'Unknown')
+
+    def _acquire_dialog(self, kind: str, title: str) -> tk.Toplevel:
+        """Return an empty, withdrawn Toplevel for `kind`, reusing the cached window if it exists."""
+        top = self._dialogs.get(kind)
+        if top is not None and top.winfo_exists():
+            for child in top.winfo_children():
+                child.destroy()
+            # Drop Tcl callbacks registered by the previous contents (validate commands)
+            for name in self._dialog_commands.pop(kind, []):
+                top.deletecommand(name)
+        else:
+            top = tk.Toplevel(self)
+            set_window_icon(top)
+            top.transient(self.winfo_toplevel())
+            top.protocol("WM_DELETE_WINDOW", lambda: self._release_dialog(top))
+            self._dialogs[kind] = top
+        top.withdraw()
+        top.title(title)
+        return top
+
+    def _register_dialog_command(self, kind: str, func) -> str:
+        """Register `func` on the cached `kind` dialog; it is deleted when the dialog is next acquired."""
+        name = self._dialogs[kind].register(func)
+        self._dialog_commands.setdefault(kind, []).append(name)
+        return name
+
+    def _show_dialog(self, top: tk.Toplevel, modal: bool = False) -> None:
+        """Show a dialog obtained from `_acquire_dialog`."""
+        top.deiconify()
+        top.lift()
+        if modal:
+            top.grab_set()
+
+    def _release_dialog(self, top: tk.Toplevel) -> None:
+        """Hide a cached dialog so it can be reused on the next open."""
+        top.grab_release()
+        top.withdraw()
+
     def _on_payment_methods_changed(self) -> None:
         try:
             vals = ["Any"] + get_payment_methods()
@@ -229,6 +282,7 @@ class OrderHistoryFrame(ttk.Frame):
             return  # UI not fully initialized yet
         
         currency = get_currency_code()
+        money = (currency + " {:.2f}").format
         
         # Clear table
         for item in self.tree.get_children():
@@ -239,7 +293,6 @@ class OrderHistoryFrame(ttk.Frame):
         
         # Validate date range
         if start and end:
-            from datetime import datetime
             try:
                 start_dt = datetime.strptime(start, "%Y-%m-%d")
                 end_dt = datetime.strptime(end, "%Y-%m-%d")
@@ -256,7 +309,8 @@ class OrderHistoryFrame(ttk.Frame):
         user_filter = self.user_var.get() if hasattr(self, 'user_var') else 'Any'
         customer_filter = self.customer_var.get() if hasattr(self, 'customer_var') else 'Any'
         
-        sales = receipts.list_sales_with_search(start, end, search, limit=500)
+        # Status is computed in SQL, avoiding two refund queries per listed sale
+        sales = receipts.list_sales_with_status(start, end, search, limit=500)
         
         total = 0.0
         displayed = 0
@@ -268,17 +322,7 @@ class OrderHistoryFrame(ttk.Frame):
         voids_total = 0.0
         
         for sale in sales:
-            sid = sale["sale_id"]
-            
-            # Determine status (refund + void)
-            if sale.get("voided"):
-                sale_status = "Voided"
-            elif refunds.is_sale_fully_refunded(sid):
-                sale_status = "Fully Refunded"
-            elif refunds.get_refunded_quantities_for_sale(sid):
-                sale_status = "Partially Refunded"
-            else:
-                sale_status = "Active"
+            sale_status = sale["status"]
             
             # Apply payment method filter
             if payment_filter and payment_filter != 'Any' and sale.get('payment_method') != payment_filter:
@@ -304,7 +348,7 @@ class OrderHistoryFrame(ttk.Frame):
                     sale["time"],
                     sale.get("customer_name", ""),
                     sale.get("username", ""),
-                    f"{currency} {sale['total']:.2f}",
+                    money(sale["total"]),
                     sale.get("payment_method", "Cash"),
                     sale_status
                 ),
@@ -484,14 +528,17 @@ class OrderHistoryFrame(ttk.Frame):
             # Get filtered sales
             sales = receipts.list_sales_with_search(start, end, search, limit=10000)  # Higher limit for export
             
+            # Resolve refund state for every sale up front instead of two queries per sale
+            fully_refunded, with_refunds = refunds.get_refund_status_sets(s["sale_id"] for s in sales)
+            
             # Apply additional filters
             filtered_sales = []
             for sale in sales:
                 sid = sale["sale_id"]
                 # Determine refund status
-                if refunds.is_sale_fully_refunded(sid):
+                if sid in fully_refunded:
                     refund_status = "Fully Refunded"
-                elif refunds.get_refunded_quantities_for_sale(sid):
+                elif sid in with_refunds:
                     refund_status = "Partially Refunded"
                 else:
                     refund_status = "Not Refunded"
@@ -528,7 +575,6 @@ class OrderHistoryFrame(ttk.Frame):
                 return
             
             # Generate CSV
-            import csv
             with open(filename, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 
@@ -572,8 +618,7 @@ class OrderHistoryFrame(ttk.Frame):
             messagebox.showinfo("Exported", f"Exported {len(filtered_sales)} orders to {filename}")
             
             # Log the bulk export action
-            current_user = getattr(self.master, 'current_user', {}).get('username', 'Unknown')
-            log_audit_action("EXPORT_BULK", 0, current_user, f"Orders: {len(filtered_sales)}, File: {filename}, Filters: payment={payment_filter}, refund={refund_filter}, user={user_filter}, customer={customer_filter}")
+            log_audit_action("EXPORT_BULK", 0, self._username, f"Orders: {len(filtered_sales)}, File: {filename}, Filters: payment={payment_filter}, refund={refund_filter}, user={user_filter}, customer={customer_filter}")
         
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export orders: {e}")
@@ -591,16 +636,13 @@ class OrderHistoryFrame(ttk.Frame):
                 messagebox.showerror("Error", "Order not found")
                 return
         
-            # Create popup window
-            popup = tk.Toplevel(self)
-            popup.withdraw()  # Hide until fully built
-            popup.title(f"Order Details - {sale_data.get('receipt_number', f'#{sale_id}')}")
-            set_window_icon(popup)
-            popup.transient(self.winfo_toplevel())
+            # Reuse the cached popup window (hidden until fully built)
+            popup = self._acquire_dialog("details", f"Order Details - {sale_data.get('receipt_number', f'#{sale_id}')}")
             popup.columnconfigure(0, weight=1)
             popup.rowconfigure(1, weight=1)
         
             currency = get_currency_code()
+            money = (currency + " {:.2f}").format
         
             # Header frame
             header_frame = ttk.Frame(popup, padding=10)
@@ -660,70 +702,75 @@ class OrderHistoryFrame(ttk.Frame):
                 items_tree.insert("", tk.END, values=(
                     item_name,
                     f"{qty:.2f}",
-                    f"{currency} {price:.2f}",
-                    f"{currency} {total:.2f}"
+                    money(price),
+                    money(total)
                 ))
         
             # Summary frame
             summary_frame = ttk.Frame(popup, padding=10)
             summary_frame.grid(row=2, column=0, sticky=tk.EW)
         
-            ttk.Label(summary_frame, text="Order Summary:", font=("Segoe UI", 11, "bold")).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
+            ttk.Label(summary_frame, text="Order Summary:", font=("Segoe UI", 11, "bold")).grid(row=0, column=0, sticky=tk.W, pady=(0, 10))
         
             # Summary details
-            subtotal = sale_data.get("subtotal", sum(item["price"] * item["quantity"] for item in sale_data["items"]))
+            # dict.get would evaluate the fallback sum eagerly; only compute it when needed
+            if "subtotal" in sale_data:
+                subtotal = sale_data["subtotal"]
+            else:
+                subtotal = sum(item["price"] * item["quantity"] for item in sale_data["items"])
             vat_amount = sale_data.get("vat_amount", 0)
             discount_amount = sale_data.get("discount_amount", 0)
             total = sale_data["total"]
         
-            ttk.Label(summary_frame, text="Subtotal:").grid(row=1, column=0, sticky=tk.W)
-            ttk.Label(summary_frame, text=f"{currency} {subtotal:.2f}").grid(row=1, column=1, sticky=tk.E, padx=(10, 0))
+            # Pre-render the summary rows into a few monospaced labels instead of a label pair per row
+            def _summary_text(rows):
+                return "\n".join(f"{label:<14}{value:>20}" for label, value in rows)
         
+            summary_font = ("Consolas", 10)
+            breakdown_rows = [("Subtotal:", money(subtotal))]
             if vat_amount > 0:
-                ttk.Label(summary_frame, text="VAT:").grid(row=2, column=0, sticky=tk.W)
-                ttk.Label(summary_frame, text=f"{currency} {vat_amount:.2f}").grid(row=2, column=1, sticky=tk.E, padx=(10, 0))
-            
+                breakdown_rows.append(("VAT:", money(vat_amount)))
             if discount_amount > 0:
-                ttk.Label(summary_frame, text="Discount:").grid(row=3, column=0, sticky=tk.W)
-                ttk.Label(summary_frame, text=f"{currency} {discount_amount:.2f}").grid(row=3, column=1, sticky=tk.E, padx=(10, 0))
+                breakdown_rows.append(("Discount:", money(discount_amount)))
+            ttk.Label(summary_frame, text=_summary_text(breakdown_rows), font=summary_font, justify=tk.LEFT).grid(row=1, column=0, sticky=tk.W)
         
-            ttk.Label(summary_frame, text="Total:", font=("Segoe UI", 10, "bold")).grid(row=4, column=0, sticky=tk.W, pady=(10, 0))
-            ttk.Label(summary_frame, text=f"{currency} {total:.2f}", font=("Segoe UI", 10, "bold")).grid(row=4, column=1, sticky=tk.E, padx=(10, 0), pady=(10, 0))
+            ttk.Label(summary_frame, text=_summary_text([("Total:", money(total))]),
+                      font=summary_font + ("bold",), justify=tk.LEFT).grid(row=2, column=0, sticky=tk.W, pady=(10, 0))
         
             # Payment info
-            ttk.Label(summary_frame, text="Amount Paid:").grid(row=5, column=0, sticky=tk.W)
-            ttk.Label(summary_frame, text=f"{currency} {sale_data.get('payment_received', total):.2f}").grid(row=5, column=1, sticky=tk.E, padx=(10, 0))
-        
+            payment_rows = [("Amount Paid:", money(sale_data.get('payment_received', total)))]
             change = sale_data.get("change", 0)
             if change > 0:
-                ttk.Label(summary_frame, text="Change:").grid(row=6, column=0, sticky=tk.W)
-                ttk.Label(summary_frame, text=f"{currency} {change:.2f}").grid(row=6, column=1, sticky=tk.E, padx=(10, 0))
+                payment_rows.append(("Change:", money(change)))
+            ttk.Label(summary_frame, text=_summary_text(payment_rows), font=summary_font, justify=tk.LEFT).grid(row=3, column=0, sticky=tk.W)
         
             # Status (Voided, Refunded, or Regular Sale)
             is_voided = sale_data.get("voided", 0) == 1
             sid = sale_data["sale_id"]
         
+            # One refunds lookup serves both the full and partial refund checks
+            refunded_map = {} if is_voided else refunds.get_refunded_quantities_for_sale(sid)
+        
             if is_voided:
                 order_status = "Voided"
                 status_color = "red"
-            elif refunds.is_sale_fully_refunded(sid):
+            elif refunds.is_fully_refunded_from_map(sale_data["items"], refunded_map):
                 order_status = "Fully Refunded"
                 status_color = "orange"
-            elif refunds.get_refunded_quantities_for_sale(sid):
+            elif refunded_map:
                 order_status = "Partially Refunded"
                 status_color = "orange"
             else:
                 order_status = "Regular Sale"
                 status_color = "green"
         
-            ttk.Label(summary_frame, text="Status:").grid(row=7, column=0, sticky=tk.W, pady=(10, 0))
-            status_label = ttk.Label(summary_frame, text=order_status, foreground=status_color)
-            status_label.grid(row=7, column=1, sticky=tk.E, padx=(10, 0), pady=(10, 0))
+            status_label = ttk.Label(summary_frame, text=_summary_text([("Status:", order_status)]),
+                                     font=summary_font, foreground=status_color, justify=tk.LEFT)
+            status_label.grid(row=4, column=0, sticky=tk.W, pady=(10, 0))
         
-            # Set geometry and show
-            popup.update_idletasks()
+            # Fixed size is known up front, so skip the extra layout pass before showing
             popup.geometry("700x600")
-            popup.deiconify()
+            self._show_dialog(popup)
         
         except Exception as e:
             messagebox.showerror("Error", f"Failed to view order details: {e}")
@@ -758,19 +805,13 @@ class OrderHistoryFrame(ttk.Frame):
             # Check permissions
             root = self.winfo_toplevel()
             current_user = getattr(root, 'current_user', {})
-            from modules import permissions
             if not permissions.has_permission(current_user, 'process_refunds'):
                 messagebox.showerror("Permission Denied", "You do not have permission to process refunds")
                 return
             
-            # Show refund confirmation dialog
-            dialog = tk.Toplevel(self)
-            dialog.withdraw()  # Hide until fully built
+            # Show refund confirmation dialog (hidden until fully built)
             receipt_num = sale_data.get("receipt_number", f"#{sale_id}")
-            dialog.title(f"Refund {receipt_num}")
-            set_window_icon(dialog)
-            dialog.transient(self.winfo_toplevel())
-            dialog.grab_set()
+            dialog = self._acquire_dialog("refund", f"Refund {receipt_num}")
             dialog.columnconfigure(0, weight=1)
             dialog.rowconfigure(2, weight=1)
             
@@ -806,26 +847,71 @@ class OrderHistoryFrame(ttk.Frame):
             item_vars = {}
             item_qty_vars = {}
             item_prices = {}
+            unit_prices = {}
+            available_qtys = {}
+            sid_by_key = {}
+            # Running total of checked lines, adjusted by deltas instead of re-summing every line
+            refund_total = [0.0]
+            pending_update = [None]
     
             # Get refunded quantities map to compute what's still refundable
             refunded_map = refunds.get_refunded_quantities_for_sale(sale_id)
     
+            def _schedule_amount_update():
+                # Coalesce bursts of keystrokes/toggles into a single label update
+                if pending_update[0] is None:
+                    pending_update[0] = dialog.after_idle(_apply_amount_update)
+    
+            def _apply_amount_update():
+                pending_update[0] = None
+                refund_amount_label.config(text=f"{currency} {refund_total[0]:.2f}")
+    
+            def _on_qty(proposed, key):
+                """Validate a quantity keystroke and update the running refund total."""
+                # Only plain non-negative decimals get through, so the parse below cannot fail.
+                # isdecimal() rather than isdigit(): superscripts like "²" are digits float() rejects
+                if proposed and not proposed.replace(".", "", 1).isdecimal():
+                    return False
+                q = float(proposed) if proposed else 0.0
+                sid = sid_by_key[key]
+                new_amount = unit_prices[sid] * q
+                if item_vars[sid].get():
+                    refund_total[0] += new_amount - item_prices[sid]
+                item_prices[sid] = new_amount
+                _schedule_amount_update()
+                return True
+    
+            def _on_toggle(sid):
+                if item_vars[sid].get():
+                    refund_total[0] += item_prices[sid]
+                else:
+                    refund_total[0] -= item_prices[sid]
+                _schedule_amount_update()
+    
+            qty_vcmd = self._register_dialog_command("refund", _on_qty)
+    
             for item in sale_data["items"]:
-                sale_item_id = item.get("sale_item_id") or f"si_{id(item)}"
-                already_refunded = refunded_map.get(item.get("sale_item_id"), 0.0)
+                raw_sid = item.get("sale_item_id")
+                sale_item_id = raw_sid if raw_sid is not None else f"si_{id(item)}"
+                already_refunded = refunded_map.get(raw_sid, 0.0) if raw_sid is not None else 0.0
                 available_qty = max(0.0, float(item["quantity"]) - float(already_refunded))
+                available_qtys[sale_item_id] = available_qty
     
                 # Boolean var: disabled if nothing to refund
                 var = tk.BooleanVar(value=(available_qty > 0))
                 item_vars[sale_item_id] = var
     
                 # Quantity to refund var (defaults to available_qty)
-                qty_var = tk.StringVar(value=f"{available_qty:.2f}" if available_qty % 1 else f"{int(available_qty)}")
+                qty_var = tk.DoubleVar(value=round(available_qty, 2))
                 item_qty_vars[sale_item_id] = qty_var
     
                 # Price per unit (sales_items.price is per unit / per-small-unit already)
                 price_per_unit = float(item.get("price") or 0)
+                unit_prices[sale_item_id] = price_per_unit
                 item_prices[sale_item_id] = price_per_unit * available_qty
+                sid_by_key[str(sale_item_id)] = sale_item_id
+                if available_qty > 0:
+                    refund_total[0] += item_prices[sale_item_id]
     
                 item_frame = ttk.Frame(scrollable_frame)
                 item_frame.pack(fill=tk.X, padx=8, pady=4)
@@ -841,25 +927,21 @@ class OrderHistoryFrame(ttk.Frame):
                     item_frame,
                     text=label_text,
                     variable=var,
-                    state=("!disabled" if available_qty > 0 else "disabled")
+                    state=("!disabled" if available_qty > 0 else "disabled"),
+                    command=lambda sid=sale_item_id: _on_toggle(sid)
                 )
                 cb.pack(side=tk.LEFT)
     
                 # If available_qty > 0, allow specifying partial refund quantity (Entry)
                 if available_qty > 0:
-                    qty_entry = ttk.Entry(item_frame, textvariable=qty_var, width=8)
+                    qty_entry = ttk.Entry(
+                        item_frame,
+                        textvariable=qty_var,
+                        width=8,
+                        validate="key",
+                        validatecommand=(qty_vcmd, "%P", str(sale_item_id))
+                    )
                     qty_entry.pack(side=tk.LEFT, padx=(8, 0))
-    
-                    def _qty_changed(sid=sale_item_id, pv=price_per_unit):
-                        try:
-                            q = float(item_qty_vars[sid].get() or 0)
-                        except Exception:
-                            q = 0
-                        item_prices[sid] = pv * q
-                        # Update amount display
-                        update_refund_amount()
-    
-                    qty_var.trace_add("write", lambda *_a, sid=sale_item_id: _qty_changed(sid))
                 
             canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -869,18 +951,9 @@ class OrderHistoryFrame(ttk.Frame):
             
             # Refund amount display
             ttk.Label(dialog, text="Refund Amount:", font=("Segoe UI", 10, "bold")).grid(row=4, column=0, sticky=tk.W, padx=12, pady=(8, 0))
-            refund_amount_label = ttk.Label(dialog, text=f"{currency} {sale_data['total']:.2f}", font=("Segoe UI", 11, "bold"), foreground="green")
+            refund_amount_label = ttk.Label(dialog, text=f"{currency} {refund_total[0]:.2f}", font=("Segoe UI", 11, "bold"), foreground="green")
             refund_amount_label.grid(row=4, column=1, sticky=tk.W, padx=12, pady=(8, 0))
             
-            def update_refund_amount(*args):
-                total = sum(item_prices[item_id] for item_id, var in item_vars.items() if var.get())
-                refund_amount_label.config(text=f"{currency} {total:.2f}")
-            
-            for var in item_vars.values():
-                var.trace("w", update_refund_amount)
-            # Initialize computed refund amount
-            update_refund_amount()
-            
             # Reason
             ttk.Label(dialog, text="Refund Reason:").grid(row=5, column=0, sticky=tk.W, padx=12, pady=(8, 0))
             reason_var = tk.StringVar()
@@ -900,19 +973,21 @@ class OrderHistoryFrame(ttk.Frame):
                     # Get selected items
                     selected_items = []
                     for item in sale_data["items"]:
-                        sid = item.get("sale_item_id") or f"si_{id(item)}"
+                        raw_sid = item.get("sale_item_id")
+                        sid = raw_sid if raw_sid is not None else f"si_{id(item)}"
                         if not item_vars.get(sid) or not item_vars[sid].get():
                             continue
+                        sold_qty = float(item["quantity"])
                         # Read requested quantity from qty var (default to remaining available)
                         qvar = item_qty_vars.get(sid)
                         try:
-                            q = float(qvar.get()) if qvar else float(item.get("quantity"))
-                        except Exception:
-                            q = float(item.get("quantity"))
+                            q = qvar.get() if qvar else sold_qty
+                        except tk.TclError:
+                            # Entry left empty
+                            q = sold_qty
                         
-                        # Validate quantity doesn't exceed available
-                        already_refunded = refunded_map.get(item.get("sale_item_id"), 0.0)
-                        available_qty = max(0.0, float(item["quantity"]) - float(already_refunded))
+                        # Validate quantity doesn't exceed available (computed when the dialog was built)
+                        available_qty = available_qtys[sid]
                         if q > available_qty:
                             messagebox.showerror("Invalid Quantity", f"Cannot refund {q} of item '{item['name']}'. Only {available_qty} available for refund.")
                             return
@@ -921,7 +996,7 @@ class OrderHistoryFrame(ttk.Frame):
                             continue
                             
                         selected_items.append({
-                            "sale_item_id": item.get("sale_item_id"),
+                            "sale_item_id": raw_sid,
                             "item_id": item["item_id"],
                             "quantity": q
                         })
@@ -938,10 +1013,9 @@ class OrderHistoryFrame(ttk.Frame):
                     messagebox.showinfo("Refund Processed", f"Refund of {currency} {refund_record['refund_amount']:.2f} processed successfully")
                     
                     # Log the refund action
-                    current_user = getattr(self.master, 'current_user', {}).get('username', 'Unknown')
-                    log_audit_action("REFUND", sale_id, current_user, f"Amount: {currency} {refund_record['refund_amount']:.2f}, Reason: {reason}")
+                    log_audit_action("REFUND", sale_id, self._username, f"Amount: {currency} {refund_record['refund_amount']:.2f}, Reason: {reason}")
                     
-                    dialog.destroy()
+                    self._release_dialog(dialog)
                     self._filter_orders()
                 except refunds.RefundError as e:
                     messagebox.showerror("Refund Error", str(e))
@@ -949,12 +1023,12 @@ class OrderHistoryFrame(ttk.Frame):
                     messagebox.showerror("Error", f"Refund failed: {e}")
             
             ttk.Button(button_frame, text="Process Refund", command=do_refund).pack(side=tk.LEFT, padx=4)
-            ttk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT, padx=4)
+            ttk.Button(button_frame, text="Cancel", command=lambda: self._release_dialog(dialog)).pack(side=tk.LEFT, padx=4)
             
             # Set geometry and show dialog after content is built
             dialog.update_idletasks()
             dialog.geometry("600x500")
-            dialog.deiconify()  # Show after fully built
+            self._show_dialog(dialog, modal=True)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to process refund: {e}")
 
@@ -979,13 +1053,12 @@ class OrderHistoryFrame(ttk.Frame):
             if not filename:
                 return
 
-            with open(filename, 'w') as f:
+            with open(filename, 'w', buffering=1 << 20, encoding='utf-8') as f:
                 f.write(receipt_text)
             messagebox.showinfo("Exported", f"Receipt saved to {filename}")
 
             # Log the export action
-            current_user = getattr(self.master, 'current_user', {}).get('username', 'Unknown')
-            log_audit_action("EXPORT_RECEIPT", sale_id, current_user, f"File: {filename}")
+            log_audit_action("EXPORT_RECEIPT", sale_id, self._username, f"File: {filename}")
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export: {e}")
@@ -1016,19 +1089,13 @@ class OrderHistoryFrame(ttk.Frame):
         # Check permissions
         root = self.winfo_toplevel()
         current_user = getattr(root, 'current_user', {})
-        from modules import permissions
         if not permissions.has_permission(current_user, 'void_sales'):
             messagebox.showerror("Permission Denied", "You do not have permission to void sales")
             return
         
         # Show void confirmation dialog
-        dialog = tk.Toplevel(self)
-        dialog.withdraw()
         receipt_num = sale_data.get("receipt_number", f"#{sale_id}")
-        dialog.title(f"Void Sale {receipt_num}")
-        set_window_icon(dialog)
-        dialog.transient(self.winfo_toplevel())
-        dialog.grab_set()
+        dialog = self._acquire_dialog("void", f"Void Sale {receipt_num}")
         
         currency = get_currency_code()
         
@@ -1076,7 +1143,7 @@ class OrderHistoryFrame(ttk.Frame):
                     # Log the void action
                     log_audit_action("VOID", sale_id, current_user.get('username', 'Unknown'), f"Reason: {reason}")
                     
-                    dialog.destroy()
+                    self._release_dialog(dialog)
                     self._filter_orders()
                 else:
                     messagebox.showerror("Void Failed", "Failed to void the sale")
@@ -1085,7 +1152,7 @@ class OrderHistoryFrame(ttk.Frame):
                 messagebox.showerror("Error", f"Void failed: {e}")
         
         ttk.Button(button_frame, text="Void Sale", command=do_void, style="danger.TButton").pack(side=tk.LEFT, padx=4)
-        ttk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT, padx=4)
+        ttk.Button(button_frame, text="Cancel", command=lambda: self._release_dialog(dialog)).pack(side=tk.LEFT, padx=4)
         
         # Center dialog
         dialog.update_idletasks()
@@ -1098,7 +1165,7 @@ class OrderHistoryFrame(ttk.Frame):
         x = max(0, (screen_width - dialog_width) // 2)
         y = max(0, (screen_height - dialog_height) // 2)
         dialog.geometry(f"+{x}+{y}")
-        dialog.deiconify()
+        self._show_dialog(dialog, modal=True)
         
     def _clear_search(self):
         """Clear the search field and refresh the order list."""
@@ -1112,16 +1179,10 @@ class OrderHistoryFrame(ttk.Frame):
         except ValueError:
             current = datetime.now()
         
-        # Create a proper parent window
-        root = self.winfo_toplevel()
-        top = tk.Toplevel(root)
-        top.title("Select Start Date")
-        set_window_icon(top)
+        # Both date pickers share one cached window
+        top = self._acquire_dialog("calendar", "Select Start Date")
         top.geometry("350x350")
         top.resizable(True, True)
-        # Make it modal
-        top.transient(root)
-        top.grab_set()
         
         cal = tkcalendar.Calendar(
             top, 
@@ -1135,13 +1196,15 @@ class OrderHistoryFrame(ttk.Frame):
         def on_select():
             selected = cal.get_date()
             self.start_date.set(selected)
-            top.destroy()
+            self._release_dialog(top)
             self.refresh()
         
         button_frame = ttk.Frame(top)
         button_frame.pack(pady=10)
         ttk.Button(button_frame, text="OK", command=on_select).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Cancel", command=top.destroy).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=lambda: self._release_dialog(top)).pack(side=tk.LEFT, padx=5)
+        # Make it modal
+        self._show_dialog(top, modal=True)
         
     def _pick_end_date(self) -> None:
         """Open calendar picker for end date."""
@@ -1150,16 +1213,10 @@ class OrderHistoryFrame(ttk.Frame):
         except ValueError:
             current = datetime.now()
         
-        # Create a proper parent window
-        root = self.winfo_toplevel()
-        top = tk.Toplevel(root)
-        top.title("Select End Date")
-        set_window_icon(top)
+        # Both date pickers share one cached window
+        top = self._acquire_dialog("calendar", "Select End Date")
         top.geometry("350x350")
         top.resizable(True, True)
-        # Make it modal
-        top.transient(root)
-        top.grab_set()
         
         cal = tkcalendar.Calendar(
             top, 
@@ -1173,13 +1230,15 @@ class OrderHistoryFrame(ttk.Frame):
         def on_select():
             selected = cal.get_date()
             self.end_date.set(selected)
-            top.destroy()
+            self._release_dialog(top)
             self.refresh()
         
         button_frame = ttk.Frame(top)
         button_frame.pack(pady=10)
         ttk.Button(button_frame, text="OK", command=on_select).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Cancel", command=top.destroy).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=lambda: self._release_dialog(top)).pack(side=tk.LEFT, padx=5)
+        # Make it modal
+        self._show_dialog(top, modal=True)
         
     def _generate_report(self) -> None:
         """Generate a report of the current filtered order history."""
@@ -1193,23 +1252,13 @@ class OrderHistoryFrame(ttk.Frame):
             user_filter = self.user_var.get() if hasattr(self, 'user_var') else 'Any'
             customer_filter = self.customer_var.get() if hasattr(self, 'customer_var') else 'Any'
             
-            # Get filtered sales (no limit for reports to ensure completeness)
-            sales = receipts.list_sales_with_search(start, end, search, limit=None)
+            # Get filtered sales with status computed in SQL (no limit for reports to ensure completeness)
+            sales = receipts.list_sales_with_status(start, end, search, limit=None)
             
             # Apply filters
             filtered_sales = []
             for sale in sales:
-                sid = sale["sale_id"]
-                
-                # Determine status
-                if sale.get("voided"):
-                    sale_status = "Voided"
-                elif refunds.is_sale_fully_refunded(sid):
-                    sale_status = "Fully Refunded"
-                elif refunds.get_refunded_quantities_for_sale(sid):
-                    sale_status = "Partially Refunded"
-                else:
-                    sale_status = "Active"
+                sale_status = sale["status"]
                 
                 # Apply filters
                 if payment_filter and payment_filter != 'Any' and sale.get('payment_method') != payment_filter:
@@ -1229,9 +1278,8 @@ class OrderHistoryFrame(ttk.Frame):
             
             # Generate CSV content
             currency = get_currency_code()
-            import io
+            money = (currency + " {:.2f}").format
             output = io.StringIO()
-            import csv
             
             writer = csv.writer(output)
             writer.writerow([
@@ -1239,26 +1287,28 @@ class OrderHistoryFrame(ttk.Frame):
                 "Total", "Payment Method", "Status"
             ])
             
-            total_amount = 0.0
-            for sale, status in filtered_sales:
-                receipt_num = sale.get("receipt_number", f"#{sale['sale_id']}")
-                writer.writerow([
-                    receipt_num,
+            writer.writerows(
+                (
+                    sale.get("receipt_number", f"#{sale['sale_id']}"),
                     sale["date"],
                     sale["time"],
                     sale.get("customer_name", ""),
                     sale.get("username", ""),
-                    f"{currency} {sale['total']:.2f}",
+                    money(sale["total"]),
                     sale.get("payment_method", "Cash"),
                     status
-                ])
-                total_amount += sale["total"]
+                )
+                for sale, status in filtered_sales
+            )
+            
+            # Total in one sum() pass instead of a running += per row
+            total_amount = sum(sale["total"] for sale, _status in filtered_sales)
             
             # Add summary
             writer.writerow([])
             writer.writerow(["Summary"])
             writer.writerow([f"Total Orders: {len(filtered_sales)}"])
-            writer.writerow([f"Total Amount: {currency} {total_amount:.2f}"])
+            writer.writerow([f"Total Amount: {money(total_amount)}"])
             
             csv_content = output.getvalue()
             
@@ -1270,7 +1320,7 @@ class OrderHistoryFrame(ttk.Frame):
             )
             
             if filename:
-                with open(filename, 'w', newline='', encoding='utf-8') as f:
+                with open(filename, 'w', newline='', buffering=1 << 20, encoding='utf-8') as f:
                     f.write(csv_content)
                 messagebox.showinfo("Report Generated", f"Report saved to {filename}")
             
@@ -3,13 +3,306 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, List, Optional
-import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
 
 from modules import users, permissions
 from utils.audit import audit_logger
 
 
+# Permission key prefix -> display group; unmatched keys go to "System"
+_PREFIX_TO_GROUP = {
+    "view_dashboard": "Dashboard",
+    "access_pos": "Point of Sale",
+    "process_sales": "Point of Sale",
+    "apply_discounts": "Point of Sale",
+    "void_sales": "Point of Sale",
+    "view_inventory": "Inventory",
+    "add_inventory": "Inventory",
+    "edit_inventory": "Inventory",
+    "delete_inventory": "Inventory",
+    "adjust_stock": "Inventory",
+    "view_low_stock": "Inventory",
+    "add_categories": "Inventory",
+    "delete_categories": "Inventory",
+    "view_reports": "Reports",
+    "export_reports": "Reports",
+    "view_profit_reports": "Reports",
+    "view_order_history": "Order History",
+    "refund_orders": "Order History",
+    "view_expenses": "Expenses",
+    "add_expenses": "Expenses",
+    "edit_expenses": "Expenses",
+    "delete_expenses": "Expenses",
+    "add_expense_categories": "Expenses",
+    "delete_expense_categories": "Expenses",
+    "view_users": "User Management",
+    "manage_users": "User Management",
+    "manage_roles": "User Management",
+    "view_settings": "Settings",
+    "manage_settings": "Settings",
+    "manage_permissions": "Settings",
+    "manage_upgrades": "Settings",
+}
+
+# Precomputed user list cell values
+_ROLE_TITLES = {role: role.title() for role in users.VALID_ROLES}
+_USER_STATUS = ("Inactive", "Active")
+
+# Row styling for the permission panel
+_GROUP_FONT = ("Segoe UI", 10, "bold")
+_BG_USER = "#e8f5e8"  # Light green - granted
+_BG_ROLE = "#fff3cd"  # Light yellow - suggested by role
+_BG_NONE = "#f8d7da"  # Light red - not granted / revoked
+
+# Display order of the permission groups
+_PERMISSION_GROUPS = (
+    "Dashboard", "Point of Sale", "Inventory", "Reports", "Order History",
+    "Expenses", "User Management", "Settings", "System",
+)
+
+
+# Longest prefixes first, so the most specific match wins
+_PREFIXES_BY_LENGTH = sorted(_PREFIX_TO_GROUP, key=len, reverse=True)
+
+
+@lru_cache(maxsize=None)
+def _permission_group(perm_key: str) -> str:
+    """Return the display group for a permission key (longest matching prefix)."""
+    for prefix in _PREFIXES_BY_LENGTH:
+        if perm_key.startswith(prefix):
+            return _PREFIX_TO_GROUP[prefix]
+    return "System"
+
+
+# Direct key -> group lookup for every known permission; the prefix scan above
+# is only the fallback for keys added to the catalogue later
+_KEY_TO_GROUP = {perm_key: _permission_group(perm_key) for perm_key in permissions.PERMISSIONS}
+
+
+@lru_cache(maxsize=4)
+def _group_permissions(perm_items: tuple) -> tuple:
+    """Bucket (key, description) pairs into non-empty (group, pairs) tuples in display order."""
+    groups: Dict[str, list] = {name: [] for name in _PERMISSION_GROUPS}
+    for perm_key, description in perm_items:
+        group = _KEY_TO_GROUP.get(perm_key) or _permission_group(perm_key)
+        groups[group].append((perm_key, description))
+    return tuple((name, tuple(pairs)) for name, pairs in groups.items() if pairs)
+
+
+# The catalogue is fixed at import, so group it once here; every render then
+# hits the cache instead of running the classification loop
+_group_permissions(tuple(permissions.get_all_permissions().items()))
+
+
+# Single worker: permission writes and the reload that follows run in order, and
+# the worker's thread-local DB connection is reused instead of reopened per call
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="permission-db")
+
+
+def _fetch_permission_state(user: dict) -> dict:
+    """Collect everything the permission panel needs for a user (runs off the Tk thread)."""
+    return permissions.get_user_permission_bundle(user['user_id'], user['role'])
+
+
+def _user_row_values(user: dict) -> tuple:
+    """Treeview cell values for a user row."""
+    role = user['role']
+    return (
+        user['username'],
+        _ROLE_TITLES.get(role) or role.title(),
+        _USER_STATUS[bool(user.get('active', 1))]
+    )
+
+
+def _reset_permission_state(role: str) -> dict:
+    """Permission state of a user whose explicit grants and revocations were all removed."""
+    return {
+        'user': set(),
+        'revoked': set(),
+        'role': permissions.get_role_permissions(role),
+        'effective': set(permissions.get_all_permission_keys()) if role == 'admin' else set(),
+    }
+
+
+class _VirtualPermissionList(ttk.Frame):
+    """Scrollable permission list that only creates widgets for the visible rows.
+
+    Rows are ("group", name) headers or ("perm", key, description, status, bg)
+    entries. A small pool of widget slots is re-pointed at whichever rows are
+    in view, so the widget count tracks the panel height, not the row count.
+    Checkbox state lives in a shared bytearray indexed through perm_index; each
+    slot owns one BooleanVar that mirrors the row it currently shows.
+    """
+
+    ROW_HEIGHT = 26
+
+    def __init__(self, parent, height: int = 300):
+        super().__init__(parent)
+        self._rows: List[tuple] = []
+        self._perm_index: Dict[str, int] = {}
+        self._perm_state = bytearray()
+        self._slot_keys: List[Optional[str]] = []
+        self._slot_rows: List[Optional[tuple]] = []
+        self._slot_values: List[bool] = []
+        self._render_after_id = None
+        self._row_index: Dict[str, int] = {}
+        self._first = 0
+        self._visible = max(1, height // self.ROW_HEIGHT)
+        self._slots: List[tuple] = []
+
+        self._body = ttk.Frame(self, height=height)
+        self._body.grid_propagate(False)
+        self._body.grid_columnconfigure(1, weight=1)
+        self._scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+
+        self._body.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self._body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self._body)
+
+    def set_rows(self, rows: List[tuple], perm_index: Dict[str, int], perm_state: bytearray) -> None:
+        """Replace the displayed rows; perm_state[perm_index[key]] is each checkbox's state."""
+        self._rows = rows
+        self._perm_index = perm_index
+        self._perm_state = perm_state
+        self._row_index = {row[1]: i for i, row in enumerate(rows) if row[0] == "perm"}
+        self._first = 0
+        self._render()
+
+    def update_status(self, changes: Dict[str, tuple]) -> None:
+        """Patch the (status, bg) of individual permission rows and redraw the visible slots."""
+        for perm_key, (status, bg_color) in changes.items():
+            index = self._row_index.get(perm_key)
+            if index is not None:
+                _, key, description, _, _ = self._rows[index]
+                self._rows[index] = ("perm", key, description, status, bg_color)
+        self._render()
+
+    def refresh(self) -> None:
+        """Redraw the visible slots after the shared checkbox state changed."""
+        self._render()
+
+    def _on_toggle(self, offset: int) -> None:
+        perm_key = self._slot_keys[offset]
+        if perm_key is not None:
+            checked = bool(self._slots[offset][3].get())
+            self._perm_state[self._perm_index[perm_key]] = checked
+            self._slot_values[offset] = checked
+
+    def _bind_wheel(self, widget) -> None:
+        widget.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self._scroll(-1))
+        widget.bind("<Button-5>", lambda e: self._scroll(1))
+
+    def _ensure_slots(self) -> None:
+        """Grow the widget pool to the number of visible rows."""
+        while len(self._slots) < self._visible:
+            row = len(self._slots)
+            self._body.grid_rowconfigure(row, minsize=self.ROW_HEIGHT)
+            header = ttk.Label(self._body, style="PermissionGroup.TLabel")
+            var = tk.BooleanVar(value=False)
+            cb = ttk.Checkbutton(self._body, variable=var,
+                                 command=lambda offset=row: self._on_toggle(offset))
+            status_label = ttk.Label(self._body)
+            header.grid(row=row, column=0, columnspan=2, sticky="w")
+            cb.grid(row=row, column=0, sticky="w", padx=(20, 5))
+            status_label.grid(row=row, column=1, sticky="w", padx=(0, 5))
+            for widget in (header, cb, status_label):
+                widget.grid_remove()
+                self._bind_wheel(widget)
+            self._slots.append((header, cb, status_label, var))
+            self._slot_keys.append(None)
+            self._slot_rows.append(None)
+            self._slot_values.append(False)
+
+    def _render(self) -> None:
+        """Point the widget pool at the rows currently in view.
+
+        Each slot remembers the row it last showed, so grid/configure calls are
+        only made for slots whose row actually changed.
+        """
+        self._ensure_slots()
+        for offset, (header, cb, status_label, var) in enumerate(self._slots):
+            index = self._first + offset
+            if offset < self._visible and index < len(self._rows):
+                row = self._rows[index]
+            else:
+                row = None
+            shown = self._slot_rows[offset]
+
+            if row is not None and row[0] == "perm":
+                self._slot_keys[offset] = row[1]
+                checked = bool(self._perm_state[self._perm_index[row[1]]])
+                if checked != self._slot_values[offset]:
+                    var.set(checked)
+                    self._slot_values[offset] = checked
+            else:
+                self._slot_keys[offset] = None
+            if row == shown:
+                continue
+            self._slot_rows[offset] = row
+
+            if row is None:
+                header.grid_remove()
+                cb.grid_remove()
+                status_label.grid_remove()
+            elif row[0] == "group":
+                header.configure(text=f"{row[1]}:")
+                if shown is None or shown[0] != "group":
+                    header.grid()
+                    cb.grid_remove()
+                    status_label.grid_remove()
+            else:
+                _, perm_key, description, status, bg_color = row
+                cb.configure(text=perm_key)
+                status_label.configure(text=f"{description} [{status}]", background=bg_color)
+                if shown is None or shown[0] != "perm":
+                    header.grid_remove()
+                    cb.grid()
+                    status_label.grid()
+
+        total = len(self._rows)
+        if total:
+            self._scrollbar.set(self._first / total, min(1.0, (self._first + self._visible) / total))
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+    def _schedule_render(self) -> None:
+        """Coalesce bursts of scroll/resize events into one render at idle time."""
+        if self._render_after_id is None:
+            self._render_after_id = self.after_idle(self._flush_render)
+
+    def _flush_render(self) -> None:
+        self._render_after_id = None
+        self._render()
+
+    def _scroll_to(self, first: int) -> None:
+        first = max(0, min(first, len(self._rows) - self._visible))
+        if first != self._first:
+            self._first = first
+            self._schedule_render()
+
+    def _scroll(self, units: int) -> None:
+        self._scroll_to(self._first + units)
+
+    def _on_scrollbar(self, action, amount, unit=None) -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self._rows)))
+        elif action == "scroll":
+            step = int(amount)
+            self._scroll(step * self._visible if unit == "pages" else step)
+
+    def _on_resize(self, event) -> None:
+        visible = max(1, event.height // self.ROW_HEIGHT)
+        if visible != self._visible:
+            self._visible = visible
+            self._first = max(0, min(self._first, len(self._rows) - self._visible))
+            self._schedule_render()
+
+
 class PermissionManagementFrame(ttk.Frame):
     """UI for managing user permissions."""
 
@@ -17,10 +310,21 @@ class PermissionManagementFrame(ttk.Frame):
         super().__init__(parent)
         self.parent = parent
         self.current_user = getattr(parent.winfo_toplevel(), "current_user", {})
-        self.permission_vars: Dict[str, tk.BooleanVar] = {}
+        # Checkbox state per permission, indexed through _perm_index
+        self._perm_index: Dict[str, int] = {}
+        self._perm_state = bytearray()
+        # Effective permissions of the selected user, as shown in the panel
+        self._current_perms: Set[str] = set()
         self.user_tree = None
-        self.permission_frame = None
+        self.permission_list = None
         self.selected_user = None
+        self._users_by_id: Dict[int, dict] = {}
+        self._perm_request = 0
+        self._all_perms_items: Optional[tuple] = None
+        self._page = 0
+        self._page_size = 100
+        self._search_after_id = None
+        self._select_after_id = None
 
         self._build_ui()
         self._load_users()
@@ -50,6 +354,14 @@ class PermissionManagementFrame(ttk.Frame):
         left_frame = ttk.LabelFrame(paned, text="Users", padding=10)
         paned.add(left_frame, weight=1)
 
+        # Username search
+        search_frame = ttk.Frame(left_frame)
+        search_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT, padx=(0, 5))
+        self._search_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self._search_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self._search_var.trace_add("write", self._on_search_changed)
+
         # User list
         user_frame = ttk.Frame(left_frame)
         user_frame.pack(fill=tk.BOTH, expand=True)
@@ -70,13 +382,23 @@ class PermissionManagementFrame(ttk.Frame):
 
         self.user_tree.bind("<<TreeviewSelect>>", self._on_user_select)
 
+        # Paging controls - only one page of users is loaded at a time
+        pager = ttk.Frame(left_frame)
+        pager.pack(fill=tk.X, pady=(5, 0))
+        self._prev_btn = ttk.Button(pager, text="◀ Prev", command=lambda: self._change_page(-1))
+        self._prev_btn.pack(side=tk.LEFT)
+        self._next_btn = ttk.Button(pager, text="Next ▶", command=lambda: self._change_page(1))
+        self._next_btn.pack(side=tk.RIGHT)
+        self._page_label = ttk.Label(pager, text="Page 1")
+        self._page_label.pack(side=tk.LEFT, expand=True)
+
         # User action buttons
         user_btn_frame = ttk.Frame(left_frame)
         user_btn_frame.pack(fill=tk.X, pady=(10, 0))
 
         ttk.Button(user_btn_frame, text="Revoke All Permissions",
                   command=self._reset_user_permissions).pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Button(user_btn_frame, text="Refresh", command=self._load_users).pack(side=tk.RIGHT)
+        ttk.Button(user_btn_frame, text="Refresh", command=self.refresh).pack(side=tk.RIGHT)
 
         # Right panel - Permissions
         right_frame = ttk.LabelFrame(paned, text="Permissions", padding=10)
@@ -86,32 +408,10 @@ class PermissionManagementFrame(ttk.Frame):
         perm_frame = ttk.Frame(right_frame)
         perm_frame.pack(fill=tk.BOTH, expand=True)
 
-        # Permission list in scrollable frame - don't let it expand fully
-        list_frame = ttk.Frame(perm_frame)
-        list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-
-        # Scrollable frame for permissions
-        self.permission_frame = ttk.Frame(list_frame)
-        self.permission_frame.pack(fill=tk.BOTH, expand=True)
-
-        # Canvas and scrollbar for permissions
-        canvas = tk.Canvas(self.permission_frame, height=300)  # Fixed height to leave room for buttons
-        scrollbar = ttk.Scrollbar(self.permission_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Permission checkboxes will be added here
-        self.permission_container = scrollable_frame
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # Placeholder for the permission list, built on first user selection;
+        # fixed height to leave room for buttons
+        self._perm_placeholder = ttk.Frame(perm_frame, height=300)
+        self._perm_placeholder.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
 
         # Permission action buttons - arrange in a grid for better visibility
         perm_btn_frame = ttk.Frame(perm_frame)
@@ -148,159 +448,258 @@ class PermissionManagementFrame(ttk.Frame):
         status_bar = ttk.Label(self, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
         status_bar.pack(fill=tk.X, side=tk.BOTTOM)
 
-    def _load_users(self) -> None:
-        """Load and display all users."""
-        # Clear existing items
-        for item in self.user_tree.get_children():
-            self.user_tree.delete(item)
-
-        try:
-            all_users = users.list_users()
-            for user in all_users:
-                status = "Active" if user.get('active', 1) else "Inactive"
-                self.user_tree.insert("", tk.END, values=(
-                    user['username'],
-                    user['role'].title(),
-                    status
-                ), tags=(user['user_id'],))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load users: {e}")
+    def _run_in_background(self, work, on_done, error_message: str) -> None:
+        """Run work() on the DB worker and pass its result to on_done on the Tk thread.
+
+        The future is polled with after() so Tk is only ever touched from the
+        mainloop. Polling starts at a few milliseconds, since cached lookups
+        finish almost immediately, and backs off to 50 ms for slow DB work.
+        """
+        future = _db_executor.submit(work)
+
+        def check_result(delay):
+            if not future.done():
+                self.after(delay, check_result, min(delay * 2, 50))
+                return
+            if not self.winfo_exists():
+                return
+            error = future.exception()
+            if error is None:
+                on_done(future.result())
+            else:
+                self.status_var.set("Ready")
+                messagebox.showerror("Error", f"{error_message}: {error}")
+
+        self.after(5, check_result, 10)
+
+    def _run_permission_change(self, work, success_message: str, error_message: str,
+                               granted=(), revoked=(), reset: bool = False) -> None:
+        """Apply a permission change in the background, then update the panel in memory.
+
+        granted/revoked name the keys whose rows are patched; reset means every
+        explicit grant and revocation was removed. With neither, the selected
+        user's permissions are reloaded.
+        """
+        self.status_var.set("Working...")
+        user = self.selected_user
+
+        def done(_result):
+            messagebox.showinfo("Success", success_message)
+            if not self.selected_user or self.selected_user['user_id'] != user['user_id']:
+                return
+            if reset:
+                self._render_permissions(user, _reset_permission_state(user['role']))
+            elif granted or revoked:
+                self._patch_permission_rows(granted, True)
+                self._patch_permission_rows(revoked, False)
+                self.status_var.set(f"Managing permissions for: {user['username']}")
+            else:
+                self._load_user_permissions()
+
+        self._run_in_background(work, done, error_message)
+
+    def _patch_permission_rows(self, perm_keys, granted: bool) -> None:
+        """Show perm_keys as explicitly granted or revoked without rebuilding the panel."""
+        if not perm_keys:
+            return
+        if granted:
+            change = ("Granted (User)", _BG_USER)
+        else:
+            change = ("Revoked (User)", _BG_NONE)
+        if granted:
+            self._current_perms.update(perm_keys)
+        else:
+            self._current_perms.difference_update(perm_keys)
+        for perm_key in perm_keys:
+            index = self._perm_index.get(perm_key)
+            if index is not None:
+                self._perm_state[index] = granted
+        self.permission_list.update_status(dict.fromkeys(perm_keys, change))
+
+    def _load_users(self, on_loaded=None) -> None:
+        """Load and display the current page of users, then call on_loaded if given."""
+        search = self._search_var.get().strip()
+        offset = self._page * self._page_size
+        # Fetch one extra row to know whether a next page exists
+        limit = self._page_size + 1
+
+        def done(page_users):
+            self._show_users(page_users)
+            if on_loaded:
+                on_loaded()
+
+        self._run_in_background(
+            lambda: users.list_users(search=search, limit=limit, offset=offset),
+            done,
+            "Failed to load users"
+        )
+
+    def _show_users(self, page_users: List[dict]) -> None:
+        """Populate the user list with the fetched page of users."""
+        has_next = len(page_users) > self._page_size
+        page_users = page_users[:self._page_size]
+
+        self._page_label.configure(text=f"Page {self._page + 1}")
+        self._prev_btn.state(["!disabled"] if self._page > 0 else ["disabled"])
+        self._next_btn.state(["!disabled"] if has_next else ["disabled"])
+
+        # Diff against the rows already shown so only changed users touch the tree
+        tree = self.user_tree
+        old_users = self._users_by_id
+        shown = set(tree.get_children())
+        order = [str(u['user_id']) for u in page_users]
+        stale = shown.difference(order)
+        if stale:
+            tree.delete(*stale)
+
+        for user in page_users:
+            iid = str(user['user_id'])
+            if iid not in shown:
+                tree.insert("", tk.END, iid=iid, values=_user_row_values(user))
+            elif old_users.get(user['user_id']) != user:
+                tree.item(iid, values=_user_row_values(user))
+
+        # Restore the query order if renames or inserts disturbed it
+        if list(tree.get_children()) != order:
+            for position, iid in enumerate(order):
+                tree.move(iid, "", position)
+
+        # Keep the rows keyed by id so selection does not re-query the DB
+        self._users_by_id = {u['user_id']: u for u in page_users}
+        # Point the selection at the freshly loaded row so role/status edits are picked up
+        if self.selected_user:
+            self.selected_user = self._users_by_id.get(self.selected_user['user_id'], self.selected_user)
+
+    def _change_page(self, step: int) -> None:
+        """Move to the previous or next page of users."""
+        self._page = max(0, self._page + step)
+        self._load_users()
+
+    def _on_search_changed(self, *_args) -> None:
+        """Reload from the first page once typing pauses."""
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(300, self._apply_search)
+
+    def _apply_search(self) -> None:
+        self._search_after_id = None
+        self._page = 0
+        self._load_users()
 
     def _on_user_select(self, event) -> None:
-        """Handle user selection."""
+        """Handle user selection, coalescing bursts (e.g. arrow-key navigation) into one load."""
+        if self._select_after_id:
+            self.after_cancel(self._select_after_id)
+        self._select_after_id = self.after(120, self._do_user_select)
+
+    def _do_user_select(self) -> None:
+        """Show permissions for the user selected once the selection has settled."""
+        self._select_after_id = None
         selection = self.user_tree.selection()
         if not selection:
             return
 
-        item = selection[0]
-        user_id = int(self.user_tree.item(item, "tags")[0])
+        # Rows are inserted with the user_id as their iid
+        user = self._users_by_id.get(int(selection[0]))
+        if not user:
+            return
+        if self.selected_user and self.selected_user['user_id'] == user['user_id'] and self.permission_list:
+            # Same user reselected (e.g. after the list was re-diffed); keep the panel
+            self.selected_user = user
+            return
 
-        # Find user details
-        all_users = users.list_users()
-        self.selected_user = next((u for u in all_users if u['user_id'] == user_id), None)
+        self.selected_user = user
+        self._ensure_permission_list()
+        self._load_user_permissions()
 
-        if self.selected_user:
-            self._load_user_permissions()
-            self.status_var.set(f"Managing permissions for: {self.selected_user['username']}")
+    def _ensure_permission_list(self) -> None:
+        """Create the virtualized permission list the first time it is needed."""
+        if self.permission_list is None:
+            # Shared style for the permission group headers
+            ttk.Style().configure("PermissionGroup.TLabel", font=_GROUP_FONT)
+            self.permission_list = _VirtualPermissionList(self._perm_placeholder, height=300)
+            self.permission_list.pack(fill=tk.BOTH, expand=True)
 
     def _load_user_permissions(self) -> None:
         """Load and display permissions for selected user."""
         if not self.selected_user:
             return
 
-        # Clear existing permission checkboxes
-        for widget in self.permission_container.winfo_children():
-            widget.destroy()
-
-        self.permission_vars.clear()
-
-        try:
-            # Get all available permissions
-            all_perms = permissions.get_all_permissions()
-
-            # Get user's effective permissions
-            effective_perms = permissions.get_effective_permissions(self.selected_user)
-            user_specific_perms = permissions.get_user_permissions(self.selected_user['user_id'])
-            revoked_perms = permissions.get_revoked_permissions(self.selected_user['user_id'])
-            role_perms = permissions.get_role_permissions(self.selected_user['role'])
-
-            # Group permissions by category for better organization
-            perm_groups = {
-                "Dashboard": [],
-                "Point of Sale": [],
-                "Inventory": [],
-                "Reports": [],
-                "Order History": [],
-                "Expenses": [],
-                "User Management": [],
-                "Settings": [],
-                "System": []
-            }
-
-            for perm_key, description in all_perms.items():
-                if perm_key.startswith("view_dashboard"):
-                    perm_groups["Dashboard"].append((perm_key, description))
-                elif perm_key.startswith(("access_pos", "process_sales", "apply_discounts", "void_sales")):
-                    perm_groups["Point of Sale"].append((perm_key, description))
-                elif perm_key.startswith(("view_inventory", "add_inventory", "edit_inventory", "delete_inventory", "adjust_stock", "view_low_stock", "add_categories", "delete_categories")):
-                    perm_groups["Inventory"].append((perm_key, description))
-                elif perm_key.startswith(("view_reports", "export_reports", "view_profit_reports")):
-                    perm_groups["Reports"].append((perm_key, description))
-                elif perm_key.startswith(("view_order_history", "refund_orders")):
-                    perm_groups["Order History"].append((perm_key, description))
-                elif perm_key.startswith(("view_expenses", "add_expenses", "edit_expenses", "delete_expenses", "add_expense_categories", "delete_expense_categories")):
-                    perm_groups["Expenses"].append((perm_key, description))
-                elif perm_key.startswith(("view_users", "manage_users", "manage_roles")):
-                    perm_groups["User Management"].append((perm_key, description))
-                elif perm_key.startswith(("view_settings", "manage_settings", "manage_permissions", "manage_upgrades")):
-                    perm_groups["Settings"].append((perm_key, description))
-                else:
-                    perm_groups["System"].append((perm_key, description))
-
-            # Create permission checkboxes by group
-            row = 0
-            for group_name, group_perms in perm_groups.items():
-                if not group_perms:
-                    continue
-
-                # Group label
-                group_label = ttk.Label(self.permission_container, text=f"{group_name}:",
-                                       font=("Segoe UI", 10, "bold"))
-                group_label.grid(row=row, column=0, columnspan=2, sticky="w", pady=(10, 5) if row > 0 else (0, 5))
-                row += 1
-
-                # Permission checkboxes
-                for perm_key, description in group_perms:
-                    # Determine permission status based on effective permissions and revocations
-                    if perm_key in revoked_perms:
-                        status = "Revoked (User)"
-                        bg_color = "#f8d7da"  # Light red
-                        checkbox_state = False
-                    elif perm_key in effective_perms:
-                        if perm_key in user_specific_perms:
-                            status = "Granted (User)"
-                            bg_color = "#e8f5e8"  # Light green
-                        elif self.selected_user.get('role') == 'admin':
-                            status = "Granted (Admin)"
-                            bg_color = "#e8f5e8"  # Light green
-                        else:
-                            status = "Granted (Role)"
-                            bg_color = "#e8f5e8"  # Light green
-                        checkbox_state = True
-                    elif perm_key in role_perms:
-                        status = "Suggested (Role)"
-                        bg_color = "#fff3cd"  # Light yellow
-                        checkbox_state = False  # Don't auto-check role suggestions
+        user = self.selected_user
+        self._perm_request += 1
+        request = self._perm_request
+        self.status_var.set(f"Loading permissions for: {user['username']}...")
+
+        def done(state):
+            # Drop results for a user that is no longer selected
+            if request == self._perm_request:
+                self._render_permissions(user, state)
+
+        self._run_in_background(lambda: _fetch_permission_state(user), done,
+                                "Failed to load permissions")
+
+    def _render_permissions(self, user: dict, state: dict) -> None:
+        """Display the permission rows for a user from prefetched state."""
+        perm_index: Dict[str, int] = {}
+        perm_state = bytearray()
+
+        # All helpers return sets, so the per-row membership tests below are hash lookups
+        effective_perms = state['effective']
+        user_specific_perms = state['user']
+        revoked_perms = state['revoked']
+        role_perms = state['role']
+
+        # The permission catalogue is fixed for the session; materialize its pairs once
+        if self._all_perms_items is None:
+            self._all_perms_items = tuple(permissions.get_all_permissions().items())
+        perm_groups = _group_permissions(self._all_perms_items)
+
+        # Build the flat row list by group; widgets are only created for visible rows
+        rows: List[tuple] = []
+        for group_name, group_perms in perm_groups:
+            rows.append(("group", group_name))
+
+            # Permission checkboxes
+            for perm_key, description in group_perms:
+                # Determine permission status based on effective permissions and revocations
+                if perm_key in revoked_perms:
+                    status = "Revoked (User)"
+                    bg_color = _BG_NONE
+                    checkbox_state = False
+                elif perm_key in effective_perms:
+                    if perm_key in user_specific_perms:
+                        status = "Granted (User)"
+                        bg_color = _BG_USER
+                    elif user.get('role') == 'admin':
+                        status = "Granted (Admin)"
+                        bg_color = _BG_USER
                     else:
-                        status = "Not Granted"
-                        bg_color = "#f8d7da"  # Light red
-                        checkbox_state = False
-
-                    # Create checkbox variable
-                    var = tk.BooleanVar(value=checkbox_state)
-                    self.permission_vars[perm_key] = var
-
-                    # Create checkbox with description
-                    cb = ttk.Checkbutton(self.permission_container, text=f"{perm_key}", variable=var)
-                    cb.grid(row=row, column=0, sticky="w", padx=(20, 5))
-
-                    # Status label
-                    status_label = ttk.Label(self.permission_container, text=f"{description} [{status}]",
-                                           background=bg_color)
-                    status_label.grid(row=row, column=1, sticky="w", padx=(0, 5))
+                        status = "Granted (Role)"
+                        bg_color = _BG_USER
+                    checkbox_state = True
+                elif perm_key in role_perms:
+                    status = "Suggested (Role)"
+                    bg_color = _BG_ROLE
+                    checkbox_state = False  # Don't auto-check role suggestions
+                else:
+                    status = "Not Granted"
+                    bg_color = _BG_NONE
+                    checkbox_state = False
 
-                    row += 1
+                perm_index[perm_key] = len(perm_state)
+                perm_state.append(checkbox_state)
+                rows.append(("perm", perm_key, description, status, bg_color))
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load permissions: {e}")
+        self._perm_index = perm_index
+        self._perm_state = perm_state
+        self._current_perms = set(effective_perms)
+        self.permission_list.set_rows(rows, perm_index, perm_state)
+        self.status_var.set(f"Managing permissions for: {user['username']}")
 
-    def _get_selected_permissions(self) -> List[str]:
-        """Get list of selected permission keys from checkboxes."""
-        selected_perms = []
-        for perm_key, var in self.permission_vars.items():
-            if var.get():
-                selected_perms.append(perm_key)
-        return selected_perms
+    def _get_selected_permissions(self) -> Set[str]:
+        """Get the set of selected permission keys from checkboxes."""
+        state = self._perm_state
+        return {perm_key for perm_key, index in self._perm_index.items() if state[index]}
 
     def _save_permission_changes(self) -> None:
         """Save all permission changes based on current checkbox states."""
@@ -309,10 +708,11 @@ class PermissionManagementFrame(ttk.Frame):
             return
 
         # Get current checkbox states
-        checked_permissions = set(self._get_selected_permissions())
+        checked_permissions = self._get_selected_permissions()
 
-        # Get currently effective permissions (what the user actually has access to)
-        current_effective_permissions = set(permissions.get_effective_permissions(self.selected_user))
+        # Currently effective permissions (what the user actually has access to),
+        # as loaded for the panel and kept up to date by _patch_permission_rows
+        current_effective_permissions = self._current_perms
 
         # Determine what needs to be granted and revoked
         to_grant = checked_permissions - current_effective_permissions
@@ -339,25 +739,21 @@ class PermissionManagementFrame(ttk.Frame):
         if not confirm:
             return
 
-        try:
-            current_user_id = self.current_user.get('user_id')
-            changes_made = 0
-
-            # Grant new permissions
-            for perm in to_grant:
-                permissions.grant_permission(self.selected_user['user_id'], perm, current_user_id)
-                changes_made += 1
+        current_user_id = self.current_user.get('user_id')
+        user_id = self.selected_user['user_id']
 
-            # Revoke removed permissions
-            for perm in to_revoke:
-                permissions.revoke_permission(self.selected_user['user_id'], perm, current_user_id)
-                changes_made += 1
+        def save():
+            # Both audit entries are written with one commit
+            with audit_logger.batch():
+                permissions.grant_permissions_bulk(user_id, to_grant, current_user_id)
+                permissions.revoke_permissions_bulk(user_id, to_revoke, current_user_id)
 
-            messagebox.showinfo("Success", f"Saved {changes_made} permission change(s)")
-            self._load_user_permissions()
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save permission changes: {e}")
+        self._run_permission_change(
+            save,
+            f"Saved {len(to_grant) + len(to_revoke)} permission change(s)",
+            "Failed to save permission changes",
+            granted=to_grant, revoked=to_revoke
+        )
 
     def _grant_all_permissions(self) -> None:
         """Grant all permissions to the selected user."""
@@ -365,7 +761,7 @@ class PermissionManagementFrame(ttk.Frame):
             messagebox.showerror("Error", "No user selected")
             return
 
-        all_perms = list(permissions.get_all_permissions().keys())
+        all_perms = permissions.get_all_permission_keys()
         confirm = messagebox.askyesno(
             "Grant All Permissions",
             f"Grant ALL {len(all_perms)} permissions to {self.selected_user['username']}?\n\n"
@@ -373,16 +769,14 @@ class PermissionManagementFrame(ttk.Frame):
         )
 
         if confirm:
-            try:
-                current_user_id = self.current_user.get('user_id')
-                for perm in all_perms:
-                    permissions.grant_permission(self.selected_user['user_id'], perm, current_user_id)
-
-                messagebox.showinfo("Success", f"Granted all {len(all_perms)} permissions")
-                self._load_user_permissions()
-
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to grant all permissions: {e}")
+            current_user_id = self.current_user.get('user_id')
+            user_id = self.selected_user['user_id']
+            self._run_permission_change(
+                lambda: permissions.grant_permissions_bulk(user_id, all_perms, current_user_id),
+                f"Granted all {len(all_perms)} permissions",
+                "Failed to grant all permissions",
+                granted=all_perms
+            )
 
     def _grant_selected_permissions(self) -> None:
         if not self.selected_user:
@@ -394,16 +788,20 @@ class PermissionManagementFrame(ttk.Frame):
             messagebox.showerror("Error", "No permissions selected")
             return
 
-        try:
-            current_user_id = self.current_user.get('user_id')
-            for perm in selected_perms:
-                permissions.grant_permission(self.selected_user['user_id'], perm, current_user_id)
-
-            messagebox.showinfo("Success", f"Granted {len(selected_perms)} permission(s)")
-            self._load_user_permissions()
+        # Skip permissions the user already has
+        to_grant = selected_perms - self._current_perms
+        if not to_grant:
+            messagebox.showinfo("No Changes", "The selected permissions are already granted")
+            return
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to grant permissions: {e}")
+        current_user_id = self.current_user.get('user_id')
+        user_id = self.selected_user['user_id']
+        self._run_permission_change(
+            lambda: permissions.grant_permissions_bulk(user_id, to_grant, current_user_id),
+            f"Granted {len(to_grant)} permission(s)",
+            "Failed to grant permissions",
+            granted=to_grant
+        )
 
     def _revoke_selected_permissions(self) -> None:
         """Revoke selected permissions from current user."""
@@ -416,35 +814,20 @@ class PermissionManagementFrame(ttk.Frame):
             messagebox.showerror("Error", "No permissions selected")
             return
 
-        try:
-            current_user_id = self.current_user.get('user_id')
-            for perm in selected_perms:
-                permissions.revoke_permission(self.selected_user['user_id'], perm, current_user_id)
-
-            messagebox.showinfo("Success", f"Revoked {len(selected_perms)} permission(s)")
-            self._load_user_permissions()
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to revoke permissions: {e}")
-
-    def _grant_all_permissions(self) -> None:
-        """Grant all permissions to current user."""
-        if not self.selected_user:
-            messagebox.showerror("Error", "No user selected")
+        # Skip permissions the user does not have
+        to_revoke = selected_perms & self._current_perms
+        if not to_revoke:
+            messagebox.showinfo("No Changes", "The selected permissions are not currently granted")
             return
 
-        try:
-            current_user_id = self.current_user.get('user_id')
-            all_perms = list(permissions.get_all_permissions().keys())
-
-            for perm in all_perms:
-                permissions.grant_permission(self.selected_user['user_id'], perm, current_user_id)
-
-            messagebox.showinfo("Success", f"Granted all {len(all_perms)} permissions")
-            self._load_user_permissions()
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to grant all permissions: {e}")
+        current_user_id = self.current_user.get('user_id')
+        user_id = self.selected_user['user_id']
+        self._run_permission_change(
+            lambda: permissions.revoke_permissions_bulk(user_id, to_revoke, current_user_id),
+            f"Revoked {len(to_revoke)} permission(s)",
+            "Failed to revoke permissions",
+            revoked=to_revoke
+        )
 
     def _revoke_all_permissions(self) -> None:
         """Revoke all permissions from current user."""
@@ -452,28 +835,32 @@ class PermissionManagementFrame(ttk.Frame):
             messagebox.showerror("Error", "No user selected")
             return
 
-        try:
-            current_user_id = self.current_user.get('user_id')
-            all_perms = list(permissions.get_all_permissions().keys())
-
-            for perm in all_perms:
-                permissions.revoke_permission(self.selected_user['user_id'], perm, current_user_id)
+        current_user_id = self.current_user.get('user_id')
+        user_id = self.selected_user['user_id']
+        all_perms = permissions.get_all_permission_keys()
 
-            messagebox.showinfo("Success", f"Revoked all {len(all_perms)} permissions")
-            self._load_user_permissions()
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to revoke all permissions: {e}")
+        self._run_permission_change(
+            lambda: permissions.revoke_permissions_bulk(user_id, all_perms, current_user_id),
+            f"Revoked all {len(all_perms)} permissions",
+            "Failed to revoke all permissions",
+            revoked=all_perms
+        )
 
     def _select_all_permissions(self) -> None:
         """Select all permission checkboxes."""
-        for var in self.permission_vars.values():
-            var.set(True)
+        self._set_all_checks(True)
 
     def _select_none_permissions(self) -> None:
         """Deselect all permission checkboxes."""
-        for var in self.permission_vars.values():
-            var.set(False)
+        self._set_all_checks(False)
+
+    def _set_all_checks(self, checked: bool) -> None:
+        """Set every checkbox in one bytearray write and redraw the visible slots once."""
+        state = self._perm_state
+        if self.permission_list is None or state.count(int(not checked)) == 0:
+            return  # Nothing to change
+        state[:] = bytes([checked]) * len(state)
+        self.permission_list.refresh()
 
     def _apply_role_suggestions(self) -> None:
         """Apply role-based permission suggestions for the selected user."""
@@ -495,16 +882,14 @@ class PermissionManagementFrame(ttk.Frame):
         )
 
         if confirm:
-            try:
-                current_user_id = self.current_user.get('user_id')
-                for perm in role_perms:
-                    permissions.grant_permission(self.selected_user['user_id'], perm, current_user_id)
-
-                messagebox.showinfo("Success", f"Applied {len(role_perms)} role suggestions")
-                self._load_user_permissions()
-
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to apply role suggestions: {e}")
+            current_user_id = self.current_user.get('user_id')
+            user_id = self.selected_user['user_id']
+            self._run_permission_change(
+                lambda: permissions.grant_permissions_bulk(user_id, role_perms, current_user_id),
+                f"Applied {len(role_perms)} role suggestions",
+                "Failed to apply role suggestions",
+                granted=role_perms
+            )
 
     def _reset_user_permissions(self) -> None:
         """Revoke all permissions from the selected user."""
@@ -519,18 +904,20 @@ class PermissionManagementFrame(ttk.Frame):
         )
 
         if confirm:
-            try:
-                current_user_id = self.current_user.get('user_id')
-                permissions.reset_user_permissions(self.selected_user['user_id'], self.selected_user['role'], current_user_id)
-
-                messagebox.showinfo("Success", f"Revoked all permissions from {self.selected_user['username']}")
-                self._load_user_permissions()
-
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to revoke permissions: {e}")
+            current_user_id = self.current_user.get('user_id')
+            user_id = self.selected_user['user_id']
+            role = self.selected_user['role']
+            self._run_permission_change(
+                lambda: permissions.reset_user_permissions(user_id, role, current_user_id),
+                f"Revoked all permissions from {self.selected_user['username']}",
+                "Failed to revoke permissions",
+                reset=True
+            )
 
     def refresh(self) -> None:
         """Refresh the permission management interface."""
-        self._load_users()
-        if self.selected_user:
-            self._load_user_permissions()
\ No newline at end of file
+        self._all_perms_items = None
+        # Drop cached permission sets so changes made elsewhere are picked up
+        permissions.invalidate_user_permissions()
+        # Reload permissions after the user rows, so a changed role is used
+        self._load_users(on_loaded=self._load_user_permissions)
@@ -2,16 +2,123 @@
 from __future__ import annotations
 
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
 from tkinter import ttk, messagebox
 
+from PIL import ImageTk
+
 from modules import items
 from modules import portions
 from modules import units_of_measure as uom
+from modules import variants
 from ui.checkout import CheckoutDialog
+from utils import set_window_icon, sync_tree
 from utils.cart_pubsub import subscribe_cart_changed, unsubscribe_cart_changed, notify_cart_changed
 from utils.i18n import get_currency_symbol
-from utils.images import load_thumbnail
-from utils.security import get_cart_vat_enabled, get_cart_discount_enabled, get_cart_suspend_enabled, subscribe_payment_methods, unsubscribe_payment_methods
+from utils.images import load_thumbnail_image
+from utils.security import get_cart_vat_enabled, get_cart_discount_enabled, get_cart_suspend_enabled, get_payment_methods, subscribe_payment_methods, unsubscribe_payment_methods
+
+# Unit alias -> (small units per base unit, small unit label, base unit label)
+_UNIT_DISPLAY = {
+    # Liters variations: multiplier from L to ml
+    "liters": (1000, "ml", "L"), "litre": (1000, "ml", "L"),
+    "liter": (1000, "ml", "L"), "litres": (1000, "ml", "L"), "l": (1000, "ml", "L"),
+    # Kilograms variations: multiplier from kg to g
+    "kilograms": (1000, "g", "kg"), "kilogram": (1000, "g", "kg"),
+    "kg": (1000, "g", "kg"), "kgs": (1000, "g", "kg"),
+    # Meters variations: multiplier from m to cm
+    "meters": (100, "cm", "m"), "meter": (100, "cm", "m"),
+    "metre": (100, "cm", "m"), "metres": (100, "cm", "m"), "m": (100, "cm", "m"),
+}
+
+# Base-unit name fragment -> abbreviation of the small unit cart prices are quoted in
+_SMALL_UNIT_BY_BASE = (("mill", "ml"), ("gram", "g"), ("cent", "cm"))
+
+
+def _resolve_unit(name: str) -> tuple[int, str, str]:
+    """(small units per base unit, small unit, base unit) for a unit name; unknown units map to themselves."""
+    return _UNIT_DISPLAY.get(name.lower(), (1, name, name))
+
+
+@lru_cache(maxsize=4096)
+def _format_special_qty(unit_lower: str, quantity, unit_size: float, conv_factor: float) -> str:
+    """Format the stock of a special-volume item, e.g. "12.5 L" or "750 ml"."""
+    display = _UNIT_DISPLAY.get(unit_lower)
+    if display is None:
+        return str(quantity)
+    divisor, small_unit, base_unit = display
+    try:
+        # Use unit_size and conv_factor to compute small unit total
+        total_small = quantity * unit_size * conv_factor
+    except TypeError:
+        return str(quantity)
+    if total_small >= divisor:
+        return f"{total_small / divisor:.1f} {base_unit}"
+    return f"{total_small:.0f} {small_unit}"
+
+# Decodes catalog images off the Tk thread; PhotoImages are still built on it
+_thumb_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pos-thumbs")
+
+# Catalog rows are inserted in batches of this size as the list is scrolled
+_ITEMS_BATCH = 50
+
+
+@lru_cache(maxsize=128)
+def _unit_by_name_cached(name: str) -> dict:
+    """uom.get_unit_by_name, memoized; cleared by PosFrame.invalidate_catalog.
+
+    The returned dict is shared between calls and must not be modified.
+    """
+    return uom.get_unit_by_name(name) or {}
+
+
+def _small_unit_for_base(base_unit: str) -> str:
+    for fragment, small_unit in _SMALL_UNIT_BY_BASE:
+        if fragment in base_unit:
+            return small_unit
+    return base_unit or 'unit'
+
+
+@lru_cache(maxsize=512)
+def _get_item_cached(item_id: int) -> dict | None:
+    """items.get_item for cart rendering; cleared by PosFrame.invalidate_catalog.
+
+    The returned dict is shared between calls and must not be modified.
+    """
+    return items.get_item(item_id)
+
+
+def _derive_line_fields(entry: dict) -> None:
+    """Stash the unit data a cart line is rendered with on the entry itself.
+
+    Done once when the line is added, so _refresh_cart does no item or unit
+    lookups. Lines that arrive without them (resumed carts) get them lazily.
+    """
+    item_record = _get_item_cached(entry["item_id"]) if entry.get("item_id") else None
+    unit_name = (item_record.get("unit_of_measure") if item_record else "") or ""
+    # unit_size_ml is a NOT NULL numeric column, so float() cannot fail here
+    unit_size = float(item_record.get("unit_size_ml") or 1) if item_record else 1.0
+    uinfo = _unit_by_name_cached(unit_name)
+    entry["_unit_size"] = unit_size
+    # Multiplied by the package price on every refresh, so stored as a reciprocal
+    entry["_inv_unit_size"] = 1.0 / unit_size if unit_size > 0 else 1.0
+    entry["_abbr"] = uinfo.get("abbreviation") or unit_name or "unit"
+    entry["_small_unit"] = entry.get("display_unit") or _small_unit_for_base((uinfo.get("base_unit") or "").lower())
+    entry["_is_large_unit"] = unit_name.lower() in _UNIT_DISPLAY
+
+
+def _cart_key(entry: dict) -> tuple | None:
+    """Key under which repeated adds of the same product merge into one cart line.
+
+    Special-volume sales are never merged, so they have no key.
+    """
+    if entry.get("is_special_volume"):
+        return None
+    if entry.get("variant_id") is not None:
+        return ("variant", entry["item_id"], entry["variant_id"])
+    return ("plain", entry["item_id"])
 
 
 class PosFrame(ttk.Frame):
@@ -24,6 +131,13 @@ class PosFrame(ttk.Frame):
         self.vat_var = tk.StringVar(value="0.00")
         self.discount_var = tk.StringVar(value="0")
         self.payment_method_var = tk.StringVar(value="Cash")
+        # Parsed discount fraction, payment and cart total; the traces keep the
+        # first two in step with their entries so refreshes never re-parse them
+        self._discount_pct = 0.0
+        self._payment: float | None = 0.0
+        self._cart_total = 0.0
+        self.discount_var.trace_add("write", self._on_discount_changed)
+        self.payment_var.trace_add("write", self._on_payment_changed)
         self.cart_state = cart_state or {"items": [], "suspended": []}
         self.cart = self.cart_state.setdefault("items", [])
         self.suspended_carts = self.cart_state.setdefault("suspended", [])
@@ -34,25 +148,67 @@ class PosFrame(ttk.Frame):
         self.subtotal_var = tk.StringVar(value="0.00")
         self.change_var = tk.StringVar(value="0.00")
         self.currency_symbol = get_currency_symbol()
+        # Pending after() ids for the debounced search and discount refreshes
+        self._search_after_id = None
+        self._discount_after_id = None
+        # Last values rendered into each Treeview, keyed by iid
+        self._items_list_state: dict[str, tuple] = {}
+        self._cart_tree_state: dict[str, tuple] = {}
+        # Formatted catalog rows per (search, catalog version); see _refresh_items
+        self._search_cache: dict[tuple[str, int], dict[str, tuple]] = {}
+        self._catalog_version = 0
+        # All rows of the current search, and how many of them are in the Treeview
+        self._items_rows: dict[str, tuple] = {}
+        self._items_shown = 0
+        self._items_search = None
+        self._items_more_after_id = None
+        # Catalog version the list was last filled from
+        self._items_version = -1
+        # Cart line position per _cart_key and cart lines by cart_id, both
+        # rebuilt whenever the cart is redrawn
+        self._cart_index: dict[tuple, int] = {}
+        self._cart_by_id: dict[int, dict] = {}
+        # Subtotal and rate-weighted VAT sum of the last cart refresh
+        self._cart_subtotal = 0.0
+        self._cart_vat_weighted = 0.0
+        self._rebuild_cart_index()
+        # Catalog thumbnails by item_id, the decodes still running, and the
+        # item currently shown in the preview panel
+        self._preview_cache: dict[int, tk.PhotoImage] = {}
+        self._pending_thumbs: dict[int, object] = {}
+        self._preview_item_id = None
+        # (selection, catalog version) last rendered by _update_item_preview
+        self._last_previewed_key = None
+        # Variant picker dialog, built on first use and then reused
+        self._variant_dialog = None
+        self._variant_tree = None
+        self._variant_heading = None
+        self._variant_pick = None
+        # Special-sale dialog, also built once; _special_sale describes the
+        # item it is currently open for and the pool holds its preset buttons
+        self._special_dialog = None
+        self._special_sale = None
+        self._preset_button_pool: list[ttk.Button] = []
+        # Store references to conditionally shown widgets
+        self.vat_label = None
+        self.vat_display = None
+        self.discount_label = None
+        self.discount_entry = None
+        self.suspend_button = None
+        self.resume_button = None
+        # (VAT, discount, suspend) settings the totals/actions were last laid out for
+        self._layout_flags: tuple | None = None
         self._build_ui()
         # Populate once on startup; further refreshes are debounced.
         self._refresh_items()
-        self._preview_cache: dict[int, tk.PhotoImage] = {}
         self._refreshing = False
+        # Pending after_idle id of a coalesced ensure_populated()
         self._ensure_after_id = None
         # Refresh when the frame becomes visible again.
         self.bind("<Map>", lambda _e: self.ensure_populated())
         self.bind("<FocusIn>", lambda _e: self.ensure_populated())
         self.bind("<Visibility>", lambda _e: self.ensure_populated())
 
-        # Store references to conditionally shown widgets
-        self.vat_label = None
-        self.vat_display = None
-        self.discount_label = None
-        self.discount_entry = None
-        self.suspend_button = None
-        self.resume_button = None
-
         # Subscribe to payment method changes to update combobox live
         subscribe_payment_methods(self._on_payment_methods_changed)
         self.bind("<Destroy>", lambda _e: unsubscribe_payment_methods(self._on_payment_methods_changed))
@@ -87,7 +243,8 @@ class PosFrame(ttk.Frame):
         ttk.Label(top, text="Search").grid(row=0, column=0, padx=4, sticky=tk.W)
         search_entry = ttk.Entry(top, textvariable=self.search_var, width=32)
         search_entry.grid(row=0, column=1, padx=4, sticky=tk.EW)
-        search_entry.bind("<KeyRelease>", lambda _e: self._refresh_items())
+        search_entry.bind("<KeyRelease>", lambda _e: self._schedule_refresh_items())
+        search_entry.bind("<Return>", lambda _e: self._do_refresh_items())
 
         ttk.Label(top, text="Barcode").grid(row=0, column=2, padx=4, sticky=tk.W)
         barcode_entry = ttk.Entry(top, textvariable=self.barcode_var, width=20)
@@ -112,7 +269,8 @@ class PosFrame(ttk.Frame):
         items_scroll.grid(row=0, column=1, sticky=tk.NS)
         xscroll = ttk.Scrollbar(items_frame, orient=tk.HORIZONTAL, command=self.items_list.xview)
         xscroll.grid(row=1, column=0, sticky=tk.EW)
-        self.items_list.configure(yscroll=items_scroll.set, xscroll=xscroll.set)
+        self._items_scroll = items_scroll
+        self.items_list.configure(yscroll=self._on_items_yscroll, xscroll=xscroll.set)
         self.items_list.bind("<Double-1>", lambda _e: self._add_selected_item())
         self.items_list.bind("<<TreeviewSelect>>", lambda _e: self._update_item_preview())
 
@@ -161,8 +319,8 @@ class PosFrame(ttk.Frame):
         totals.grid(row=3, column=0, sticky=tk.EW, pady=(4, 6))
         totals.columnconfigure(1, weight=1)
         self.totals_frame = totals
-        ttk.Label(totals, text="Subtotal:").grid(row=0, column=0, sticky=tk.W)
-        ttk.Label(totals, textvariable=self.subtotal_var, font=("Segoe UI", 11, "bold")).grid(row=0, column=1, sticky=tk.W, padx=(8, 0))
+        self.subtotal_label = ttk.Label(totals, text="Subtotal:")
+        self.subtotal_display = ttk.Label(totals, textvariable=self.subtotal_var, font=("Segoe UI", 11, "bold"))
 
         # VAT display - will be shown/hidden dynamically
         self.vat_label = ttk.Label(totals, text="VAT:")
@@ -171,11 +329,10 @@ class PosFrame(ttk.Frame):
         # Discount input - will be shown/hidden dynamically
         self.discount_label = ttk.Label(totals, text="Discount (%):")
         self.discount_entry = ttk.Entry(totals, textvariable=self.discount_var, width=8)
-        self.discount_entry.bind("<KeyRelease>", lambda _e: self._refresh_cart())
+        self.discount_entry.bind("<KeyRelease>", lambda _e: self._schedule_refresh_cart())
 
         # Payment method (always shown)
         self.payment_label = ttk.Label(totals, text="Payment Method:")
-        from utils.security import get_payment_methods
         self.payment_combo = ttk.Combobox(totals, textvariable=self.payment_method_var, values=get_payment_methods(), width=10, state="readonly")
 
         # Total (always shown)
@@ -185,20 +342,30 @@ class PosFrame(ttk.Frame):
         btn_frame = ttk.Frame(cart_container)
         btn_frame.grid(row=4, column=0, sticky=tk.W, pady=(6, 4))
         self.actions_frame = btn_frame
-        ttk.Button(btn_frame, text="Checkout / Save Sale", command=self._checkout).pack(side=tk.LEFT, padx=2)
+        self.checkout_button = ttk.Button(btn_frame, text="Checkout / Save Sale", command=self._checkout)
 
         # Suspend/Resume buttons - created but not packed; layout will show/hide them
         self.suspend_button = ttk.Button(btn_frame, text="Suspend Cart", command=self._suspend_cart)
         self.resume_button = ttk.Button(btn_frame, text="Resume Cart", command=self._resume_cart)
 
-        ttk.Button(btn_frame, text="Open Cart", command=self._goto_cart).pack(side=tk.LEFT, padx=2)
-        
+        self.open_cart_button = ttk.Button(btn_frame, text="Open Cart", command=self._goto_cart)
+
         # Initialize UI layout
         self._update_ui_layout()
-        self._update_resume_btn()
 
     def _update_ui_layout(self) -> None:
-        """Update the UI layout based on current cart settings."""
+        """Update the UI layout based on current cart settings.
+
+        Runs on every cart refresh, so the widgets are only re-laid out when
+        one of the settings actually changed.
+        """
+        flags = (get_cart_vat_enabled(), get_cart_discount_enabled(), get_cart_suspend_enabled())
+        if flags != self._layout_flags:
+            self._layout_flags = flags
+            self._apply_layout(*flags)
+        self._update_resume_btn()
+
+    def _apply_layout(self, vat_enabled: bool, discount_enabled: bool, suspend_enabled: bool) -> None:
         # Clear existing grid layout
         for widget in self.totals_frame.winfo_children():
             widget.grid_forget()
@@ -208,28 +375,22 @@ class PosFrame(ttk.Frame):
             widget.pack_forget()
 
         # Always show subtotal
-        ttk.Label(self.totals_frame, text="Subtotal:").grid(row=0, column=0, sticky=tk.W)
-        ttk.Label(self.totals_frame, textvariable=self.subtotal_var, font=("Segoe UI", 11, "bold")).grid(row=0, column=1, sticky=tk.W, padx=(8, 0))
+        self.subtotal_label.grid(row=0, column=0, sticky=tk.W)
+        self.subtotal_display.grid(row=0, column=1, sticky=tk.W, padx=(8, 0))
 
         row_idx = 1
 
         # VAT display - conditionally shown
-        if get_cart_vat_enabled() and self.vat_label is not None:
+        if vat_enabled:
             self.vat_label.grid(row=row_idx, column=0, sticky=tk.W, pady=(2, 0))
             self.vat_display.grid(row=row_idx, column=1, sticky=tk.W, padx=(8, 0))
             row_idx += 1
-        elif self.vat_label is not None:
-            self.vat_label.grid_forget()
-            self.vat_display.grid_forget()
 
         # Discount input - conditionally shown
-        if get_cart_discount_enabled() and self.discount_label is not None:
+        if discount_enabled:
             self.discount_label.grid(row=row_idx, column=0, sticky=tk.W, pady=(2, 0))
             self.discount_entry.grid(row=row_idx, column=1, sticky=tk.W, padx=(8, 0))
             row_idx += 1
-        elif self.discount_label is not None:
-            self.discount_label.grid_forget()
-            self.discount_entry.grid_forget()
 
         # Payment method (always shown)
         self.payment_label.grid(row=row_idx, column=0, sticky=tk.W, pady=(2, 0))
@@ -241,18 +402,14 @@ class PosFrame(ttk.Frame):
         self.total_display.grid(row=row_idx, column=1, sticky=tk.W, padx=(8, 0))
 
         # Actions - always show checkout and open cart buttons
-        ttk.Button(self.actions_frame, text="Checkout / Save Sale", command=self._checkout).pack(side=tk.LEFT, padx=2)
+        self.checkout_button.pack(side=tk.LEFT, padx=2)
 
         # Suspend/Resume buttons - conditionally shown
-        if get_cart_suspend_enabled() and self.suspend_button is not None:
+        if suspend_enabled:
             self.suspend_button.pack(side=tk.LEFT, padx=2)
             self.resume_button.pack(side=tk.LEFT, padx=2)
-        elif self.suspend_button is not None:
-            self.suspend_button.pack_forget()
-            self.resume_button.pack_forget()
 
-        ttk.Button(self.actions_frame, text="Open Cart", command=self._goto_cart).pack(side=tk.LEFT, padx=2)
-        self._update_resume_btn()
+        self.open_cart_button.pack(side=tk.LEFT, padx=2)
 
     def _update_resume_btn(self):
         if self.resume_button is not None:
@@ -262,73 +419,196 @@ class PosFrame(ttk.Frame):
                 self.resume_button.state(["disabled"])
 
     def _thumb_for_item(self, item: dict) -> tk.PhotoImage | None:
+        """Return the cached thumbnail, starting a background load on a miss.
+
+        A miss returns None; _apply_thumb fills the preview in once the image
+        has been decoded.
+        """
         item_id = item.get("item_id")
         if not item_id:
             return None
         if item_id in self._preview_cache:
             return self._preview_cache[item_id]
-        thumb = load_thumbnail(item.get("image_path")) if item.get("image_path") else None
-        if thumb:
-            self._preview_cache[item_id] = thumb
-        return thumb
+        path = item.get("image_path")
+        if path and item_id not in self._pending_thumbs:
+            future = _thumb_executor.submit(load_thumbnail_image, path)
+            self._pending_thumbs[item_id] = future
+
+            def check_result(delay):
+                if not future.done():
+                    self.after(delay, check_result, min(delay * 2, 50))
+                    return
+                self._apply_thumb(item_id, future.result())
+
+            self.after(5, check_result, 10)
+        return None
+
+    def _apply_thumb(self, item_id: int, image) -> None:
+        """Cache a decoded thumbnail and show it if its item is still previewed."""
+        self._pending_thumbs.pop(item_id, None)
+        try:
+            if image is None or not self.winfo_exists():
+                return
+            thumb = ImageTk.PhotoImage(image)
+        except tk.TclError:
+            # Frame destroyed while the image was loading
+            return
+        self._preview_cache[item_id] = thumb
+        if self._preview_item_id == item_id:
+            self.item_preview_label.configure(image=thumb, text="")
+            self.item_preview_label.image = thumb
+
+    def _schedule_refresh_items(self) -> None:
+        """Debounce search keystrokes so a burst of typing triggers one refresh."""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(250, self._do_refresh_items)
+
+    def _do_refresh_items(self) -> None:
+        if self._search_after_id is not None:
+            # Return bypasses the debounce; drop the refresh still pending
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        self._refresh_items()
+
+    def _schedule_refresh_cart(self) -> None:
+        """Debounce discount keystrokes the same way as the search box."""
+        if self._discount_after_id is not None:
+            self.after_cancel(self._discount_after_id)
+        self._discount_after_id = self.after(250, self._do_refresh_cart)
+
+    def _do_refresh_cart(self) -> None:
+        if self._discount_after_id is not None:
+            # Checkout flushes a pending discount edit before reading totals
+            self.after_cancel(self._discount_after_id)
+            self._discount_after_id = None
+        # The cart lines are unchanged, only the totals depend on the discount
+        self._recompute_totals()
+
+    def invalidate_catalog(self) -> None:
+        """Drop cached catalog rows so the next refresh re-reads the items table."""
+        self._catalog_version += 1
+        self._search_cache.clear()
+        _get_item_cached.cache_clear()
+        # Units can be edited in settings; refresh_all() runs when the POS is shown again
+        _unit_by_name_cached.cache_clear()
 
     # Items search/add
     def _refresh_items(self) -> None:
         search = self.search_var.get().strip()
-        for row in self.items_list.get_children():
-            self.items_list.delete(row)
+        # list_items matches case-insensitively, so the lowered text is the key
+        key = (search.lower(), self._catalog_version)
+        new_state = self._search_cache.get(key)
+        if new_state is None:
+            new_state = self._catalog_rows(search)
+            if len(self._search_cache) >= 32:
+                # Evict the oldest search
+                del self._search_cache[next(iter(self._search_cache))]
+            self._search_cache[key] = new_state
+        self._items_rows = new_state
+        # Only the first screenful plus a batch is inserted; scrolling adds more
+        count = self._initial_items_window()
+        if key[0] == self._items_search:
+            # Same search refreshed: keep whatever the user already scrolled into view
+            count = max(count, self._items_shown)
+        self._items_search = key[0]
+        self._items_version = self._catalog_version
+        self._show_items(count)
+        self._update_item_preview()
+
+    def _initial_items_window(self) -> int:
+        rows = self.items_list.winfo_height() // 20
+        if rows <= 1:
+            # Not mapped yet; fall back to the configured height
+            rows = int(self.items_list.cget("height"))
+        return rows + _ITEMS_BATCH
+
+    def _show_items(self, count: int) -> None:
+        """Make the Treeview hold the first count rows of the current search."""
+        count = min(count, len(self._items_rows))
+        visible = self._items_rows if count == len(self._items_rows) else dict(islice(self._items_rows.items(), count))
+        sync_tree(self.items_list, self._items_list_state, visible)
+        self._items_list_state = visible
+        self._items_shown = count
+
+    def _on_items_yscroll(self, first, last) -> None:
+        self._items_scroll.set(first, last)
+        # Near the bottom with rows still held back: append the next batch
+        if float(last) > 0.8 and self._items_shown < len(self._items_rows) and self._items_more_after_id is None:
+            self._items_more_after_id = self.after_idle(self._load_more_items)
+
+    def _load_more_items(self) -> None:
+        self._items_more_after_id = None
+        self._show_items(self._items_shown + _ITEMS_BATCH)
+
+    @staticmethod
+    def _unit_display_meta(units: set[str]) -> dict[str, tuple[float, str, str]]:
+        """Map each unit name to (conversion factor, abbreviation, base unit).
+
+        A catalog uses only a handful of units, so they are fetched in one
+        query up front instead of once per row.
+        """
+        try:
+            unit_rows = uom.get_units_by_names(units)
+        except Exception:
+            # Units table unavailable: fall back to the built-in multipliers
+            return {unit: (items._get_unit_multiplier(unit), "", "") for unit in units}
+        meta = {}
+        for unit in units:
+            unit_info = unit_rows.get(unit) or {}
+            meta[unit] = (
+                float(unit_info.get("conversion_factor", 1) or 1),
+                unit_info.get("abbreviation") or "",
+                (unit_info.get("base_unit") or "").lower(),
+            )
+        return meta
+
+    def _catalog_rows(self, search: str) -> dict[str, tuple]:
+        """Query the catalog and format each row for the items list, keyed by iid."""
         rows = items.list_items(search=search if search else None)
+        new_state: dict[str, tuple] = {}
+        unit_meta = self._unit_display_meta({(row.get("unit_of_measure") or "").lower() for row in rows})
+        # Variants for the whole result set, fetched in one pass
+        variant_map = variants.list_variants_for_items([row["item_id"] for row in rows])
+        cur = self.currency_symbol
         for row in rows:
             unit = (row.get("unit_of_measure") or "").lower()
             is_special = row.get("is_special_volume", 0)
-            unit_size = float(row.get("unit_size_ml") or 1)  # Size in base units (e.g., 1 = 1L)
-            cost = row["cost_price"] if isinstance(row["cost_price"], (int, float)) else 0.0
-            price = row["selling_price"] if isinstance(row["selling_price"], (int, float)) else 0.0
+            # list_items() already returns float prices and a non-zero unit size
+            unit_size = row["unit_size_ml"]  # Size in base units (e.g., 1 = 1L)
+            price = row["selling_price"]
             
             # Check if item has variants
-            from modules import variants
-            has_variants_flag = variants.has_variants(row["item_id"])
+            variant_list = variant_map.get(row["item_id"], [])
+            has_variants_flag = bool(variant_list)
             
             # Use configured conversion factor and abbreviation for display
-            try:
-                unit_info = uom.get_unit_by_name(unit) or {}
-                conv_factor = float(unit_info.get("conversion_factor", 1) or 1)
-                abbr = unit_info.get("abbreviation") or ""
-                base_unit = (unit_info.get("base_unit") or "").lower()
-            except Exception:
-                conv_factor = items._get_unit_multiplier(unit)
-                abbr = ""
-                base_unit = ""
+            conv_factor, abbr, base_unit = unit_meta[unit]
 
             # Handle pricing display for items with variants
             if has_variants_flag:
-                # Get variants for display
-                variant_list = variants.list_variants(row["item_id"])
-                if variant_list:
-                    # If this parent is catalog-only, show each variant as its own top-level entry
-                    if row.get("is_catalog_only"):
-                        for v in variant_list:
-                            if not v.get("is_active", 1):
-                                continue
-                            v_name = f"{row.get('name')} — {v.get('variant_name')}"
-                            price_display = f"{self.currency_symbol} {v['selling_price']:.2f}"
-                            qty_display = str(v.get('quantity', 0))
-                            self.items_list.insert("", tk.END, iid=f"variant-{v['variant_id']}", values=(v_name, price_display, qty_display))
-                        # skip inserting parent row
-                        continue
-                    else:
-                        variant_prices = [v["selling_price"] for v in variant_list if v.get("is_active", 1)]
-                        if variant_prices:
-                            min_price = min(variant_prices)
-                            max_price = max(variant_prices)
-                            if min_price == max_price:
-                                price_display = f"{self.currency_symbol} {min_price:.2f}"
-                            else:
-                                price_display = f"{self.currency_symbol} {min_price:.2f} - {self.currency_symbol} {max_price:.2f}"
-                        else:
-                            price_display = "Variants available"
+                # If this parent is catalog-only, show each variant as its own top-level entry
+                if row.get("is_catalog_only"):
+                    for v in variant_list:
+                        if not v.get("is_active", 1):
+                            continue
+                        v_name = f"{row.get('name')} — {v.get('variant_name')}"
+                        price_display = f"{cur} {v['selling_price']:.2f}"
+                        qty_display = str(v.get('quantity', 0))
+                        new_state[f"variant-{v['variant_id']}"] = (v_name, price_display, qty_display)
+                    # skip inserting parent row
+                    continue
                 else:
-                    price_display = "Variants available"
+                    variant_prices = [v["selling_price"] for v in variant_list if v.get("is_active", 1)]
+                    if variant_prices:
+                        min_price = min(variant_prices)
+                        max_price = max(variant_prices)
+                        if min_price == max_price:
+                            price_display = f"{cur} {min_price:.2f}"
+                        else:
+                            price_display = f"{cur} {min_price:.2f} - {cur} {max_price:.2f}"
+                    else:
+                        price_display = "Variants available"
             else:
                 # Price per large unit = bulk price / package_size
                 if unit_size > 0:
@@ -338,7 +618,7 @@ class PosFrame(ttk.Frame):
 
                 # Always show price per large unit (e.g., per L/kg/m or per pcs)
                 suffix = abbr or unit or "unit"
-                price_display = f"{self.currency_symbol} {price_per_unit:.2f}/{suffix}"
+                price_display = f"{cur} {price_per_unit:.2f}/{suffix}"
 
             # Handle quantity display for items with variants
             if has_variants_flag:
@@ -346,37 +626,12 @@ class PosFrame(ttk.Frame):
                 total_variant_qty = sum(v["quantity"] for v in variant_list if v.get("is_active", 1))
                 qty_display = f"{total_variant_qty} (variants)"
             elif is_special:
-                try:
-                    unit_lower = unit.lower()
-                    # Use unit_size and conv_factor to compute small unit total
-                    total_small = row["quantity"] * unit_size * conv_factor
-                    # Liters -> ml/L
-                    if unit_lower in ("litre", "liter", "liters", "litres", "l"):
-                        if total_small >= 1000:
-                            qty_display = f"{total_small / 1000:.1f} L"
-                        else:
-                            qty_display = f"{total_small:.0f} ml"
-                    # Kilograms -> g/kg
-                    elif unit_lower in ("kilogram", "kilograms", "kg", "kgs"):
-                        if total_small >= 1000:
-                            qty_display = f"{total_small / 1000:.1f} kg"
-                        else:
-                            qty_display = f"{total_small:.0f} g"
-                    # Meters -> cm/m
-                    elif unit_lower in ("meter", "meters", "metre", "metres", "m"):
-                        if total_small >= 100:
-                            qty_display = f"{total_small / 100:.1f} m"
-                        else:
-                            qty_display = f"{total_small:.0f} cm"
-                    else:
-                        qty_display = str(row["quantity"])
-                except Exception:
-                    qty_display = str(row["quantity"])
+                qty_display = _format_special_qty(unit, row["quantity"], unit_size, conv_factor)
             else:
                 qty_display = str(row["quantity"])
             
-            self.items_list.insert("", tk.END, iid=str(row["item_id"]), values=(row["name"], price_display, qty_display))
-        self._update_item_preview()
+            new_state[str(row["item_id"])] = (row["name"], price_display, qty_display)
+        return new_state
 
     def _add_selected_item(self) -> None:
         sel = self.items_list.selection()
@@ -389,7 +644,6 @@ class PosFrame(ttk.Frame):
                 variant_id = int(selid.split("-")[-1])
             except Exception:
                 return
-            from modules import variants
             variant = variants.get_variant(variant_id)
             if variant:
                 parent = items.get_item(variant["item_id"]) if variant.get("item_id") else None
@@ -407,7 +661,6 @@ class PosFrame(ttk.Frame):
         record = items.get_item(item_id)
         if record:
             # Check if item has variants
-            from modules import variants
             if variants.has_variants(item_id):
                 self._show_variant_picker(record)
             elif record.get("is_special_volume"):
@@ -418,8 +671,6 @@ class PosFrame(ttk.Frame):
 
     def _show_variant_picker(self, item: dict) -> None:
         """Show dialog to select variant when adding item with variants to cart."""
-        from modules import variants
-        from utils import set_window_icon
         
         variant_list = variants.list_variants(item["item_id"])
         if not variant_list:
@@ -427,15 +678,36 @@ class PosFrame(ttk.Frame):
             self._add_to_cart(item)
             return
         
+        # The picker is built once and re-filled on every open
+        if self._variant_dialog is None or not self._variant_dialog.winfo_exists():
+            self._build_variant_picker()
+        dialog = self._variant_dialog
+        tree = self._variant_tree
+        self._variant_pick = (item, variant_list)
+        dialog.title(f"Select Variant - {item['name']}")
+        self._variant_heading.configure(text=f"Select variant for: {item['name']}")
+        
+        tree.delete(*tree.get_children())
+        for v in variant_list:
+            if v.get("is_active", 1):
+                tree.insert("", tk.END, iid=str(v["variant_id"]), 
+                           values=(v["variant_name"], f"{self.currency_symbol} {v['selling_price']:.2f}"))
+        
+        dialog.grab_set()
+        dialog.deiconify()  # Show after fully built
+
+    def _build_variant_picker(self) -> None:
+        """Create the (hidden) variant picker dialog reused by _show_variant_picker."""
         dialog = tk.Toplevel(self)
         dialog.withdraw()  # Hide until fully built
-        dialog.title(f"Select Variant - {item['name']}")
         set_window_icon(dialog)
         dialog.transient(self.winfo_toplevel())
-        dialog.grab_set()
         dialog.resizable(True, True)
+        # Closing only hides the dialog so the next open can reuse it
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_variant_picker)
         
-        ttk.Label(dialog, text=f"Select variant for: {item['name']}", font=("Segoe UI", 11, "bold")).pack(pady=(10, 6))
+        self._variant_heading = ttk.Label(dialog, font=("Segoe UI", 11, "bold"))
+        self._variant_heading.pack(pady=(10, 6))
         
         # Variant list
         list_frame = ttk.Frame(dialog)
@@ -454,63 +726,51 @@ class PosFrame(ttk.Frame):
         tree.column("variant_name", width=250)
         tree.column("price", width=150)
         
-        for v in variant_list:
-            if v.get("is_active", 1):
-                tree.insert("", tk.END, iid=str(v["variant_id"]), 
-                           values=(v["variant_name"], f"{self.currency_symbol} {v['selling_price']:.2f}"))
-        
-        def add_selected():
-            sel = tree.selection()
-            if not sel:
-                messagebox.showinfo("Select Variant", "Please select a variant")
-                return
-            variant_id = int(sel[0])
-            variant = next((v for v in variant_list if v["variant_id"] == variant_id), None)
-            if variant:
-                # Add variant to cart (with variant info)
-                self._add_variant_to_cart(item, variant)
-                dialog.destroy()
-        
         # Buttons
         btn_frame = ttk.Frame(dialog)
         btn_frame.pack(pady=8)
-        ttk.Button(btn_frame, text="Add to Cart", width=15, command=add_selected).pack(side=tk.LEFT, padx=4)
-        ttk.Button(btn_frame, text="Cancel", width=15, command=dialog.destroy).pack(side=tk.LEFT, padx=4)
+        ttk.Button(btn_frame, text="Add to Cart", width=15, command=self._add_picked_variant).pack(side=tk.LEFT, padx=4)
+        ttk.Button(btn_frame, text="Cancel", width=15, command=self._hide_variant_picker).pack(side=tk.LEFT, padx=4)
         
-        tree.bind("<Double-1>", lambda _e: add_selected())
+        tree.bind("<Double-1>", lambda _e: self._add_picked_variant())
         
-        # Set geometry and show dialog after content is built
         dialog.update_idletasks()
         dialog.geometry("500x400")
-        dialog.deiconify()  # Show after fully built
+        self._variant_dialog = dialog
+        self._variant_tree = tree
+
+    def _add_picked_variant(self) -> None:
+        sel = self._variant_tree.selection()
+        if not sel:
+            messagebox.showinfo("Select Variant", "Please select a variant")
+            return
+        item, variant_list = self._variant_pick
+        variant_id = int(sel[0])
+        variant = next((v for v in variant_list if v["variant_id"] == variant_id), None)
+        if variant:
+            # Add variant to cart (with variant info)
+            self._add_variant_to_cart(item, variant)
+            self._hide_variant_picker()
+
+    def _hide_variant_picker(self) -> None:
+        self._variant_dialog.grab_release()
+        self._variant_dialog.withdraw()
 
     def _sell_special_dialog(self, item: dict) -> None:
-        """Prompt for preset portion or custom cash amount for fractional-sale items."""
-        from utils import set_window_icon
-        from modules import portions
+        """Prompt for preset portion or custom cash amount for fractional-sale items.
 
-        fresh = items.get_item(item["item_id"]) or item
-        unit_of_measure = fresh.get("unit_of_measure", "pieces")
-        unit_size = float(fresh.get("unit_size_ml") or 1)  # Size in base units (e.g., 20 = 20 liters)
+        item must be a freshly fetched record (get_item/get_item_by_barcode);
+        its stock is not re-read here.
+        """
+        unit_of_measure = item.get("unit_of_measure", "pieces")
+        unit_size = float(item.get("unit_size_ml") or 1)  # Size in base units (e.g., 20 = 20 liters)
         
         # Use stored price per smallest unit (e.g., price per ml)
-        price_per_small = float(fresh.get("selling_price_per_unit") or fresh.get("price_per_ml") or 0)
-        stock_containers = float(fresh.get("quantity", 0) or 0)  # Number of containers
+        price_per_small = float(item.get("selling_price_per_unit") or item.get("price_per_ml") or 0)
+        stock_containers = float(item.get("quantity", 0) or 0)  # Number of containers
         
         # Determine conversion and display units
-        unit_lower = unit_of_measure.lower()
-        conversions = {
-            # Liters variations: multiplier from L to ml
-            "liters": (1000, "ml", "L"), "litre": (1000, "ml", "L"), 
-            "liter": (1000, "ml", "L"), "litres": (1000, "ml", "L"), "l": (1000, "ml", "L"),
-            # Kilograms variations: multiplier from kg to g
-            "kilograms": (1000, "g", "kg"), "kilogram": (1000, "g", "kg"), 
-            "kg": (1000, "g", "kg"), "kgs": (1000, "g", "kg"),
-            # Meters variations: multiplier from m to cm
-            "meters": (100, "cm", "m"), "meter": (100, "cm", "m"),
-            "metre": (100, "cm", "m"), "metres": (100, "cm", "m"), "m": (100, "cm", "m"),
-        }
-        multiplier, small_unit, base_unit = conversions.get(unit_lower, (1, unit_of_measure, unit_of_measure))
+        multiplier, small_unit, base_unit = _resolve_unit(unit_of_measure)
         
         # Calculate available stock in small units (ml/g/cm)
         available_small = max(0.0, stock_containers * unit_size * multiplier)
@@ -520,139 +780,187 @@ class PosFrame(ttk.Frame):
         price_per_base = price_per_small * multiplier if multiplier > 0 else price_per_small
         
         # Get preset portions for this item
-        preset_portions = portions.list_portions(fresh["item_id"])
+        preset_portions = portions.list_portions(item["item_id"])
+
+        # The dialog is built once and re-pointed at the item on every open
+        if self._special_dialog is None or not self._special_dialog.winfo_exists():
+            self._build_special_dialog()
+        dialog = self._special_dialog
+        self._special_sale = {
+            "item": item,
+            "multiplier": multiplier,
+            "small_unit": small_unit,
+            "available_small": available_small,
+            "price_per_small": price_per_small,
+        }
+        dialog.title(f"Sell - {item['name']}")
+
+        # Info section
+        self._special_price_label.configure(text=f"Price per {base_unit}: {self.currency_symbol} {price_per_base:.2f}")
+        self._special_stock_label.configure(text=f"Available: {available_base:.2f} {base_unit} ({available_small:.0f} {small_unit})")
+
+        # Preset portions section (if any exist)
+        if preset_portions:
+            portions_frame = self._special_portions_frame
+            # Configure columns to expand equally
+            num_cols = min(len(preset_portions), 4)
+            for col in range(4):
+                portions_frame.columnconfigure(col, weight=1 if col < num_cols else 0)
+            pool = self._preset_button_pool
+            while len(pool) < len(preset_portions):
+                pool.append(ttk.Button(portions_frame))
+            for i, portion in enumerate(preset_portions):
+                btn_text = f"{portion['portion_name']}\n{self.currency_symbol} {portion['selling_price']:.0f}"
+                pool[i].configure(text=btn_text, command=partial(self._special_add_preset, portion))
+                pool[i].grid(row=i // 4, column=i % 4, padx=3, pady=2, sticky="ew")
+            # Hide buttons left over from items with more portions
+            for btn in pool[len(preset_portions):]:
+                btn.grid_remove()
+            self._special_portions_section.pack(fill=tk.X, before=self._special_custom_section)
+        else:
+            self._special_portions_section.pack_forget()
+
+        # Custom amount section
+        self._special_amount_var.set("")
+        self._special_amount_entry.focus_set()
+
+        # Calculate dialog size based on content
+        num_rows = (len(preset_portions) + 3) // 4 if preset_portions else 0
+        height = 280 if not preset_portions else 320 + num_rows * 50
+        width = 500 if preset_portions else 400
+        dialog.update_idletasks()
+        dialog.geometry(f"{width}x{height}")
+        dialog.grab_set()
+        dialog.deiconify()  # Show after fully built
 
+    def _build_special_dialog(self) -> None:
+        """Create the (hidden) special-sale dialog reused by _sell_special_dialog."""
         dialog = tk.Toplevel(self)
         dialog.withdraw()  # Hide until fully built
-        dialog.title(f"Sell - {fresh['name']}")
         set_window_icon(dialog)
         dialog.transient(self.winfo_toplevel())
-        dialog.grab_set()
         dialog.resizable(True, True)
+        # Closing only hides the dialog so the next open can reuse it
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_special_dialog)
 
         main_frame = ttk.Frame(dialog, padding=12)
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         # Info section
-        ttk.Label(main_frame, text=f"Price per {base_unit}: {self.currency_symbol} {price_per_base:.2f}").pack(anchor=tk.W)
-        ttk.Label(main_frame, text=f"Available: {available_base:.2f} {base_unit} ({available_small:.0f} {small_unit})").pack(anchor=tk.W, pady=(0, 8))
-
-        # Preset portions section (if any exist)
-        if preset_portions:
-            ttk.Separator(main_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=8)
-            ttk.Label(main_frame, text="Quick Select:", font=("Segoe UI", 9, "bold")).pack(anchor=tk.W)
-            
-            portions_frame = ttk.Frame(main_frame)
-            portions_frame.pack(fill=tk.X, pady=(4, 8))
-            
-            # Configure columns to expand equally
-            num_cols = min(len(preset_portions), 4)
-            for col in range(num_cols):
-                portions_frame.columnconfigure(col, weight=1)
-            
-            def add_preset(portion):
-                if portion["portion_ml"] > available_small:
-                    messagebox.showerror("Insufficient Stock", f"Not enough stock for {portion['portion_name']}")
-                    return
-                # Add preset portion to cart
-                self._add_special_sale(
-                    fresh, 
-                    portion["portion_ml"], 
-                    portion["selling_price"] / portion["portion_ml"],  # Price per ml for this portion
-                    small_unit, 
-                    multiplier,
-                    preset_name=portion["portion_name"],
-                    preset_price=portion["selling_price"],
-                    portion_id=portion["portion_id"]
-                )
-                dialog.destroy()
-            
-            for i, portion in enumerate(preset_portions):
-                btn_text = f"{portion['portion_name']}\n{self.currency_symbol} {portion['selling_price']:.0f}"
-                btn = ttk.Button(
-                    portions_frame, 
-                    text=btn_text,
-                    command=lambda p=portion: add_preset(p)
-                )
-                btn.grid(row=i // 4, column=i % 4, padx=3, pady=2, sticky="ew")
+        self._special_price_label = ttk.Label(main_frame)
+        self._special_price_label.pack(anchor=tk.W)
+        self._special_stock_label = ttk.Label(main_frame)
+        self._special_stock_label.pack(anchor=tk.W, pady=(0, 8))
+
+        # Preset portions section, packed only for items that have portions
+        section = ttk.Frame(main_frame)
+        ttk.Separator(section, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=8)
+        ttk.Label(section, text="Quick Select:", font=("Segoe UI", 9, "bold")).pack(anchor=tk.W)
+        self._special_portions_frame = ttk.Frame(section)
+        self._special_portions_frame.pack(fill=tk.X, pady=(4, 8))
+        self._preset_button_pool = []
+        self._special_portions_section = section
 
         # Custom amount section
-        ttk.Separator(main_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=8)
-        ttk.Label(main_frame, text="Custom Amount:", font=("Segoe UI", 9, "bold")).pack(anchor=tk.W)
+        custom = ttk.Frame(main_frame)
+        custom.pack(fill=tk.X)
+        self._special_custom_section = custom
+        ttk.Separator(custom, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=8)
+        ttk.Label(custom, text="Custom Amount:", font=("Segoe UI", 9, "bold")).pack(anchor=tk.W)
 
-        amount_var = tk.StringVar(value="")
-        qty_var = tk.StringVar(value="0")
+        self._special_amount_var = tk.StringVar(value="")
+        self._special_qty_var = tk.StringVar(value="0")
 
-        form = ttk.Frame(main_frame)
+        form = ttk.Frame(custom)
         form.pack(fill=tk.X, pady=(4, 8))
         ttk.Label(form, text="Cash amount:").grid(row=0, column=0, sticky=tk.W, padx=(0, 6))
-        amt_entry = ttk.Entry(form, textvariable=amount_var, width=16)
-        amt_entry.grid(row=0, column=1, sticky=tk.W)
-        amt_entry.focus_set()
+        self._special_amount_entry = ttk.Entry(form, textvariable=self._special_amount_var, width=16)
+        self._special_amount_entry.grid(row=0, column=1, sticky=tk.W)
 
         ttk.Label(form, text="Will dispense:").grid(row=1, column=0, sticky=tk.W, padx=(0, 6), pady=(8, 0))
-        qty_label = ttk.Label(form, textvariable=qty_var)
+        qty_label = ttk.Label(form, textvariable=self._special_qty_var)
         qty_label.grid(row=1, column=1, sticky=tk.W, pady=(8, 0))
 
-        def recompute(*_args):
-            try:
-                amt = float(amount_var.get() or 0)
-                qty_small = amt / price_per_small if price_per_small else 0
-                qty_small = min(qty_small, available_small)
-                qty_var.set(f"{qty_small:.0f} {small_unit}" if qty_small >= 1 else f"{qty_small:.2f} {small_unit}")
-            except ValueError:
-                qty_var.set(f"0 {small_unit}")
-
-        amount_var.trace_add("write", recompute)
-        recompute()
-
-        def on_confirm():
-            if available_small <= 0:
-                messagebox.showerror("Out of stock", "No stock available for this item")
-                return
-            try:
-                amt = float(amount_var.get() or 0)
-            except ValueError:
-                messagebox.showerror("Invalid", "Enter a valid amount")
-                return
-            if amt <= 0:
-                messagebox.showerror("Invalid", "Amount must be greater than zero")
-                return
-            if price_per_small <= 0:
-                messagebox.showerror("Invalid", f"Price per {small_unit} is not set for this item")
-                return
-
-            qty_small = amt / price_per_small
-            qty_small = min(qty_small, available_small)
-            if qty_small <= 0:
-                messagebox.showerror("Invalid", "Quantity to sell is zero")
-                return
-
-            self._add_special_sale(fresh, qty_small, price_per_small, small_unit, multiplier)
-            dialog.destroy()
+        self._special_amount_var.trace_add("write", self._special_recompute)
 
         btns = ttk.Frame(dialog, padding=12)
         btns.pack(fill=tk.X)
-        ttk.Button(btns, text="Add Custom", command=on_confirm).pack(side=tk.LEFT, padx=4)
-        ttk.Button(btns, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT, padx=4)
-        
-        # Calculate dialog size based on content
-        num_rows = (len(preset_portions) + 3) // 4 if preset_portions else 0
-        height = 280 if not preset_portions else 320 + num_rows * 50
-        width = 500 if preset_portions else 400
-        dialog.update_idletasks()
-        dialog.geometry(f"{width}x{height}")
-        dialog.deiconify()  # Show after fully built
+        ttk.Button(btns, text="Add Custom", command=self._special_confirm).pack(side=tk.LEFT, padx=4)
+        ttk.Button(btns, text="Cancel", command=self._hide_special_dialog).pack(side=tk.LEFT, padx=4)
+        self._special_dialog = dialog
+
+    def _hide_special_dialog(self) -> None:
+        self._special_dialog.grab_release()
+        self._special_dialog.withdraw()
+
+    def _special_recompute(self, *_args) -> None:
+        sale = self._special_sale
+        if sale is None:
+            return
+        small_unit = sale["small_unit"]
+        try:
+            amt = float(self._special_amount_var.get() or 0)
+            qty_small = amt / sale["price_per_small"] if sale["price_per_small"] else 0
+            qty_small = min(qty_small, sale["available_small"])
+            self._special_qty_var.set(f"{qty_small:.0f} {small_unit}" if qty_small >= 1 else f"{qty_small:.2f} {small_unit}")
+        except ValueError:
+            self._special_qty_var.set(f"0 {small_unit}")
+
+    def _special_add_preset(self, portion: dict) -> None:
+        sale = self._special_sale
+        if portion["portion_ml"] > sale["available_small"]:
+            messagebox.showerror("Insufficient Stock", f"Not enough stock for {portion['portion_name']}")
+            return
+        # Add preset portion to cart
+        self._add_special_sale(
+            sale["item"], 
+            portion["portion_ml"], 
+            portion["selling_price"] / portion["portion_ml"],  # Price per ml for this portion
+            sale["small_unit"], 
+            sale["multiplier"],
+            preset_name=portion["portion_name"],
+            preset_price=portion["selling_price"],
+            portion_id=portion["portion_id"]
+        )
+        self._hide_special_dialog()
+
+    def _special_confirm(self) -> None:
+        sale = self._special_sale
+        available_small = sale["available_small"]
+        price_per_small = sale["price_per_small"]
+        small_unit = sale["small_unit"]
+        if available_small <= 0:
+            messagebox.showerror("Out of stock", "No stock available for this item")
+            return
+        try:
+            amt = float(self._special_amount_var.get() or 0)
+        except ValueError:
+            messagebox.showerror("Invalid", "Enter a valid amount")
+            return
+        if amt <= 0:
+            messagebox.showerror("Invalid", "Amount must be greater than zero")
+            return
+        if price_per_small <= 0:
+            messagebox.showerror("Invalid", f"Price per {small_unit} is not set for this item")
+            return
+
+        qty_small = amt / price_per_small
+        qty_small = min(qty_small, available_small)
+        if qty_small <= 0:
+            messagebox.showerror("Invalid", "Quantity to sell is zero")
+            return
+
+        self._add_special_sale(sale["item"], qty_small, price_per_small, small_unit, sale["multiplier"])
+        self._hide_special_dialog()
 
     def _add_by_barcode(self) -> None:
         code = self.barcode_var.get().strip()
         if not code:
             return
-        matches = [i for i in items.list_items(search=code) if i.get("barcode") == code]
-        if not matches:
+        item = items.get_item_by_barcode(code)
+        if not item:
             messagebox.showinfo("Barcode", "No matching item")
             return
-        item = matches[0]
         if item.get("is_special_volume"):
             self._sell_special_dialog(item)
         else:
@@ -666,29 +974,53 @@ class PosFrame(ttk.Frame):
         self._cart_seq += 1
         return self._cart_seq
 
+    def _rebuild_cart_index(self) -> None:
+        self._cart_index = {}
+        self._cart_by_id = {}
+        for idx, entry in enumerate(self.cart):
+            if "cart_id" in entry:
+                self._cart_by_id[entry["cart_id"]] = entry
+            key = _cart_key(entry)
+            if key is not None:
+                self._cart_index.setdefault(key, idx)
+
+    def _find_cart_entry(self, key: tuple) -> dict | None:
+        """Return the mergeable cart line for key, or None if it is not in the cart."""
+        idx = self._cart_index.get(key)
+        if idx is None:
+            return None
+        if idx < len(self.cart) and _cart_key(self.cart[idx]) == key:
+            return self.cart[idx]
+        # The cart changed since the index was built; fall back to a scan
+        self._rebuild_cart_index()
+        idx = self._cart_index.get(key)
+        return self.cart[idx] if idx is not None else None
+
     # Cart operations
     def _add_to_cart(self, item: dict) -> None:
         # Check if item already exists in cart (non-special items only)
-        for entry in self.cart:
-            if entry["item_id"] == item["item_id"] and not entry.get("is_special_volume"):
-                entry["quantity"] += 1
-                self._refresh_cart()
-                notify_cart_changed()
-                return
+        key = ("plain", item["item_id"])
+        entry = self._find_cart_entry(key)
+        if entry is not None:
+            entry["quantity"] += 1
+            self._refresh_cart()
+            notify_cart_changed()
+            return
         
         # Item not in cart, add new entry
         cart_id = self._next_cart_id()
-        self.cart.append(
-            {
-                "cart_id": cart_id,
-                "item_id": item["item_id"],
-                "name": item["name"],
-                "price": item["selling_price"],
-                "quantity": 1,
-                "vat_rate": item.get("vat_rate", 16.0),
-                "image_path": item.get("image_path"),
-            }
-        )
+        entry = {
+            "cart_id": cart_id,
+            "item_id": item["item_id"],
+            "name": item["name"],
+            "price": item["selling_price"],
+            "quantity": 1,
+            "vat_rate": item.get("vat_rate", 16.0),
+            "image_path": item.get("image_path"),
+        }
+        _derive_line_fields(entry)
+        self._cart_index[key] = len(self.cart)
+        self.cart.append(entry)
         self._refresh_cart()
         notify_cart_changed()
 
@@ -724,34 +1056,33 @@ class PosFrame(ttk.Frame):
             display_name = f"{item['name']} ({qty_small:.0f} {display_unit})"
 
         cart_id = self._next_cart_id()
-        self.cart.append(
-            {
-                "cart_id": cart_id,
-                "item_id": item["item_id"],
-                "name": display_name,
-                "price": effective_price_per_unit,
-                "quantity": qty_small,
-                "vat_rate": item.get("vat_rate", 16.0),
-                "image_path": item.get("image_path"),
-                "is_special_volume": True,
-                "qty_ml": qty_small,
-                "price_per_ml": effective_price_per_unit,
-                "cost_price_override": cost_per_unit,
-                "unit_size_ml": item.get("unit_size_ml") or 1,
-                "unit_multiplier": multiplier,
-                "display_unit": display_unit,
-                "preset_name": preset_name,
-                "preset_price": preset_price,
-                "portion_id": portion_id,
-            }
-        )
+        entry = {
+            "cart_id": cart_id,
+            "item_id": item["item_id"],
+            "name": display_name,
+            "price": effective_price_per_unit,
+            "quantity": qty_small,
+            "vat_rate": item.get("vat_rate", 16.0),
+            "image_path": item.get("image_path"),
+            "is_special_volume": True,
+            "qty_ml": qty_small,
+            "price_per_ml": effective_price_per_unit,
+            "cost_price_override": cost_per_unit,
+            "unit_size_ml": item.get("unit_size_ml") or 1,
+            "unit_multiplier": multiplier,
+            "display_unit": display_unit,
+            "preset_name": preset_name,
+            "preset_price": preset_price,
+            "portion_id": portion_id,
+        }
+        _derive_line_fields(entry)
+        self.cart.append(entry)
         self._refresh_cart()
         notify_cart_changed()
         self._refresh_cart()
 
     def _add_variant_to_cart(self, item: dict, variant: dict) -> None:
         """Add a specific variant to cart."""
-        from modules import variants
         
         # Check stock for the variant
         if variant["quantity"] <= 0:
@@ -759,31 +1090,33 @@ class PosFrame(ttk.Frame):
             return
         
         # Check if this exact variant is already in cart
-        for entry in self.cart:
-            if entry["item_id"] == item["item_id"] and entry.get("variant_id") == variant["variant_id"]:
-                # Check if we have enough stock for additional quantity
-                total_qty = entry["quantity"] + 1
-                if total_qty > variant["quantity"]:
-                    messagebox.showerror("Insufficient Stock", f"Not enough stock for variant '{variant['variant_name']}'. Available: {variant['quantity']}")
-                    return
-                entry.setdefault("cart_id", self._next_cart_id())
-                entry["quantity"] += 1
-                self._refresh_cart()
+        key = ("variant", item["item_id"], variant["variant_id"])
+        entry = self._find_cart_entry(key)
+        if entry is not None:
+            # Check if we have enough stock for additional quantity
+            total_qty = entry["quantity"] + 1
+            if total_qty > variant["quantity"]:
+                messagebox.showerror("Insufficient Stock", f"Not enough stock for variant '{variant['variant_name']}'. Available: {variant['quantity']}")
                 return
+            entry.setdefault("cart_id", self._next_cart_id())
+            entry["quantity"] += 1
+            self._refresh_cart()
+            return
         
         # Add new variant entry
-        self.cart.append(
-            {
-                "cart_id": self._next_cart_id(),
-                "item_id": item["item_id"],
-                "variant_id": variant["variant_id"],
-                "name": f"{item['name']} ({variant['variant_name']})",
-                "price": variant["selling_price"],
-                "quantity": 1,
-                "vat_rate": item.get("vat_rate", 16.0),
-                "image_path": item.get("image_path"),
-            }
-        )
+        entry = {
+            "cart_id": self._next_cart_id(),
+            "item_id": item["item_id"],
+            "variant_id": variant["variant_id"],
+            "name": f"{item['name']} ({variant['variant_name']})",
+            "price": variant["selling_price"],
+            "quantity": 1,
+            "vat_rate": item.get("vat_rate", 16.0),
+            "image_path": item.get("image_path"),
+        }
+        _derive_line_fields(entry)
+        self._cart_index[key] = len(self.cart)
+        self.cart.append(entry)
         self._refresh_cart()
 
     def _refresh_cart(self) -> None:
@@ -794,138 +1127,136 @@ class PosFrame(ttk.Frame):
         for entry in self.cart:
             if "cart_id" not in entry:
                 entry["cart_id"] = self._next_cart_id()
+        # Removals, clears and resumes all end here, so the index follows them
+        self._rebuild_cart_index()
 
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        new_state: dict[str, tuple] = {}
+        cur = self.currency_symbol
         subtotal = 0.0
+        # Sum of line_total * VAT rate, folded into the same pass as the subtotal
+        vat_weighted = 0.0
         for entry in self.cart:
-            # Determine item record for contextual data
-            try:
-                item_record = items.get_item(entry['item_id']) if entry.get('item_id') else None
-            except Exception:
-                item_record = None
+            if "_unit_size" not in entry:
+                _derive_line_fields(entry)
+            # Each field is read from the entry dict once per line
+            price = entry["price"]
+            quantity = entry["quantity"]
+            is_special = entry.get("is_special_volume")
 
             # Compute canonical line total
-            if entry.get("is_special_volume"):
+            if is_special:
                 # For fractional items: price is per small unit (e.g., per ml), quantity is in small units
-                line_total = entry["price"] * entry["quantity"]
+                line_total = price * quantity
             else:
-                # For non-special items: entry['price'] is bulk/package price, entry['quantity'] is number of individual units
-                unit_size = 1
-                try:
-                    if item_record:
-                        unit_size = float(item_record.get('unit_size_ml') or 1)
-                except Exception:
-                    unit_size = 1
-                per_unit_price = entry["price"] / unit_size if unit_size > 0 else entry["price"]
-                line_total = per_unit_price * entry["quantity"]
+                # For non-special items: price is the bulk/package price, quantity is number of individual units
+                per_unit_price = price * entry["_inv_unit_size"]
+                line_total = per_unit_price * quantity
 
             # Persist line_total locally so VAT calc can reuse it
             entry['_line_total'] = line_total
             subtotal += line_total
+            vat_weighted += line_total * entry.get("vat_rate", 16.0) / 100.0
+
+            # Everything else shown on the row is fixed when the line is added,
+            # so rows whose price and quantity did not change keep their strings
+            render_key = (price, quantity, cur)
+            if entry.get("_render_key") == render_key:
+                new_state[str(entry["cart_id"])] = entry["_render_values"]
+                continue
 
             # Prepare display strings
-            if entry.get("is_special_volume"):
+            if is_special:
                 # For fractional items: show price per small unit (e.g., per ml) on the cart
-                # entry['price'] is stored as price per small unit and entry['display_unit'] should be that small unit
-                small_unit = entry.get('display_unit')
-                if not small_unit:
-                    try:
-                        uinfo = uom.get_unit_by_name(item_record.get('unit_of_measure') if item_record else '') or {}
-                        base_u = (uinfo.get('base_unit') or '').lower()
-                        if 'mill' in base_u:
-                            small_unit = 'ml'
-                        elif 'gram' in base_u:
-                            small_unit = 'g'
-                        elif 'cent' in base_u:
-                            small_unit = 'cm'
-                        else:
-                            small_unit = base_u or 'unit'
-                    except Exception:
-                        small_unit = entry.get('display_unit', 'unit')
-
-                price_per_small = entry.get('price') or 0
+                # price is stored per small unit and entry['display_unit'] should be that small unit
+                small_unit = entry["_small_unit"]
                 # Use more precision for small-unit prices (e.g., 0.012345/ml)
-                price_display = f"{self.currency_symbol} {price_per_small:.6f}/{small_unit}"
-                qty_display = f"{entry['quantity']:.2f} {small_unit}".strip()
+                price_display = f"{cur} {price or 0:.6f}/{small_unit}"
+                qty_display = f"{quantity:.2f} {small_unit}".strip()
             else:
-                unit_name = item_record.get('unit_of_measure') if item_record else ''
-                try:
-                    uinfo = uom.get_unit_by_name(unit_name) or {}
-                    abbr = uinfo.get('abbreviation') or unit_name or 'unit'
-                except Exception:
-                    abbr = unit_name or 'unit'
-                price_per_large = entry['price'] / (float(item_record.get('unit_size_ml') or 1) if item_record else 1) if entry.get('price') else 0
-                price_display = f"{self.currency_symbol} {price_per_large:.2f}/{abbr}"
-                try:
-                    if unit_name and unit_name.lower() in ("litre", "liter", "liters", "litres", "l", "kilogram", "kilograms", "kg", "kgs", "meter", "meters", "metre", "metres", "m"):
-                        total_large = entry['quantity'] * float(item_record.get('unit_size_ml') or 1)
-                        qty_display = f"{entry['quantity']} ({total_large:.2f} {abbr})"
-                    else:
-                        qty_display = str(entry["quantity"])
-                except Exception:
-                    qty_display = str(entry["quantity"])
-            self.tree.insert(
-                "",
-                tk.END,
-                iid=str(entry["cart_id"]),
-                values=(entry["name"], price_display, qty_display, f"{self.currency_symbol} {line_total:.2f}"),
-            )
-        
+                abbr = entry["_abbr"]
+                price_display = f"{cur} {per_unit_price:.2f}/{abbr}"
+                if entry["_is_large_unit"]:
+                    total_large = quantity * entry["_unit_size"]
+                    qty_display = f"{quantity} ({total_large:.2f} {abbr})"
+                else:
+                    qty_display = str(quantity)
+            values = (entry["name"], price_display, qty_display, f"{cur} {line_total:.2f}")
+            entry["_render_key"] = render_key
+            entry["_render_values"] = values
+            new_state[str(entry["cart_id"])] = values
+        sync_tree(self.tree, self._cart_tree_state, new_state)
+        self._cart_tree_state = new_state
+        self._cart_subtotal = subtotal
+        self._cart_vat_weighted = vat_weighted
+        self._recompute_totals()
+
+    def _recompute_totals(self) -> None:
+        """Recompute discount, VAT and total from the sums of the last cart refresh.
+
+        Discount edits only change these, so they skip the per-line pass.
+        """
+        subtotal = self._cart_subtotal
+        vat_weighted = self._cart_vat_weighted
+        cur = self.currency_symbol
+
         # Check settings for VAT and discount functionality
         vat_enabled = get_cart_vat_enabled()
         discount_enabled = get_cart_discount_enabled()
 
         # Compute VAT based on each item's VAT rate and discount
-        discount_pct = 0.0
-        if discount_enabled:
-            try:
-                discount_pct = float(self.discount_var.get() or 0) / 100.0
-            except ValueError:
-                discount_pct = 0.0
-        
+        discount_pct = self._discount_pct if discount_enabled else 0.0
         discount_amt = subtotal * discount_pct
         vat_base = subtotal - discount_amt
         
-        # VAT with per-item rates
+        # VAT with per-item rates; the discount applies proportionally to every
+        # line, so it scales the rate-weighted sum as a whole
         vat_amt = 0.0
         if vat_enabled:
-            for entry in self.cart:
-                line_subtotal = entry.get('_line_total', entry.get("price", 0) * entry.get("quantity", 0))
-                # Apply discount proportionally to this item
-                item_discount = line_subtotal * discount_pct
-                item_vat_base = line_subtotal - item_discount
-                item_vat_rate = entry.get("vat_rate", 16.0) / 100.0
-                vat_amt += item_vat_base * item_vat_rate
+            vat_amt = vat_weighted * (1 - discount_pct)
         
         total = vat_base + vat_amt  # Ensure subtotal already includes the discount adjustment
         
-        self.subtotal_var.set(f"{self.currency_symbol} {subtotal:.2f}")
-        self.vat_var.set(f"{self.currency_symbol} {vat_amt:.2f}")
-        self.total_var.set(f"{self.currency_symbol} {total:.2f}")
+        self.subtotal_var.set(f"{cur} {subtotal:.2f}")
+        self.vat_var.set(f"{cur} {vat_amt:.2f}")
+        self.total_var.set(f"{cur} {total:.2f}")
+        self._cart_total = total
+        self._update_change()
+
+    def _on_discount_changed(self, *_args) -> None:
+        try:
+            self._discount_pct = float(self.discount_var.get() or 0) / 100.0
+        except ValueError:
+            self._discount_pct = 0.0
+
+    def _on_payment_changed(self, *_args) -> None:
+        try:
+            self._payment = float(self.payment_var.get() or 0)
+        except ValueError:
+            self._payment = None
         self._update_change()
 
     def _selected_cart_item(self):
         sel = self.tree.selection()
         if not sel:
             return None
-        cart_id = int(sel[0])
-        for entry in self.cart:
-            if entry.get("cart_id") == cart_id:
-                return entry
-        return None
+        return self._cart_by_id.get(int(sel[0]))
 
     def _update_item_preview(self, record: dict | None = None) -> None:
+        preview_key = None
         if record is None:
             sel = self.items_list.selection()
+            # <<TreeviewSelect>> also fires when the selection did not change;
+            # the catalog version makes a refresh after a sale re-render
+            preview_key = (sel[0] if sel else None, self._catalog_version)
+            if preview_key == self._last_previewed_key:
+                return
             if sel:
                 selid = sel[0]
                 # If variant selected, fetch variant and parent
                 if isinstance(selid, str) and selid.startswith("variant-"):
                     try:
                         vid = int(selid.split("-")[-1])
-                        from modules import variants as variants_module
-                        variant = variants_module.get_variant(vid)
+                        variant = variants.get_variant(vid)
                         if variant:
                             parent = items.get_item(variant["item_id"])
                             # Compose a record that reflects variant pricing and quantity
@@ -945,19 +1276,22 @@ class PosFrame(ttk.Frame):
                     except Exception:
                         record = None
         if not record:
+            self._preview_item_id = None
             self.item_preview_label.configure(text="(No image)", image="")
             self.item_preview_meta.configure(text="")
+            self._last_previewed_key = preview_key
             return
+        self._preview_item_id = record.get("item_id")
         thumb = self._thumb_for_item(record)
         if thumb:
             self.item_preview_label.configure(image=thumb, text="")
             self.item_preview_label.image = thumb
         else:
-            self.item_preview_label.configure(text="(No image)", image="")
+            placeholder = "(Loading...)" if self._preview_item_id in self._pending_thumbs else "(No image)"
+            self.item_preview_label.configure(text=placeholder, image="")
             self.item_preview_label.image = None
         
         # Check if item has variants
-        from modules import variants
         has_variants_flag = variants.has_variants(record["item_id"])
         
         if has_variants_flag:
@@ -988,30 +1322,21 @@ class PosFrame(ttk.Frame):
             if record.get('is_special_volume'):
                 unit_size = float(record.get('unit_size_ml') or 1)
                 quantity = float(record.get('quantity') or 0)
-                unit_lower = unit_of_measure.lower()
-                
-                if unit_lower in ('liters', 'litre', 'liter', 'litres', 'l'):
-                    total_liters = quantity * unit_size  # unit_size is in liters
-                    stock_display = f"{total_liters:.2f} L"
-                elif unit_lower in ('kilograms', 'kilogram', 'kg', 'kgs'):
-                    total_kg = quantity * unit_size  # unit_size is in kg
-                    stock_display = f"{total_kg:.2f} kg"
-                elif unit_lower in ('meters', 'meter', 'metre', 'metres', 'm'):
-                    total_m = quantity * unit_size  # unit_size is in meters
-                    stock_display = f"{total_m:.2f} m"
+                if unit_of_measure.lower() in _UNIT_DISPLAY:
+                    _, _, base_unit = _resolve_unit(unit_of_measure)
+                    total_base = quantity * unit_size  # unit_size is in base units (L/kg/m)
+                    stock_display = f"{total_base:.2f} {base_unit}"
             
             # Show price per large/base unit (e.g., per L/kg/m or per piece)
-            try:
-                unit_info = uom.get_unit_by_name(unit_of_measure) or {}
-                abbr = unit_info.get('abbreviation') or unit_of_measure
-            except Exception:
-                abbr = unit_of_measure
+            abbr = _unit_by_name_cached(unit_of_measure or '').get('abbreviation') or unit_of_measure
             item_sell = float(record.get('selling_price') or 0)
             unit_size = float(record.get('unit_size_ml') or 1)
             price_per_large = item_sell / unit_size if unit_size > 0 else item_sell
             meta = f"Stock: {stock_display}\nPrice: {self.currency_symbol} {price_per_large:.2f}/{abbr}"
         
         self.item_preview_meta.configure(text=meta)
+        # An explicit record leaves preview_key None, so the next selection renders
+        self._last_previewed_key = preview_key
 
     def _adjust_qty(self, delta: int) -> None:
         entry = self._selected_cart_item()
@@ -1053,13 +1378,10 @@ class PosFrame(ttk.Frame):
         notify_cart_changed()
 
     def _update_change(self) -> None:
-        try:
-            total = float(self.total_var.get())
-            payment = float(self.payment_var.get() or 0)
-        except ValueError:
+        if self._payment is None:
             self.change_var.set("-")
             return
-        self.change_var.set(f"{payment - total:.2f}")
+        self.change_var.set(f"{self._payment - self._cart_total:.2f}")
 
     def _suspend_cart(self) -> None:
         if not self.cart:
@@ -1089,6 +1411,8 @@ class PosFrame(ttk.Frame):
         if not self.cart:
             messagebox.showinfo("Checkout", "Cart is empty")
             return
+        if self._discount_after_id is not None:
+            self._do_refresh_cart()
 
         subtotal_str = self.subtotal_var.get()
         try:
@@ -1127,6 +1451,8 @@ class PosFrame(ttk.Frame):
 
         if dialog.result:
             self._clear_cart()
+            # Stock changed with the sale
+            self.invalidate_catalog()
             self._refresh_items()
 
     def _goto_cart(self) -> None:
@@ -1150,6 +1476,7 @@ class PosFrame(ttk.Frame):
 
     def refresh_all(self) -> None:
         """Refresh catalog and cart to prevent blank states when revisiting POS."""
+        self.invalidate_catalog()
         self._refresh_items()
         self._refresh_cart()
 
@@ -1164,7 +1491,16 @@ class PosFrame(ttk.Frame):
         if self._refreshing:
             return
 
-        needs_items = not self.items_list.get_children()
+        # <Map>, <FocusIn> and <Visibility> often fire together; check once at idle
+        if self._ensure_after_id is None:
+            self._ensure_after_id = self.after_idle(self._do_ensure)
+
+    def _do_ensure(self) -> None:
+        self._ensure_after_id = None
+        if self._refreshing:
+            return
+
+        needs_items = (not self.items_list.get_children()) or self._items_version != self._catalog_version
         needs_cart = self.cart and (not self.tree.get_children())
         if not (needs_items or needs_cart):
             return
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
+from concurrent.futures import ThreadPoolExecutor
 import csv
 import os
 import re
@@ -19,6 +20,35 @@ from utils.i18n import get_currency_symbol
 
 logger = logging.getLogger(__name__)
 
+# Reconciliation saves run here, one at a time, so SQLite commits never block the Tk thread
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reconciliation-db")
+
+
+def _run_db_write(widget: tk.Misc, work, on_done, button: ttk.Button | None = None) -> None:
+    """Run work() on the writer thread and call on_done(future) back on the Tk thread.
+
+    button, if given, stays disabled while the write is pending so it cannot
+    be submitted twice. on_done is skipped if the widget was destroyed meanwhile.
+    """
+    if button is not None:
+        button.state(["disabled"])
+    future = _db_executor.submit(work)
+
+    def check_result(delay):
+        if not future.done():
+            widget.after(delay, check_result, min(delay * 2, 50))
+            return
+        try:
+            if not widget.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        if button is not None:
+            button.state(["!disabled"])
+        on_done(future)
+
+    widget.after(5, check_result, 10)
+
 
 class ScrollableFrame(ttk.Frame):
     """A vertical scrollable frame to contain dialog content and allow scrolling on small screens."""
@@ -49,6 +79,8 @@ class ReconciliationDialog:
         self.user_role = user_role
         self.currency_symbol = get_currency_symbol()
         self.current_session: Optional[ReconciliationSession] = None
+        # current_session's entries by payment method, rebuilt by _refresh_display
+        self._entries_by_method: Dict[str, ReconciliationEntry] = {}
 
         # Create dialog
         self.dialog = tk.Toplevel(parent)
@@ -132,7 +164,8 @@ class ReconciliationDialog:
         # Press Enter in explanation to also save
         self.explanation_entry.bind("<Return>", lambda e: self._update_selected_entry())
 
-        ttk.Button(update_frame, text="Update Selected", command=self._update_selected_entry).grid(row=0, column=6, sticky=tk.E)
+        self.update_button = ttk.Button(update_frame, text="Update Selected", command=self._update_selected_entry)
+        self.update_button.grid(row=0, column=6, sticky=tk.E)
 
         # Main content area
         content_frame = ttk.Frame(main_frame)
@@ -175,6 +208,8 @@ class ReconciliationDialog:
         self.tree.column("actual_amount", width=120, anchor=tk.E)
         self.tree.column("variance", width=100, anchor=tk.E)
         self.tree.column("status", width=80, anchor=tk.CENTER)
+        # Rows are keyed by payment method; one shared tag marks a variance
+        self.tree.tag_configure("variance", foreground="red")
 
         scrollbar = ttk.Scrollbar(right_panel, orient=tk.VERTICAL, command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollbar.set)
@@ -200,8 +235,10 @@ class ReconciliationDialog:
         action_frame.pack(fill=tk.X)
 
         # Give the action buttons a bit of padding and allow wrap if needed
-        ttk.Button(action_frame, text="Save Draft", command=self._save_draft).pack(side=tk.LEFT, padx=4, pady=4)
-        ttk.Button(action_frame, text="Complete Reconciliation", command=self._complete_reconciliation).pack(side=tk.LEFT, padx=4, pady=4)
+        self.save_draft_button = ttk.Button(action_frame, text="Save Draft", command=self._save_draft)
+        self.save_draft_button.pack(side=tk.LEFT, padx=4, pady=4)
+        self.complete_button = ttk.Button(action_frame, text="Complete Reconciliation", command=self._complete_reconciliation)
+        self.complete_button.pack(side=tk.LEFT, padx=4, pady=4)
         ttk.Button(action_frame, text="Add Explanation", command=self._add_explanation).pack(side=tk.LEFT, padx=4, pady=4)
         ttk.Button(action_frame, text="Close", command=self._on_close).pack(side=tk.RIGHT, padx=4, pady=4)
 
@@ -256,39 +293,47 @@ class ReconciliationDialog:
         if not self.current_session:
             return
 
-        # Update summary
-        self.summary_vars["period"].set(f"{self.current_session.start_date} to {self.current_session.end_date}")
-        self.summary_vars["system_sales"].set(format_currency(self.current_session.total_system_sales))
-        self.summary_vars["actual_cash"].set(format_currency(self.current_session.total_actual_cash))
-        self.summary_vars["variance"].set(format_currency(self.current_session.total_variance))
+        fmt = self._currency_formatter()
+        self._update_summary(fmt)
 
-        # Clear tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Clear tree in one call rather than one delete per row
+        self.tree.delete(*self.tree.get_children())
 
         # Add entries to tree
         for entry in self.current_session.entries:
-            status = "✓" if abs(entry.variance) < 0.01 else "⚠"
-            variance_color = "red" if entry.variance != 0 else "green"
-
-            item_id = self.tree.insert("", tk.END, values=(
-                entry.payment_method,
-                format_currency(entry.system_amount),
-                format_currency(entry.actual_amount),
-                format_currency(entry.variance),
-                status
-            ))
-
-            # Color the variance column
-            if entry.variance != 0:
-                self.tree.tag_configure(f"variance_{item_id}", foreground=variance_color)
-                self.tree.item(item_id, tags=(f"variance_{item_id}",))
+            values, tags = self._entry_row(entry, fmt)
+            self.tree.insert("", tk.END, iid=entry.payment_method, values=values, tags=tags)
+
+        self._entries_by_method = {e.payment_method: e for e in self.current_session.entries}
 
         # Update notes
         self.notes_text.delete(1.0, tk.END)
         if self.current_session.notes:
             self.notes_text.insert(1.0, self.current_session.notes)
 
+    def _currency_formatter(self):
+        # Same output as format_currency, which reads the symbol from the
+        # settings table on every call
+        return (self.currency_symbol + "{:.2f}").format
+
+    def _update_summary(self, fmt) -> None:
+        """Show the current session's period and totals in the summary panel."""
+        self.summary_vars["period"].set(f"{self.current_session.start_date} to {self.current_session.end_date}")
+        self.summary_vars["system_sales"].set(fmt(self.current_session.total_system_sales))
+        self.summary_vars["actual_cash"].set(fmt(self.current_session.total_actual_cash))
+        self.summary_vars["variance"].set(fmt(self.current_session.total_variance))
+
+    @staticmethod
+    def _entry_row(entry: ReconciliationEntry, fmt) -> tuple[tuple, tuple]:
+        """Tree values and tags for one payment method entry."""
+        status = "✓" if abs(entry.variance) < 0.01 else "⚠"
+        values = (
+            entry.payment_method,
+            *map(fmt, (entry.system_amount, entry.actual_amount, entry.variance)),
+            status
+        )
+        return values, ("variance",) if entry.variance != 0 else ()
+
     def _on_tree_select(self, event) -> None:
         """Handle tree selection."""
         selection = self.tree.selection()
@@ -309,14 +354,14 @@ class ReconciliationDialog:
                     self.actual_amount_var.set("")
 
                 # Find explanation for this payment method
-                if self.current_session:
-                    for entry in self.current_session.entries:
-                        if entry.payment_method == values[0]:
-                            self.explanation_var.set(entry.explanation)
-                            break
+                entry = self._entries_by_method.get(values[0])
+                self.explanation_var.set(entry.explanation if entry else "")
 
     def _update_selected_entry(self) -> None:
         """Update the selected entry with new actual amount and explanation."""
+        # <Return> in the entry fields bypasses the button, which stays disabled while a write is pending
+        if self.update_button.instate(["disabled"]):
+            return
         if not self.current_session:
             messagebox.showwarning("No Session", "Please load or create a reconciliation session first.", parent=self.dialog)
             return
@@ -339,31 +384,49 @@ class ReconciliationDialog:
             # Strip currency symbols and parse amount
             amount_str = re.sub(r"[^\d\.\-]", "", self.actual_amount_var.get() or "0")
             actual_amount = float(amount_str)
-            explanation = self.explanation_var.get().strip()
+        except ValueError:
+            messagebox.showerror("Invalid Amount", "Please enter a valid number for the actual amount.", parent=self.dialog)
+            return
+        explanation = self.explanation_var.get().strip()
+        session_id = self.current_session.session_id
+
+        _run_db_write(
+            self.dialog,
+            lambda: reconciliation.update_reconciliation_entry(session_id, payment_method, actual_amount, explanation),
+            lambda future: self._on_entry_updated(future, payment_method, actual_amount, explanation),
+            self.update_button,
+        )
 
-            reconciliation.update_reconciliation_entry(
-                self.current_session.session_id,
-                payment_method,
-                actual_amount,
-                explanation
-            )
+    def _on_entry_updated(self, future, payment_method: str, actual_amount: float, explanation: str) -> None:
+        """Reflect a finished entry update in the session and tree."""
+        try:
+            future.result()
 
-            # Reload session data and refresh UI
-            self.current_session = reconciliation.get_reconciliation_session(self.current_session.session_id)
-            self._refresh_display()
+            entry = self._entries_by_method.get(payment_method)
+            if entry is None:
+                # Not a method of the loaded session; reload it from the database
+                self.current_session = reconciliation.get_reconciliation_session(self.current_session.session_id)
+                self._refresh_display()
+            else:
+                # Apply the same change in memory and redraw only this row
+                old_actual, old_variance = entry.actual_amount, entry.variance
+                entry.actual_amount = actual_amount
+                entry.variance = actual_amount - entry.system_amount
+                entry.explanation = explanation
+                self.current_session.total_actual_cash += entry.actual_amount - old_actual
+                self.current_session.total_variance += entry.variance - old_variance
+                fmt = self._currency_formatter()
+                self._update_summary(fmt)
+                values, tags = self._entry_row(entry, fmt)
+                self.tree.item(payment_method, values=values, tags=tags)
 
             # Keep the selection on the updated method
-            for iid in self.tree.get_children():
-                vals = self.tree.item(iid)['values']
-                if vals and vals[0] == payment_method:
-                    self.tree.selection_set(iid)
-                    self.tree.see(iid)
-                    break
+            if self.tree.exists(payment_method):
+                self.tree.selection_set(payment_method)
+                self.tree.see(payment_method)
 
             messagebox.showinfo("Updated", f"Updated {payment_method} reconciliation entry.", parent=self.dialog)
 
-        except ValueError:
-            messagebox.showerror("Invalid Amount", "Please enter a valid number for the actual amount.", parent=self.dialog)
         except Exception as e:
             logger.error(f"Error updating entry: {e}")
             messagebox.showerror("Error", f"Failed to update entry: {e}", parent=self.dialog)
@@ -501,16 +564,23 @@ class ReconciliationDialog:
         if not self.current_session:
             return
 
-        try:
-            notes = self.notes_text.get(1.0, tk.END).strip()
+        notes = self.notes_text.get(1.0, tk.END).strip()
+        session_id = self.current_session.session_id
+
+        def write():
             # Update notes in database
             with reconciliation.get_connection() as conn:
                 conn.execute(
                     "UPDATE reconciliation_sessions SET notes = ?, updated_at = CURRENT_TIMESTAMP WHERE session_id = ?",
-                    (notes, self.current_session.session_id)
+                    (notes, session_id)
                 )
                 conn.commit()
 
+        _run_db_write(self.dialog, write, self._on_draft_saved, self.save_draft_button)
+
+    def _on_draft_saved(self, future) -> None:
+        try:
+            future.result()
             messagebox.showinfo("Saved", "Reconciliation draft saved successfully.", parent=self.dialog)
         except Exception as e:
             logger.error(f"Error saving draft: {e}")
@@ -531,14 +601,18 @@ class ReconciliationDialog:
             if not result:
                 return
 
-        try:
-            notes = self.notes_text.get(1.0, tk.END).strip()
-            reconciliation.complete_reconciliation_session(
-                self.current_session.session_id,
-                self.user_id,
-                notes
-            )
+        notes = self.notes_text.get(1.0, tk.END).strip()
+        session_id = self.current_session.session_id
+        _run_db_write(
+            self.dialog,
+            lambda: reconciliation.complete_reconciliation_session(session_id, self.user_id, notes),
+            self._on_completed,
+            self.complete_button,
+        )
 
+    def _on_completed(self, future) -> None:
+        try:
+            future.result()
             messagebox.showinfo("Completed", "Reconciliation completed successfully.", parent=self.dialog)
             self._on_close()
 
@@ -567,12 +641,7 @@ class ReconciliationDialog:
         payment_method = values[0]
 
         # Find existing entry
-        entry = None
-        if self.current_session:
-            for e in self.current_session.entries:
-                if e.payment_method == payment_method:
-                    entry = e
-                    break
+        entry = self._entries_by_method.get(payment_method)
 
         # Open edit dialog
         edit = EditEntryDialog(self.dialog, self.current_session.session_id, payment_method, entry.actual_amount if entry else 0.0, entry.explanation if entry else "", on_save=self._on_edit_saved)
@@ -582,13 +651,10 @@ class ReconciliationDialog:
         try:
             self.current_session = reconciliation.get_reconciliation_session(self.current_session.session_id)
             self._refresh_display()
-            # Set selection to the updated row
-            for iid in self.tree.get_children():
-                vals = self.tree.item(iid)['values']
-                if vals and vals[0] == payment_method:
-                    self.tree.selection_set(iid)
-                    self.tree.see(iid)
-                    break
+            # Set selection to the updated row (rows are keyed by payment method)
+            if self.tree.exists(payment_method):
+                self.tree.selection_set(payment_method)
+                self.tree.see(payment_method)
             messagebox.showinfo("Updated", f"Updated {payment_method} reconciliation entry.", parent=self.dialog)
         except Exception as e:
             logger.error(f"Error refreshing after edit: {e}")
@@ -605,8 +671,9 @@ class ReconciliationDialog:
 
     def _show_dialog(self) -> None:
         """Show the dialog and center it on screen."""
-        # Ensure all widgets are fully realized
-        self.dialog.update()
+        # One idle pass settles the requested size; a full update() would also
+        # run pending user events before the dialog is even placed
+        self.dialog.update_idletasks()
 
         req_width = self.dialog.winfo_reqwidth()
         req_height = self.dialog.winfo_reqheight()
@@ -769,7 +836,8 @@ class EditEntryDialog:
         btn_frame = ttk.Frame(frame)
         btn_frame.pack(fill=tk.X)
 
-        ttk.Button(btn_frame, text="Save", command=self._save).pack(side=tk.LEFT, padx=(0, 5))
+        self.save_button = ttk.Button(btn_frame, text="Save", command=self._save)
+        self.save_button.pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(btn_frame, text="Cancel", command=self._cancel).pack(side=tk.RIGHT)
 
     def _save(self) -> None:
@@ -791,18 +859,29 @@ class EditEntryDialog:
                     messagebox.showerror("Invalid Amount", "Please enter a valid number for amount.", parent=self.dialog)
                     return
 
-            reconciliation.add_reconciliation_explanation(
-                self.session_id,
-                explanation_type,
-                explanation,
-                payment_method,
-                amount,
-                self.user_id
+            _run_db_write(
+                self.dialog,
+                lambda: reconciliation.add_reconciliation_explanation(
+                    self.session_id,
+                    explanation_type,
+                    explanation,
+                    payment_method,
+                    amount,
+                    self.user_id
+                ),
+                self._on_saved,
+                self.save_button,
             )
 
+        except Exception as e:
+            logger.error(f"Error saving explanation: {e}")
+            messagebox.showerror("Error", f"Failed to save explanation: {e}", parent=self.dialog)
+
+    def _on_saved(self, future) -> None:
+        try:
+            future.result()
             messagebox.showinfo("Saved", "Explanation added successfully.", parent=self.dialog)
             self.dialog.destroy()
-
         except Exception as e:
             logger.error(f"Error saving explanation: {e}")
             messagebox.showerror("Error", f"Failed to save explanation: {e}", parent=self.dialog)
@@ -813,8 +892,9 @@ class EditEntryDialog:
 
     def _show_dialog(self) -> None:
         """Show the dialog and center it on screen."""
-        # Ensure all widgets are fully realized
-        self.dialog.update()
+        # One idle pass settles the requested size; a full update() would also
+        # run pending user events before the dialog is even placed
+        self.dialog.update_idletasks()
 
         req_width = self.dialog.winfo_reqwidth()
         req_height = self.dialog.winfo_reqheight()
@@ -853,8 +933,17 @@ class ReconciliationHistoryDialog:
         self.dialog.resizable(True, True)  # Allow resizing to show min/max buttons
         self.dialog.minsize(1100, 700)  # Increased minimum size
 
+        # Paging state; the filters and session count are captured when Filter
+        # is applied so Prev/Next page through a stable result set
+        self.page = 0
+        self.page_size = 50
+        self._filters: tuple = (None, None, None)
+        self._total_sessions = 0
+
         self._build_ui()
-        self._load_history()
+        # Queried from the event loop of _show_dialog's wait_window, so the
+        # window is placed and shown before the sessions are loaded
+        self.dialog.after_idle(self._apply_filters)
         self._show_dialog()
 
     def _build_ui(self) -> None:
@@ -885,7 +974,15 @@ class ReconciliationHistoryDialog:
         )
         status_combo.pack(side=tk.LEFT, padx=(0, 10))
 
-        ttk.Button(filter_frame, text="Filter", command=self._load_history).pack(side=tk.LEFT)
+        ttk.Button(filter_frame, text="Filter", command=self._apply_filters).pack(side=tk.LEFT)
+
+        # Paging controls
+        self.next_button = ttk.Button(filter_frame, text="▶", width=3, command=lambda: self._change_page(1))
+        self.next_button.pack(side=tk.RIGHT)
+        self.page_var = tk.StringVar(value="Page 1/1")
+        ttk.Label(filter_frame, textvariable=self.page_var).pack(side=tk.RIGHT, padx=5)
+        self.prev_button = ttk.Button(filter_frame, text="◀", width=3, command=lambda: self._change_page(-1))
+        self.prev_button.pack(side=tk.RIGHT)
 
         # Treeview
         columns = ("date", "period", "system_sales", "actual_cash", "variance", "status", "reconciled_by")
@@ -905,6 +1002,8 @@ class ReconciliationHistoryDialog:
         self.tree.column("variance", width=100, anchor=tk.E)
         self.tree.column("status", width=100, anchor=tk.CENTER)
         self.tree.column("reconciled_by", width=120)
+        # One shared tag for sessions with a variance, instead of a tag per row
+        self.tree.tag_configure("variance", foreground="red")
 
         scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollbar.set)
@@ -915,44 +1014,63 @@ class ReconciliationHistoryDialog:
         # Close button
         ttk.Button(frame, text="Close", command=self._close).pack(pady=(10, 0))
 
+    def _page_count(self) -> int:
+        return max(1, -(-self._total_sessions // self.page_size))
+
+    def _apply_filters(self) -> None:
+        """Capture the filters, count the matching sessions and show the first page."""
+        self._filters = (
+            self.start_date_var.get() or None,
+            self.end_date_var.get() or None,
+            self.status_var.get() or None,
+        )
+        try:
+            self._total_sessions = reconciliation.count_reconciliation_sessions(*self._filters)
+        except Exception as e:
+            logger.error(f"Error counting history: {e}")
+            self._total_sessions = 0
+        self.page = 0
+        self._load_history()
+
+    def _change_page(self, delta: int) -> None:
+        page = min(max(self.page + delta, 0), self._page_count() - 1)
+        if page != self.page:
+            self.page = page
+            self._load_history()
+
     def _load_history(self) -> None:
-        """Load reconciliation history."""
+        """Load the current page of reconciliation history."""
+        pages = self._page_count()
+        self.page_var.set(f"Page {self.page + 1}/{pages}")
+        self.prev_button.state(["!disabled"] if self.page > 0 else ["disabled"])
+        self.next_button.state(["!disabled"] if self.page < pages - 1 else ["disabled"])
         try:
-            start_date = self.start_date_var.get() or None
-            end_date = self.end_date_var.get() or None
-            status = self.status_var.get() or None
+            start_date, end_date, status = self._filters
 
             sessions = reconciliation.get_reconciliation_sessions(
                 start_date=start_date,
                 end_date=end_date,
-                status=status if status else None
+                status=status,
+                limit=self.page_size,
+                offset=self.page * self.page_size
             )
 
-            # Clear tree
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+            # Clear tree in one call rather than one delete per row
+            self.tree.delete(*self.tree.get_children())
 
-            currency_symbol = get_currency_symbol()
+            fmt = (get_currency_symbol() + "{:.2f}").format
 
             # Add sessions to tree
             for session in sessions:
                 status_display = session['status'].title()
-                variance_color = "red" if session['total_variance'] != 0 else "green"
-
-                item_id = self.tree.insert("", tk.END, values=(
+                period_title = session['period_type'].title()
+                self.tree.insert("", tk.END, values=(
                     session['reconciliation_date'],
-                    f"{session['period_type'].title()} ({session['start_date']} - {session['end_date']})",
-                    f"{currency_symbol}{session['total_system_sales']:.2f}",
-                    f"{currency_symbol}{session['total_actual_cash']:.2f}",
-                    f"{currency_symbol}{session['total_variance']:.2f}",
+                    f"{period_title} ({session['start_date']} - {session['end_date']})",
+                    *map(fmt, (session['total_system_sales'], session['total_actual_cash'], session['total_variance'])),
                     status_display,
                     session.get('reconciled_by_name', 'Unknown')
-                ))
-
-                # Color variance column
-                if session['total_variance'] != 0:
-                    self.tree.tag_configure(f"variance_{item_id}", foreground=variance_color)
-                    self.tree.item(item_id, tags=(f"variance_{item_id}",))
+                ), tags=("variance",) if session['total_variance'] != 0 else ())
 
         except Exception as e:
             logger.error(f"Error loading history: {e}")
@@ -964,8 +1082,9 @@ class ReconciliationHistoryDialog:
 
     def _show_dialog(self) -> None:
         """Show the dialog and center it on screen."""
-        # Ensure all widgets are fully realized
-        self.dialog.update()
+        # One idle pass settles the requested size; a full update() would also
+        # run pending user events before the dialog is even placed
+        self.dialog.update_idletasks()
 
         req_width = self.dialog.winfo_reqwidth()
         req_height = self.dialog.winfo_reqheight()
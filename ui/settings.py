@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox
 from database.init_db import get_connection
 import pycountry
 from utils.i18n import get_default_currency_symbol_for_code
+from utils.security import get_currency_code
 
 class CurrencySettingsFrame(ttk.Frame):
     def __init__(self, parent):
@@ -173,6 +174,8 @@ class CurrencySettingsFrame(ttk.Frame):
             conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", ("currency_code", code))
             conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", ("currency_symbol", symbol))
             conn.commit()
+        # Drop the cached currency code so other screens pick up the change
+        get_currency_code.cache_clear()
         
         messagebox.showinfo("Saved", f"Currency set to {code} ({symbol})")
         # Stay on the currency settings page and refresh the displayed value
@@ -1,6 +1,7 @@
 """Utilities package for Kiosk POS."""
 
 import tkinter as tk
+from tkinter import ttk
 import os
 import sys
 
@@ -47,3 +48,30 @@ def set_window_icon(window: tk.Toplevel | tk.Tk) -> None:
                 pass
     except Exception:
         pass  # Silently fail if icon cannot be set
+
+
+def sync_tree(tree: "ttk.Treeview", old_state: dict[str, tuple], new_state: dict[str, tuple]) -> None:
+    """Bring tree from old_state to new_state (iid -> values) with as few Tk calls as possible.
+
+    Rows that disappeared are deleted in one call, new rows are inserted at
+    their position and unchanged rows are left alone. Inserts and updates
+    call the Tcl widget command directly, skipping the option formatting
+    ttk.Treeview.insert/item do for every row. If the kept rows changed
+    order, one "children" call puts every row in place instead of a move
+    per row.
+    """
+    stale = [iid for iid in old_state if iid not in new_state]
+    if stale:
+        tree.delete(*stale)
+    call = tree.tk.call
+    path = str(tree)
+    # Kept rows only need moving if their relative order changed
+    reorder = [iid for iid in old_state if iid in new_state] != [iid for iid in new_state if iid in old_state]
+    for index, (iid, values) in enumerate(new_state.items()):
+        old_values = old_state.get(iid)
+        if old_values is None:
+            call(path, "insert", "", index, "-id", iid, "-values", values)
+        elif old_values != values:
+            call(path, "item", iid, "-values", values)
+    if reorder:
+        call(path, "children", "", tuple(new_state))
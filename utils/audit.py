@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, Any, Optional
 
@@ -26,12 +28,21 @@ CREATE TABLE IF NOT EXISTS audit_log (
 );
 """
 
+AUDIT_INSERT = """
+INSERT INTO audit_log
+(user_id, username, action, table_name, record_id, old_values, new_values,
+ ip_address, user_agent, session_id)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class AuditLogger:
     """Audit logger for tracking system activities."""
 
     def __init__(self):
         self._table_created = False
+        # Per-thread queue of pending rows while inside batch()
+        self._local = threading.local()
 
     def _ensure_table(self):
         """Ensure audit table exists."""
@@ -80,34 +91,59 @@ class AuditLogger:
             user_agent: User agent string
             session_id: Session identifier
         """
+        try:
+            row = (
+                user_id,
+                username,
+                action,
+                table_name,
+                record_id,
+                json.dumps(old_values) if old_values else None,
+                json.dumps(new_values) if new_values else None,
+                ip_address,
+                user_agent,
+                session_id
+            )
+        except Exception as e:
+            # Log audit failure but don't crash the application
+            print(f"Audit logging failed: {e}")
+            return
+        pending = getattr(self._local, 'pending', None)
+        if pending is not None:
+            pending.append(row)
+            return
+        self._write_rows([row])
+
+    def _write_rows(self, rows: list) -> None:
+        """Insert audit rows with a single commit."""
+        if not rows:
+            return
         try:
             self._ensure_table()
             with get_connection() as conn:
-                conn.execute(
-                    """
-                    INSERT INTO audit_log
-                    (user_id, username, action, table_name, record_id, old_values, new_values,
-                     ip_address, user_agent, session_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        user_id,
-                        username,
-                        action,
-                        table_name,
-                        record_id,
-                        json.dumps(old_values) if old_values else None,
-                        json.dumps(new_values) if new_values else None,
-                        ip_address,
-                        user_agent,
-                        session_id
-                    )
-                )
+                conn.executemany(AUDIT_INSERT, rows)
                 conn.commit()
         except Exception as e:
             # Log audit failure but don't crash the application
             print(f"Audit logging failed: {e}")
 
+    @contextmanager
+    def batch(self):
+        """Queue audit events logged by this thread and write them in one commit on exit.
+
+        Nested batches are flushed by the outermost one. Queued events are written
+        even if the block raises, since the actions they record may already be done.
+        """
+        if getattr(self._local, 'pending', None) is not None:
+            yield
+            return
+        self._local.pending = []
+        try:
+            yield
+        finally:
+            rows, self._local.pending = self._local.pending, None
+            self._write_rows(rows)
+
     def log_login(self, user_id: int, username: str, success: bool = True,
                   ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> None:
         """Log a login attempt."""
@@ -1,19 +1,69 @@
 """Image handling helpers using Pillow."""
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
 from pathlib import Path
 from typing import Optional
 
 from PIL import Image, ImageTk
 
 THUMB_SIZE = (96, 96)
+# Resized thumbnails survive restarts here, so each image is decoded once
+THUMB_CACHE_DIR = Path.home() / ".cache" / "kiosk_pos" / "thumbs"
+
+
+def _thumb_cache_path(path: Path, size: tuple[int, int]) -> Optional[Path]:
+    """Cache file for path at size; the source mtime is part of the key so edits are picked up."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    key = f"{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}"
+    return THUMB_CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.png"
+
+
+def _save_thumb_cache(img: Image.Image, cache_path: Path) -> None:
+    """Best-effort write of a thumbnail; a failed write only costs a re-decode later."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a per-thread name first so concurrent loads never see a partial file
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        img.save(tmp_path, "PNG")
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        pass
+
+
+def load_thumbnail_image(path: str | Path, size: tuple[int, int] = THUMB_SIZE) -> Optional[Image.Image]:
+    """Load and resize an image with Pillow only; returns None on failure.
+
+    Does not touch Tk, so it is safe to call from a worker thread.
+    """
+    try:
+        path = Path(path)
+        cache_path = _thumb_cache_path(path, size)
+        if cache_path is not None and cache_path.exists():
+            try:
+                return Image.open(cache_path).convert("RGBA")
+            except Exception:
+                pass  # Unreadable cache entry; rebuild it below
+        img = Image.open(path).convert("RGBA")
+        img.thumbnail(size)
+        if cache_path is not None:
+            _save_thumb_cache(img, cache_path)
+        return img
+    except Exception:
+        return None
 
 
 def load_thumbnail(path: str | Path, size: tuple[int, int] = THUMB_SIZE) -> Optional[ImageTk.PhotoImage]:
     """Load and resize an image to a PhotoImage thumbnail; returns None on failure."""
+    img = load_thumbnail_image(path, size)
+    if img is None:
+        return None
     try:
-        img = Image.open(Path(path)).convert("RGBA")
-        img.thumbnail(size)
         return ImageTk.PhotoImage(img)
     except Exception:
         return None
@@ -1,8 +1,16 @@
 from __future__ import annotations
 """Password hashing utilities using PBKDF2-HMAC (SHA-256)."""
 
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
 def get_currency_code():
-    """Return the configured ISO 4217 currency code (e.g., 'USD', 'KES')."""
+    """Return the configured ISO 4217 currency code (e.g., 'USD', 'KES').
+
+    The value is cached for the session; call ``get_currency_code.cache_clear()``
+    after changing the ``currency_code`` setting.
+    """
     from database.init_db import get_connection
     with get_connection() as conn:
         cursor = conn.execute("SELECT value FROM settings WHERE key = 'currency_code'")
@@ -12,8 +20,12 @@ def get_currency_code():
         return "USD"
 
 
+@lru_cache(maxsize=1)
 def get_cart_vat_enabled():
-    """Return True if VAT calculation is enabled for cart."""
+    """Return True if VAT calculation is enabled for cart.
+
+    Cached for the session; set_cart_vat_enabled and set_cart_settings clear the cache.
+    """
     from database.init_db import get_connection
     with get_connection() as conn:
         cursor = conn.execute("SELECT value FROM settings WHERE key = 'vat_enabled'")
@@ -24,8 +36,12 @@ def get_cart_vat_enabled():
         return True  # Default to enabled
 
 
+@lru_cache(maxsize=1)
 def get_cart_discount_enabled():
-    """Return True if discount functionality is enabled for cart."""
+    """Return True if discount functionality is enabled for cart.
+
+    Cached for the session; set_cart_discount_enabled and set_cart_settings clear the cache.
+    """
     from database.init_db import get_connection
     with get_connection() as conn:
         cursor = conn.execute("SELECT value FROM settings WHERE key = 'discount_enabled'")
@@ -36,8 +52,12 @@ def get_cart_discount_enabled():
         return True  # Default to enabled
 
 
+@lru_cache(maxsize=1)
 def get_cart_suspend_enabled():
-    """Return True if cart suspend/resume functionality is enabled."""
+    """Return True if cart suspend/resume functionality is enabled.
+
+    Cached for the session; set_cart_suspend_enabled and set_cart_settings clear the cache.
+    """
     from database.init_db import get_connection
     with get_connection() as conn:
         cursor = conn.execute("SELECT value FROM settings WHERE key = 'suspend_enabled'")
@@ -54,6 +74,7 @@ def set_cart_vat_enabled(enabled: bool):
     with get_connection() as conn:
         conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('vat_enabled', ?)", (str(enabled).lower(),))
         conn.commit()
+    get_cart_vat_enabled.cache_clear()
 
 
 def set_cart_discount_enabled(enabled: bool):
@@ -62,6 +83,7 @@ def set_cart_discount_enabled(enabled: bool):
     with get_connection() as conn:
         conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('discount_enabled', ?)", (str(enabled).lower(),))
         conn.commit()
+    get_cart_discount_enabled.cache_clear()
 
 
 def set_cart_suspend_enabled(enabled: bool):
@@ -70,6 +92,25 @@ def set_cart_suspend_enabled(enabled: bool):
     with get_connection() as conn:
         conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('suspend_enabled', ?)", (str(enabled).lower(),))
         conn.commit()
+    get_cart_suspend_enabled.cache_clear()
+
+
+def set_cart_settings(vat_enabled: bool, discount_enabled: bool, suspend_enabled: bool) -> None:
+    """Persist the cart VAT/discount/suspend toggles together and clear their cached getters."""
+    from database.init_db import get_connection
+    with get_connection() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+            [
+                ("vat_enabled", str(vat_enabled).lower()),
+                ("discount_enabled", str(discount_enabled).lower()),
+                ("suspend_enabled", str(suspend_enabled).lower()),
+            ],
+        )
+        conn.commit()
+    get_cart_vat_enabled.cache_clear()
+    get_cart_discount_enabled.cache_clear()
+    get_cart_suspend_enabled.cache_clear()
 
 
 # Payment methods helpers